@@ -0,0 +1,65 @@
+"""Measure the time to generate a scenario with the random and the NumPy generation backends.
+
+Usage: python3 generation_backends.py <config> <victims by flood> [<victims by flood> ...]"""
+
+import sys
+import copy
+import json
+import time
+import logging
+import pathlib
+
+root = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(root / 'simulator' / 'src'))
+
+from simulation_engine.simulation_helpers.map import Map
+from simulation_engine.generator.generator import Generator
+from simulation_engine.generator.numpy_generator import NumpyGenerator
+
+exp_name = 'GENERATION_BACKENDS'
+
+config_path = sys.argv[1]
+experiments = [int(n) for n in sys.argv[2:]]
+
+
+def set_environment(victims_amount):
+    log(f'{exp_name}_{victims_amount}', 'Setting the environment.')
+    with open(config_path, 'r') as config:
+        content = json.loads(config.read())
+
+    content['generate']['victim']['minAmount'] = victims_amount
+    content['generate']['victim']['maxAmount'] = victims_amount
+
+    return content
+
+
+def measure(generator_class, config, map):
+    start = time.perf_counter()
+    generator = generator_class(copy.deepcopy(config), map)
+    steps = generator.generate_events(map)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, generator.victim_id, len(list(steps))
+
+
+def start_experiment(victims_amount):
+    config = set_environment(victims_amount)
+    map = Map(config['map']['maps'][0], config['map']['proximity'], config['map']['movementRestrictions'])
+
+    for name, generator_class in [('random', Generator), ('numpy', NumpyGenerator)]:
+        elapsed, victims, floods = measure(generator_class, config, map)
+        log(f'{exp_name}_{victims_amount}', f'{name}: {floods} floods, {victims} victims in {elapsed:.3f} seconds.')
+
+
+def log(exp, message):
+    print(f'[{exp}] ## {message}')
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+
+    for experiment in experiments:
+        log(f'{exp_name}_{experiment}', 'Start new experiment.')
+        start_experiment(experiment)
+
+    print('[FINISHED] ## Finished all experiments')
@@ -0,0 +1,109 @@
+"""Measure the memory of the simulation objects of a large generated scenario.
+
+Each object is compared with a replica holding the same attributes on a per-instance dictionary, which is how the
+objects were stored before using __slots__.
+
+Usage: python3 memory_simulation_objects.py <config> <victims by flood> [<victims by flood> ...]"""
+
+import copy
+import sys
+import json
+import logging
+import pathlib
+import tracemalloc
+
+root = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(root / 'simulator' / 'src'))
+
+from simulation_engine.simulation_helpers.map import Map
+from simulation_engine.generator.generator import Generator
+
+exp_name = 'MEMORY_SIMULATION_OBJECTS'
+
+config_path = sys.argv[1]
+experiments = [int(n) for n in sys.argv[2:]]
+
+
+class DictBacked:
+    """Replica of a slotted object with its attributes stored on the instance dictionary."""
+
+    def __init__(self, obj):
+        if hasattr(obj, 'type'):
+            self.type = obj.type
+
+        for field in type(obj).__slots__:
+            setattr(self, field, getattr(obj, field))
+
+
+def set_environment(victims_amount):
+    log(f'{exp_name}_{victims_amount}', 'Setting the environment.')
+    with open(config_path, 'r') as config:
+        content = json.loads(config.read())
+
+    content['generate']['victim']['minAmount'] = victims_amount
+    content['generate']['victim']['maxAmount'] = victims_amount
+
+    return content
+
+
+def collect_objects(steps, social_assets):
+    objects = {'Event': [], 'Victim': [], 'Photo': [], 'WaterSample': [], 'SocialAssetMarker': social_assets}
+
+    for step in steps:
+        objects['Event'].append(step['flood'])
+        objects['Victim'].extend(step['victims'])
+        objects['WaterSample'].extend(step['water_samples'])
+        for photo in step['photos']:
+            objects['Photo'].append(photo)
+            objects['Victim'].extend(photo.victims)
+
+        for victims in step['propagation']:
+            objects['Victim'].extend(victims)
+
+    return objects
+
+
+def measure(build, objects):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    replicas = [build(obj) for obj in objects]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del replicas
+    return (after - before) / len(objects)
+
+
+def start_experiment(victims_amount):
+    config = set_environment(victims_amount)
+
+    log(f'{exp_name}_{victims_amount}', 'Generating the scenario.')
+    map = Map(config['map']['maps'][0], config['map']['proximity'], config['map']['movementRestrictions'])
+    generator = Generator(config, map)
+    steps = generator.generate_events(map)
+    social_assets = generator.generate_social_assets()
+
+    for name, objects in collect_objects(steps, social_assets).items():
+        if not objects:
+            continue
+
+        slots_size = measure(copy.copy, objects)
+        dict_size = measure(DictBacked, objects)
+        saved = 100 * (1 - slots_size / dict_size)
+
+        log(f'{exp_name}_{victims_amount}', f'{name}: {len(objects)} objects, {slots_size:.0f} bytes with slots, '
+                                            f'{dict_size:.0f} bytes with dict, {saved:.1f}% saved by object.')
+
+
+def log(exp, message):
+    print(f'[{exp}] ## {message}')
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+
+    for experiment in experiments:
+        log(f'{exp_name}_{experiment}', 'Start new experiment.')
+        start_experiment(experiment)
+
+    print('[FINISHED] ## Finished all experiments')
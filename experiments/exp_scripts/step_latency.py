@@ -0,0 +1,99 @@
+"""Measure the latency of the steps processed by the formatter, with the responses of the engine deep copied before
+being formatted, as they were before, and formatted straight from the engine.
+
+Usage: python3 step_latency.py <config> <steps> <agents by role> [<agents by role> ...]"""
+
+import sys
+import copy
+import json
+import time
+import logging
+import pathlib
+import tempfile
+import statistics
+
+root = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(root / 'simulator' / 'src'))
+
+from simulation_engine.copycat import CopyCat
+from simulation_engine.json_formatter import JsonFormatter
+
+exp_name = 'STEP_LATENCY'
+
+config_path = sys.argv[1]
+steps_amount = int(sys.argv[2])
+experiments = [int(n) for n in sys.argv[3:]]
+
+
+class DeepCopyCat(CopyCat):
+    """Copy cat that deep copies every response, as the engine did before."""
+
+    def start(self):
+        return copy.deepcopy(super(DeepCopyCat, self).start())
+
+    def do_step(self, token_action_list):
+        return copy.deepcopy(super(DeepCopyCat, self).do_step(token_action_list))
+
+
+def set_environment(agents_amount):
+    log(f'{exp_name}_{agents_amount}', 'Setting the environment.')
+    with open(config_path, 'r') as config:
+        content = json.loads(config.read())
+
+    content['map']['steps'] = steps_amount + 2
+    content['map']['scenarioCache'] = False
+    for role in content['agents']:
+        content['agents'][role]['amount'] = agents_amount
+
+    temp_config = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+    temp_config.write(json.dumps(content))
+    temp_config.close()
+
+    return temp_config.name, sum(role['amount'] for role in content['agents'].values())
+
+
+def measure(config, tokens, copy_cat_class):
+    formatter = JsonFormatter(config, False, False)
+    formatter.copycat.__class__ = copy_cat_class
+
+    for token in tokens:
+        formatter.connect_agent(token)
+    formatter.start()
+
+    latencies = []
+    for step in range(steps_amount):
+        action = 'move' if step % 2 else 'pass'
+        parameters = ['cdm'] if step % 2 else []
+        actions = [{'token': token, 'action': action, 'parameters': parameters} for token in tokens]
+
+        start = time.perf_counter()
+        formatter.do_step(actions)
+        latencies.append(time.perf_counter() - start)
+
+    return statistics.mean(latencies), max(latencies)
+
+
+def start_experiment(agents_amount):
+    config, total_agents = set_environment(agents_amount)
+    tokens = [f'agent_{n}' for n in range(total_agents)]
+
+    for name, copy_cat_class in [('deep copy', DeepCopyCat), ('copy free', CopyCat)]:
+        mean, worst = measure(config, tokens, copy_cat_class)
+        log(f'{exp_name}_{agents_amount}',
+            f'{name}: {total_agents} agents, mean step {mean * 1000:.2f} ms, worst step {worst * 1000:.2f} ms.')
+
+    pathlib.Path(config).unlink()
+
+
+def log(exp, message):
+    print(f'[{exp}] ## {message}')
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+
+    for experiment in experiments:
+        log(f'{exp_name}_{experiment}', 'Start new experiment.')
+        start_experiment(experiment)
+
+    print('[FINISHED] ## Finished all experiments')
@@ -16,13 +16,17 @@ from multiprocessing import Queue
 from flask_socketio import SocketIO
 from flask import Flask, request, jsonify
 from communication.controllers.controller import Controller
-from communication.helpers import json_formatter
+from communication.helpers import json_formatter, notifications
 from communication.helpers.logger import Logger
+from communication.helpers.step_scheduler import StepScheduler
+from communication.helpers.ipc import IpcClient, socket_path
+from communication.helpers.http_sessions import HttpSessions
+from communication.helpers.monitor_publisher import MonitorPublisher
 
 logging.basicConfig(format="[API] [%(levelname)s] %(message)s",level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-base_url, api_port, simulation_port, monitor_port, step_time, first_step_time, method, log, social_assets_timeout, secret, agents_amount = sys.argv[1:]
+base_url, api_port, simulation_port, monitor_port, step_time, first_step_time, method, log, social_assets_timeout, secret, ipc, http_timeout, http_retries, monitor_queue, monitor_policy, agents_amount = sys.argv[1:]
 
 app = Flask(__name__)
 socket = SocketIO(app=app)
@@ -30,27 +34,52 @@ logging.getLogger('socketio').setLevel(logging.ERROR)
 logging.getLogger('engineio').setLevel(logging.ERROR)
 
 controller = Controller(agents_amount, first_step_time, secret)
+ipc_client = IpcClient(socket_path(simulation_port)) if ipc == 'unix' else None
+http_sessions = HttpSessions(float(http_timeout), int(http_retries))
+simulation_url = f'http://{base_url}:{simulation_port}'
+monitor_url = f'http://{base_url}:{monitor_port}'
 every_agent_registered = Queue()
 one_agent_registered_queue = Queue()
-actions_queue = Queue()
-request_queue = Queue()
 
 # Events variables
-initial_percepts_event = 'initial_percepts'
-percepts_event = 'percepts'
-end_event = 'end'
-bye_event = 'bye'
-error_event = 'error'
+initial_percepts_event = notifications.initial_percepts_event
+percepts_event = notifications.percepts_event
+end_event = notifications.end_event
+bye_event = notifications.bye_event
+error_event = notifications.error_event
+
+# Seconds to wait for the monitor to receive the updates still queued when the API shuts down
+monitor_flush_timeout = 10
 
 monitor_connected = False
 
+
+def simulation_request(method, endpoint, message):
+    """Send the request to the simulation and return its response.
+
+    The request is sent over the Unix socket if chosen with the -ipc argument, else over HTTP.
+
+    :param method: The HTTP method of the endpoint.
+    :param endpoint: The name of the endpoint.
+    :param message: The body of the request.
+    :return dict: The response of the simulation.
+    :raises requests.exceptions.ConnectionError: If the simulation is not online."""
+
+    if ipc_client is None:
+        return http_sessions.request(method, simulation_url, f'/{endpoint}', json=message).json()
+
+    try:
+        return ipc_client.request(endpoint, message)
+    except ConnectionError as e:
+        raise requests.exceptions.ConnectionError(e)
+
+
 @app.route('/sim_config', methods=['GET'])
 def sim_config():
     """Return the bases information of the simulator.
     """
     global monitor_connected
 
-    simulation_url = f'http://{base_url}:{simulation_port}'
     api_url = f'http://{base_url}:{api_port}'
 
     response = dict(
@@ -68,6 +97,13 @@ def sim_config():
     return jsonify(response)
 
 
+@app.route('/connection_stats', methods=['GET'])
+def connection_stats():
+    """Return the statistics of the connections kept alive to the simulation and the monitor."""
+
+    return jsonify(http_sessions.stats())
+
+
 @app.route('/start_connections', methods=['POST'])
 def start_connections():
     """Starts the API as entry point, before calling this functions the API will only answer that the simulation
@@ -170,13 +206,13 @@ def start_step_cycle():
 
     controller.finish_connection_timer()
 
-    sim_response = requests.post(f'http://{base_url}:{simulation_port}/start', json={'secret': secret}).json()
+    sim_response = simulation_request('POST', 'start', {'secret': secret})
 
     notify_monitor(initial_percepts_event, sim_response)
     notify_monitor(percepts_event, sim_response)
     notify_actors(percepts_event, sim_response)
 
-    multiprocessing.Process(target=step_controller, args=(actions_queue, 1), daemon=True).start()
+    wait_actions()
 
     return jsonify('')
 
@@ -243,8 +279,8 @@ def register_agent(msg):
             if not registering_agent:
                 main_token = message[0]
                 token = message[1]
-                sim_response = requests.post(f'http://{base_url}:{simulation_port}/register_asset',
-                                             json={'main_token': main_token, 'token': token, 'secret': secret}).json()
+                sim_response = simulation_request('POST', 'register_asset',
+                                                  {'main_token': main_token, 'token': token, 'secret': secret})
 
                 if sim_response['status'] == 1:
                     Logger.normal('Social asset socket connected.')
@@ -253,20 +289,19 @@ def register_agent(msg):
                     response['result'] = True
                     response['message'] = 'Social asset successfully connected'
 
-                    if controller.check_requests():
-                        request_queue.put(True)
-
                     response.update(sim_response)
                     send_initial_percepts(token, response)
 
+                    if controller.check_requests():
+                        scheduler.ready(StepScheduler.assets)
+
                 else:
                     Logger.error(f'Error to connect the social asset socket: {message}')
 
                     response['status'] = sim_response['status']
                     response['message'] = sim_response['message']
             else:
-                sim_response = requests.post(f'http://{base_url}:{simulation_port}/register_agent',
-                                             json={'token': message, 'secret': secret}).json()
+                sim_response = simulation_request('POST', 'register_agent', {'token': message, 'secret': secret})
 
                 if sim_response['status'] == 1:
                     Logger.normal('Agent socket connected.')
@@ -277,7 +312,7 @@ def register_agent(msg):
 
                     response.update(sim_response)
 
-                    if controller.agents_amount == len(controller.manager.agents_sockets_manager.get_tokens()):
+                    if controller.agents_amount == controller.manager.agents_sockets_manager.count_sockets():
                         every_agent_registered.put(True)
 
                     one_agent_registered_queue.put(True)
@@ -302,7 +337,6 @@ def register_agent(msg):
     return jsonify(0)
 
 
-@app.route('/finish_step', methods=['GET'])
 def finish_step():
     """Finish each step of the simulation.
 
@@ -313,35 +347,28 @@ def finish_step():
     to find that on step 12 the simulation had an error and all the next steps were not executed properly.
 
     Note: When the engine is processing the actions, the agents or social assets can not send any action.
-    Note: This endpoint must be called from the simulation, it is not recommended to the user to call it on his own."""
+    Note: This function is only called by the step scheduler, once all the actions are received or the step time
+    ends."""
 
     Logger.normal('Preparing the actions to send.')
 
-    valid, message = controller.do_internal_verification(request)
-
-    if not valid:
-        return jsonify(message=f'This endpoint can not be accessed. {message}')
-
     try:
         controller.set_processing_actions()
         tokens_actions_list = [*controller.manager.get_actions('agent'), *controller.manager.get_actions('social_asset')]
 
         logger.info('sending actions to the simulation engine')
-        sim_response = requests.post(f'http://{base_url}:{simulation_port}/do_actions', json={'actions': tokens_actions_list, 'secret': secret}).json()
+        sim_response = simulation_request('POST', 'do_actions', {'actions': tokens_actions_list, 'secret': secret})
         logger.info('receiving actions results')
         controller.manager.clear_workers()
 
         if sim_response['status'] == 0:
-            logger.critical('An internal error occurred. Shutting down...')
-            notify_monitor(error_event, {'message': 'An internal error occurred. Shutting down...'})
-
-            requests.get(f'http://{base_url}:{simulation_port}/terminate', json={'secret': secret, Logger.TAG_NORMAL: True})
-            multiprocessing.Process(target=auto_destruction, daemon=True).start()
+            abort_simulation('An internal error occurred. Shutting down...')
+            return
 
         if sim_response['message'] == 'Simulation finished.':
             Logger.normal('End of the simulation, preparer to restart.')
 
-            sim_response = requests.put(f'http://{base_url}:{simulation_port}/restart', json={'secret': secret}).json()
+            sim_response = simulation_request('PUT', 'restart', {'secret': secret})
 
             notify_monitor(end_event, sim_response['report'])
             notify_actors(end_event, sim_response['report'])
@@ -349,11 +376,15 @@ def finish_step():
             if sim_response['status'] == 0:
                 Logger.normal('No more map to run, finishing the simulation...')
 
-                sim_response = requests.get(f'http://{base_url}:{simulation_port}/terminate', json={'secret': secret, 'api': True}).json()
+                sim_response = simulation_request('GET', 'terminate', {'secret': secret, 'api': True})
 
                 notify_monitor(bye_event, sim_response)
                 notify_actors(bye_event, sim_response)
 
+                monitor_publisher.stop(monitor_flush_timeout)
+                Logger.normal(f'Connections: {http_sessions.stats()}')
+
+                scheduler.stop()
                 multiprocessing.Process(target=auto_destruction, daemon=True).start()
 
             else:
@@ -368,7 +399,7 @@ def finish_step():
                 notify_actors(percepts_event, sim_response['percepts'])
 
                 controller.set_processing_actions()
-                multiprocessing.Process(target=step_controller, args=(actions_queue, 1), daemon=True).start()
+                wait_actions()
 
         else:
             controller.set_processing_actions()
@@ -378,68 +409,64 @@ def finish_step():
                 Logger.normal('Open connections for the social assets.')
 
                 controller.start_social_asset_request(sim_response)
-                multiprocessing.Process(target=step_controller, args=(request_queue, 2), daemon=True).start()
+                scheduler.wait(StepScheduler.assets, int(social_assets_timeout))
 
             else:
                 notify_actors(percepts_event, sim_response)
                 Logger.normal('Wait all the agent send yours actions.')
 
-                multiprocessing.Process(target=step_controller, args=(actions_queue, 1), daemon=True).start()
+                wait_actions()
+
+    except (requests.exceptions.RequestException, json.decoder.JSONDecodeError):
+        logger.critical('Error to process the agents actions.', exc_info=True)
+
+        abort_simulation()
 
-    except requests.exceptions.ConnectionError:
-        logger.critical('Error to process the agents actions.',exc_info=True)
 
+def abort_simulation(message='The step could not be finished. Shutting down...'):
+    """Shut down the API when the step could not be finished, so the simulation does not stay waiting for a step
+    that will never start.
+
+    :param message: The reason sent to the monitor."""
+
+    logger.critical(message)
+    notify_monitor(error_event, {'message': message})
+
+    try:
+        simulation_request('GET', 'terminate', {'secret': secret, Logger.TAG_NORMAL: True})
+    except (requests.exceptions.RequestException, json.decoder.JSONDecodeError):
         pass
 
-    return jsonify(0)
+    monitor_publisher.stop(monitor_flush_timeout)
+    scheduler.stop()
+    multiprocessing.Process(target=auto_destruction, daemon=True).start()
 
 
-@app.route('/handle_response', methods=['GET'])
 def handle_response():
+    """Finish the social assets request, once all the social assets requested are connected or the time ends.
+
+    Note: This function is only called by the step scheduler."""
+
     Logger.normal('Handle the agent response after try to connect the social asset.')
 
     tokens = controller.get_social_assets_tokens()
 
-    sim_response = requests.post(f'http://{base_url}:{simulation_port}/finish_social_asset_connections',
-                                 json={'tokens': tokens, 'secret': secret}).json()
+    sim_response = simulation_request('POST', 'finish_social_asset_connections', {'tokens': tokens, 'secret': secret})
 
     response = controller.format_actions_result(sim_response)
     notify_actors(percepts_event, response)
     controller.finish_assets_connections()
 
-    multiprocessing.Process(target=step_controller, args=(actions_queue, 1), daemon=True).start()
-
-    return jsonify(0)
-
-
-def step_controller(ready_queue, status):
-    """Wait for all the agents to send their actions or the time to end either one will cause the method to call
-    finish_step."""
+    wait_actions()
 
-    if status == 2:
-        try:
-            ready_queue.get(block=True, timeout=int(social_assets_timeout))
 
-        except queue.Empty:
-            pass
-    else:
-        try:
-            if int(agents_amount) > 0:
-                ready_queue.get(block=True, timeout=int(step_time))
+def wait_actions():
+    """Wait for all the agents to send their actions or the time to end, either one will finish the step."""
 
-        except queue.Empty:
-            pass
+    scheduler.wait(StepScheduler.actions, int(step_time) if int(agents_amount) > 0 else 0)
 
-    try:
-        if status == 2:
-            requests.get(f'http://{base_url}:{api_port}/handle_response', json={'secret': secret})
-        else:
-            requests.get(f'http://{base_url}:{api_port}/finish_step', json={'secret': secret})
-
-    except requests.exceptions.ConnectionError:
-        pass
 
-    os.kill(os.getpid(), signal.SIGTERM)
+scheduler = StepScheduler({StepScheduler.actions: finish_step, StepScheduler.assets: handle_response}, socket.sleep)
 
 
 @socket.on('send_action')
@@ -458,18 +485,15 @@ def send_action_temp(msg):
         response['result'] = False
 
     else:
-        every_socket = controller.manager.get_all('socket')
-        tokens_connected_size = len([*every_socket[0], *every_socket[1]])
-        agent_workers_size = len(controller.manager.get_workers('agent'))
-        social_asset_workers_size = len(controller.manager.get_workers('social_asset'))
-        workers = agent_workers_size + social_asset_workers_size
+        tokens_connected_size = controller.manager.count_sockets()
+        workers = controller.manager.count_workers()
 
         Logger.normal(f'Action received: {workers} of {tokens_connected_size}.')
 
         if tokens_connected_size == workers:
             Logger.normal('All actions received.')
 
-            actions_queue.put(True)
+            scheduler.ready(StepScheduler.actions)
 
     response['message'] = message
 
@@ -486,8 +510,7 @@ def disconnect_registered_agent(msg):
 
     if status == 1:
         try:
-            sim_response = requests.put(f'http://{base_url}:{simulation_port}/delete_agent',
-                                        json={'token': message, 'secret': secret}).json()
+            sim_response = simulation_request('PUT', 'delete_agent', {'token': message, 'secret': secret})
 
             if sim_response['status'] == 1:
                 response['status'] = 1
@@ -520,8 +543,7 @@ def disconnect_registered_asset(msg):
 
     if status == 1:
         try:
-            sim_response = requests.put(f'http://{base_url}:{simulation_port}/delete_asset',
-                                        json={'token': message, 'secret': secret}).json()
+            sim_response = simulation_request('PUT', 'delete_asset', {'token': message, 'secret': secret})
 
             if sim_response['status'] == 1:
                 response['status'] = 1
@@ -540,6 +562,26 @@ def disconnect_registered_asset(msg):
     return json.dumps(response, sort_keys=False)
 
 
+@socket.on('resync_percepts')
+def resync_percepts(msg):
+    """Send again the last percepts of the agent or social asset with all its fields.
+
+    Note: Only used by the agents and social assets that asked for delta percepts and detected a gap on the sequence
+    number of the percepts received."""
+
+    status, message = controller.do_percepts_resync(msg)
+
+    if status != 1:
+        Logger.error(f'Error to resync the percepts: {message}')
+
+        return json.dumps({'status': status, 'result': False, 'message': message}, sort_keys=False)
+
+    room = controller.manager.get(json.loads(msg)['token'], 'socket')
+    socket.emit(percepts_event, json.dumps(message), room=room)
+
+    return json.dumps({'status': 1, 'result': True, 'message': 'Percepts resent.'}, sort_keys=False)
+
+
 def send_initial_percepts(token, info):
     """Send the initial percepts for the agent informed.
 
@@ -547,50 +589,41 @@ def send_initial_percepts(token, info):
 
     room = controller.manager.get(token, 'socket')
     response = json_formatter.initial_percepts_format(info, token)
+    controller.manager.reset_percepts(token)
     socket.emit(initial_percepts_event, response, room=room)
 
 
 def notify_monitor(event, response):
     """ Update data into the monitor."""
-    # TODO: for now does nothing
     global monitor_connected
     if not monitor_connected: 
         return 
     Logger.normal('Update monitor.')
 
-    url = f'http://{base_url}:{monitor_port}/simulator'
+    update = notifications.monitor_update(event, response, controller.get_current_match())
+    if update is None:
+        return
 
-    if event == initial_percepts_event:
-        # logger.debug(response)
-        info = json_formatter.initial_percepts_monitor_format(response)
-        match = controller.get_current_match()
-        url = f'{url}/match/{match}/info/map'
+    url, info, batchable = update
+    monitor_publisher.publish(url, info, batchable=batchable)
 
-    elif event == percepts_event:
-        # info = json_formatter.percepts_monitor_format(response)
-        info = { key: response[key] for key in ['environment', 'actors', 'partial_report'] }
-        # match = controller.get_current_match()
-        url = f'{url}/match/{controller.get_current_match()}/step'
 
-    elif event == end_event:
-        info = json_formatter.end_monitor_format(response)        
-        match = controller.get_current_match()
-        url = f'{url}/match/{match}/info/report'
+def post_monitor(url, body):
+    """Post the update to the monitor, called by the monitor publisher.
 
-    elif event == bye_event:
-        info = json_formatter.end_monitor_format(response)
-        url = f'{url}/info/report'
+    :param url: The path of the endpoint of the monitor.
+    :param body: The update or the list of steps, already encoded."""
 
-    else:
-        Logger.error('Event type in "notify monitor" not found.')
-        return
-
-    monitor_response = requests.post(url, json=info)
+    monitor_response = http_sessions.request('POST', monitor_url, url, data=body,
+                                             headers={'Content-Type': 'application/json'})
 
     if not monitor_response:
         Logger.error('Error sending data to monitor.')
 
 
+monitor_publisher = MonitorPublisher(post_monitor, int(monitor_queue), monitor_policy)
+
+
 def notify_actors(event, response):
     """Notify the agents and social assets through sockets.
 
@@ -601,32 +634,9 @@ def notify_actors(event, response):
 
     Logger.normal('Notifying the agents.')
 
-    tokens = [*controller.manager.agents_sockets_manager.get_tokens(), *controller.manager.assets_sockets_manager.get_tokens()]
-    room_response_list = []
-
-    for token in tokens:
-        if event == initial_percepts_event:
-            info = json_formatter.initial_percepts_format(response, token)
-
-        elif event == percepts_event:
-            info = json_formatter.percepts_format(response, token)
-
-        elif event == end_event:
-            info = json_formatter.end_format(response, token)
-
-        elif event == bye_event:
-            info = json_formatter.bye_format(response, token)
-
-        else:
-            Logger.error('Wrong event name. Possible internal errors.')
-            info = json_formatter.event_error_format('Error in API.')
-
-        room = controller.manager.get(token, 'socket')
-        room_response_list.append((room, json.dumps(info)))
-
-    for room, agent_response in room_response_list:
+    for room, agent_response in notifications.actors_messages(event, response, controller.manager):
         socket.emit(event, agent_response, room=room)
-        
+
 
 @app.route('/call_service', methods=['GET'])
 def calculate_route():
@@ -642,8 +652,8 @@ def calculate_route():
 
         if status == 1:
             # Can be add more types of services
-            sim_response = requests.get(f'http://{base_url}:{simulation_port}/calculate_route',
-                                        json={'parameters': request.get_json(force=True)['parameters'], 'secret': secret}).json()
+            sim_response = simulation_request('GET', 'calculate_route',
+                                              {'parameters': request.get_json(force=True)['parameters'], 'secret': secret})
 
             if sim_response['status'] == 1:
                 response['status'] = 1
@@ -672,6 +682,7 @@ def terminate():
         return jsonify(message='This endpoint can not be accessed.')
 
     if message['back'] == 0:
+        monitor_publisher.stop(monitor_flush_timeout)
         multiprocessing.Process(target=auto_destruction, daemon=True).start()
     else:
         socket.stop()
@@ -696,4 +707,6 @@ if __name__ == '__main__':
     app.config['SECRET_KEY'] = secret
     app.config['JSON_SORT_KEYS'] = False
     Logger.normal(f'API: Serving on http://{base_url}:{api_port}')
+    monitor_publisher.start()
+    socket.start_background_task(scheduler.run)
     socket.run(app=app, host=base_url, port=api_port)
@@ -0,0 +1,691 @@
+"""This module is the asyncio server mode of the API, chosen with the -api_mode argument. It answers the same HTTP
+endpoints and Socket.IO events of api.py, with the same messages, so the agents connect to either one.
+
+Every socket is a coroutine on a single event loop instead of a green thread, so the idle sockets only cost their
+buffers. The calls to the simulator are awaited, so a slow response does not stall the handlers of the other sockets,
+and the percepts of each step are emitted to all the sockets at once."""
+
+import os
+import sys
+import json
+import signal
+import asyncio
+import logging
+import socketio
+from aiohttp import web
+from communication.controllers.controller import Controller
+from communication.helpers import json_formatter, notifications
+from communication.helpers.logger import Logger
+from communication.helpers.step_scheduler import AsyncStepScheduler, StepScheduler
+from communication.helpers.ipc import AsyncIpcClient, socket_path
+from communication.helpers.http_sessions import HttpSessions
+from communication.helpers.async_http import AsyncHttpSession
+from communication.helpers.monitor_publisher import MonitorPublisher
+
+logging.basicConfig(format="[API] [%(levelname)s] %(message)s",level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+base_url, api_port, simulation_port, monitor_port, step_time, first_step_time, method, log, social_assets_timeout, secret, ipc, http_timeout, http_retries, monitor_queue, monitor_policy, agents_amount = sys.argv[1:]
+
+app = web.Application()
+socket = socketio.AsyncServer(async_mode='aiohttp')
+socket.attach(app)
+logging.getLogger('socketio').setLevel(logging.ERROR)
+logging.getLogger('engineio').setLevel(logging.ERROR)
+
+controller = Controller(agents_amount, first_step_time, secret)
+ipc_client = AsyncIpcClient(socket_path(simulation_port)) if ipc == 'unix' else None
+simulation_url = f'http://{base_url}:{simulation_port}'
+monitor_url = f'http://{base_url}:{monitor_port}'
+simulation_session = AsyncHttpSession(simulation_url, float(http_timeout), int(http_retries))
+http_sessions = HttpSessions(float(http_timeout), int(http_retries))
+every_agent_registered = asyncio.Event()
+one_agent_registered = asyncio.Event()
+
+# Events variables
+initial_percepts_event = notifications.initial_percepts_event
+percepts_event = notifications.percepts_event
+end_event = notifications.end_event
+bye_event = notifications.bye_event
+error_event = notifications.error_event
+
+# Seconds to wait for the monitor to receive the updates still queued when the API shuts down
+monitor_flush_timeout = 10
+
+monitor_connected = False
+
+
+class JsonRequest:
+    """Class with the body of the HTTP request, read the same way as the Flask request by the controller."""
+
+    def __init__(self, body: str):
+        self.body = body
+
+    def get_json(self, force=False):
+        return json.loads(self.body)
+
+
+async def read_request(request):
+    return JsonRequest(await request.text())
+
+
+async def simulation_request(method, endpoint, message):
+    """Send the request to the simulation and return its response, without blocking the event loop.
+
+    :param method: The HTTP method of the endpoint.
+    :param endpoint: The name of the endpoint.
+    :param message: The body of the request.
+    :return dict: The response of the simulation.
+    :raises ConnectionError: If the simulation is not online."""
+
+    if ipc_client is None:
+        return await simulation_session.request(method, f'/{endpoint}', message)
+
+    return await ipc_client.request(endpoint, message)
+
+
+async def sim_config(request):
+    """Return the bases information of the simulator."""
+
+    global monitor_connected
+
+    api_url = f'http://{base_url}:{api_port}'
+
+    response = dict(
+        simulation_url=simulation_url,
+        api_url=api_url,
+        max_agents=agents_amount,
+        first_step_time=first_step_time,
+        step_time=step_time,
+        social_asset_timeout=social_assets_timeout
+    )
+
+    monitor_connected = True
+    Logger.normal('Sending simulation config to GUI.')
+
+    return web.json_response(response)
+
+
+async def connection_stats(request):
+    """Return the statistics of the connections kept alive to the simulation and the monitor."""
+
+    return web.json_response({simulation_url: simulation_session.stats(), **http_sessions.stats()})
+
+
+async def start_connections(request):
+    """Starts the API as entry point, as start_connections of api.py.
+
+    Note: This endpoint must be called from the simulation, it is not recommended to the user to call it on his own."""
+
+    Logger.normal('Start connections')
+
+    valid, message = controller.do_internal_verification(await read_request(request))
+
+    if valid != 1:
+        return web.json_response({'message': f'This endpoint can not be accessed. {message}'})
+
+    open_connections(message['back'])
+
+    return web.json_response('')
+
+
+def open_connections(back):
+    """Start the task that handles the first step cycle.
+
+    :param back: 0 if called by the simulation when it starts, 1 if called again because no agent connected."""
+
+    if back != 1:
+        controller.set_started()
+
+        if method == 'time':
+            asyncio.ensure_future(first_step_time_controller(every_agent_registered))
+
+        else:
+            asyncio.ensure_future(first_step_button_controller())
+
+    else:
+        asyncio.ensure_future(first_step_time_controller(one_agent_registered))
+
+    controller.start_timer()
+
+
+async def first_step_time_controller(ready_event):
+    """Waits for either all the agents connect or the time end.
+
+    If all the agents connect, it will start the steps engine and run the simulation with them.
+    If some of the agents does not connect it will open the connections again and retry."""
+
+    agents_connected = int(agents_amount) <= 0
+
+    try:
+        if not agents_connected:
+            await asyncio.wait_for(ready_event.wait(), int(first_step_time))
+            agents_connected = True
+
+    except asyncio.TimeoutError:
+        pass
+
+    if not agents_connected:
+        open_connections(1)
+
+    else:
+        await step_cycle()
+
+
+async def first_step_button_controller():
+    """Wait for the user to press any button, the recommended is 'Enter', but there are no restrictions."""
+
+    Logger.normal('When you are ready press "Enter"')
+    await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
+
+    await step_cycle()
+
+
+async def start_step_cycle(request):
+    """Start the steps engine, as start_step_cycle of api.py.
+
+    Note: This endpoint must be called from the simulation, it is not recommended to the user to call it on his own."""
+
+    valid, message = controller.do_internal_verification(await read_request(request))
+
+    if valid != 1:
+        return web.json_response({'message': f'This endpoint can not be accessed. {message}'})
+
+    await step_cycle()
+
+    return web.json_response('')
+
+
+async def step_cycle():
+    """Start the steps engine and notify the agents that are connected to it that the simulation is starting."""
+
+    controller.finish_connection_timer()
+
+    sim_response = await simulation_request('POST', 'start', {'secret': secret})
+
+    await notify_monitor(initial_percepts_event, sim_response)
+    await notify_monitor(percepts_event, sim_response)
+    await notify_actors(percepts_event, sim_response)
+
+    wait_actions()
+
+
+async def connect_agent(request):
+    """Connect the agent, as connect_agent of api.py."""
+
+    response = {'status': 1, 'result': True, 'message': 'Error.'}
+    connecting_agent = True
+    json_request = await read_request(request)
+
+    if controller.processing_asset_request():
+        Logger.normal('Try to connect a social asset.')
+        status, message = controller.do_social_asset_connection(json_request)
+        connecting_agent = False
+
+    else:
+        Logger.normal('Try to connect a agent.')
+        status, message = controller.do_agent_connection(json_request)
+
+    if status != 1:
+        if connecting_agent:
+            Logger.error(f'Error to connect the agent: {message}')
+        else:
+            Logger.error(f'Error to connect the social asset: {message}')
+
+        response['status'] = status
+        response['result'] = False
+    else:
+        if connecting_agent:
+            Logger.normal('Agent connected.')
+        else:
+            Logger.normal('Social asset connected.')
+
+    response['message'] = message
+
+    return web.json_response(response)
+
+
+@socket.on('register_agent')
+async def register_agent(sid, msg):
+    """Connect the socket of the agent, as register_agent of api.py.
+
+    Note: The agent must be registered to connect the socket."""
+
+    response = {'type': 'initial_percepts', 'status': 0, 'result': False, 'message': 'Error.'}
+    registering_agent = True
+
+    if controller.processing_asset_request():
+        registering_agent = False
+        Logger.normal('Try to register and connect the social asset socket.')
+        status, message = controller.do_social_asset_registration(msg, sid)
+    else:
+        Logger.normal('Try to register and connect the agent socket.')
+        status, message = controller.do_agent_registration(msg, sid)
+
+    if status == 1:
+        try:
+            if not registering_agent:
+                main_token = message[0]
+                token = message[1]
+                sim_response = await simulation_request('POST', 'register_asset',
+                                                        {'main_token': main_token, 'token': token, 'secret': secret})
+
+                if sim_response['status'] == 1:
+                    Logger.normal('Social asset socket connected.')
+
+                    response['status'] = 1
+                    response['result'] = True
+                    response['message'] = 'Social asset successfully connected'
+
+                    response.update(sim_response)
+                    await send_initial_percepts(token, response)
+
+                    if controller.check_requests():
+                        await scheduler.ready(StepScheduler.assets)
+
+                else:
+                    Logger.error(f'Error to connect the social asset socket: {message}')
+
+                    response['status'] = sim_response['status']
+                    response['message'] = sim_response['message']
+            else:
+                sim_response = await simulation_request('POST', 'register_agent', {'token': message, 'secret': secret})
+
+                if sim_response['status'] == 1:
+                    Logger.normal('Agent socket connected.')
+
+                    response['status'] = 1
+                    response['result'] = True
+                    response['message'] = 'Agent successfully connected.'
+
+                    response.update(sim_response)
+
+                    if controller.agents_amount == controller.manager.agents_sockets_manager.count_sockets():
+                        every_agent_registered.set()
+
+                    one_agent_registered.set()
+
+                    await send_initial_percepts(message, response)
+
+                else:
+                    Logger.error(f'Error to connect the agent socket: {message}')
+
+                    response['status'] = sim_response['status']
+                    response['message'] = sim_response['message']
+
+        except ConnectionError:
+            response['status'] = 6
+            response['message'] = 'Simulation is not online.'
+
+    else:
+        Logger.error(f'Unknown error: {message}')
+        response['status'] = status
+        response['message'] = message
+
+
+async def finish_step():
+    """Finish each step of the simulation, as finish_step of api.py.
+
+    Note: This function is only called by the step scheduler, once all the actions are received or the step time
+    ends."""
+
+    Logger.normal('Preparing the actions to send.')
+
+    try:
+        controller.set_processing_actions()
+        tokens_actions_list = [*controller.manager.get_actions('agent'), *controller.manager.get_actions('social_asset')]
+
+        logger.info('sending actions to the simulation engine')
+        sim_response = await simulation_request('POST', 'do_actions', {'actions': tokens_actions_list, 'secret': secret})
+        logger.info('receiving actions results')
+        controller.manager.clear_workers()
+
+        if sim_response['status'] == 0:
+            await abort_simulation('An internal error occurred. Shutting down...')
+            return
+
+        if sim_response['message'] == 'Simulation finished.':
+            Logger.normal('End of the simulation, preparer to restart.')
+
+            sim_response = await simulation_request('PUT', 'restart', {'secret': secret})
+
+            await notify_monitor(end_event, sim_response['report'])
+            await notify_actors(end_event, sim_response['report'])
+
+            if sim_response['status'] == 0:
+                Logger.normal('No more map to run, finishing the simulation...')
+
+                sim_response = await simulation_request('GET', 'terminate', {'secret': secret, 'api': True})
+
+                await notify_monitor(bye_event, sim_response)
+                await notify_actors(bye_event, sim_response)
+
+                await stop_monitor()
+                Logger.normal(f'Connections: {simulation_session.stats()}, {http_sessions.stats()}')
+
+                scheduler.stop()
+                asyncio.ensure_future(auto_destruction())
+
+            else:
+                Logger.normal('Restart the simulation.')
+
+                controller.clear_social_assets(sim_response['assets_tokens'])
+                controller.new_match()
+
+                await notify_monitor(initial_percepts_event, sim_response['initial_percepts'])
+                await notify_actors(initial_percepts_event, sim_response['initial_percepts'])
+                await notify_monitor(percepts_event, sim_response['percepts'])
+                await notify_actors(percepts_event, sim_response['percepts'])
+
+                controller.set_processing_actions()
+                wait_actions()
+
+        else:
+            controller.set_processing_actions()
+            await notify_monitor(percepts_event, sim_response)
+
+            if sim_response['status'] == 2:
+                Logger.normal('Open connections for the social assets.')
+
+                controller.start_social_asset_request(sim_response)
+                scheduler.wait(StepScheduler.assets, int(social_assets_timeout))
+
+            else:
+                await notify_actors(percepts_event, sim_response)
+                Logger.normal('Wait all the agent send yours actions.')
+
+                wait_actions()
+
+    except (ConnectionError, asyncio.TimeoutError, json.decoder.JSONDecodeError):
+        logger.critical('Error to process the agents actions.', exc_info=True)
+
+        await abort_simulation()
+
+
+async def abort_simulation(message='The step could not be finished. Shutting down...'):
+    """Shut down the API when the step could not be finished, as abort_simulation of api.py.
+
+    :param message: The reason sent to the monitor."""
+
+    logger.critical(message)
+    await notify_monitor(error_event, {'message': message})
+
+    try:
+        await simulation_request('GET', 'terminate', {'secret': secret, Logger.TAG_NORMAL: True})
+    except (ConnectionError, asyncio.TimeoutError, json.decoder.JSONDecodeError):
+        pass
+
+    await stop_monitor()
+    scheduler.stop()
+    asyncio.ensure_future(auto_destruction())
+
+
+async def handle_response():
+    """Finish the social assets request, once all the social assets requested are connected or the time ends.
+
+    Note: This function is only called by the step scheduler."""
+
+    Logger.normal('Handle the agent response after try to connect the social asset.')
+
+    tokens = controller.get_social_assets_tokens()
+
+    sim_response = await simulation_request('POST', 'finish_social_asset_connections', {'tokens': tokens, 'secret': secret})
+
+    response = controller.format_actions_result(sim_response)
+    await notify_actors(percepts_event, response)
+    controller.finish_assets_connections()
+
+    wait_actions()
+
+
+def wait_actions():
+    """Wait for all the agents to send their actions or the time to end, either one will finish the step."""
+
+    scheduler.wait(StepScheduler.actions, int(step_time) if int(agents_amount) > 0 else 0)
+
+
+scheduler = AsyncStepScheduler({StepScheduler.actions: finish_step, StepScheduler.assets: handle_response})
+
+
+@socket.on('send_action')
+async def send_action_temp(sid, msg):
+    """Receive all the actions from the agents or social assets.
+
+    Note: The actions are stored and only used when the step is finished and the simulation process it."""
+
+    status, message = controller.do_action(msg)
+
+    if status != 1:
+        Logger.error('Error to storage the action received.')
+
+    else:
+        tokens_connected_size = controller.manager.count_sockets()
+        workers = controller.manager.count_workers()
+
+        Logger.normal(f'Action received: {workers} of {tokens_connected_size}.')
+
+        if tokens_connected_size == workers:
+            Logger.normal('All actions received.')
+
+            asyncio.ensure_future(scheduler.ready(StepScheduler.actions))
+
+
+@socket.on('disconnect_registered_agent')
+async def disconnect_registered_agent(sid, msg):
+    """Disconnect the agent.
+
+    The agent is removed from the API and will not be able to connect of send actions to it."""
+
+    response = {'status': 0, 'result': False, 'message': 'Error.'}
+
+    status, message = controller.do_agent_socket_disconnection(msg)
+
+    if status == 1:
+        try:
+            sim_response = await simulation_request('PUT', 'delete_agent', {'token': message, 'secret': secret})
+
+            if sim_response['status'] == 1:
+                response['status'] = 1
+                response['result'] = True
+                response['message'] = 'Agent successfully disconnected.'
+
+            else:
+                response['message'] = sim_response['message']
+
+        except json.decoder.JSONDecodeError:
+            response['message'] = 'An internal error occurred at the simulation.'
+
+        except ConnectionError:
+            response['message'] = 'Simulation is not online.'
+
+    Logger.normal(f'Disconnect a agent, message: {message}')
+
+    return json.dumps(response, sort_keys=False)
+
+
+@socket.on('disconnect_registered_asset')
+async def disconnect_registered_asset(sid, msg):
+    """Disconnect the social asset.
+
+    The social asset is removed from the API and will not be able to connect of send actions to it."""
+
+    response = {'status': 0, 'result': False, 'message': 'Error.'}
+
+    status, message = controller.do_social_asset_socket_disconnection(msg)
+
+    if status == 1:
+        try:
+            sim_response = await simulation_request('PUT', 'delete_asset', {'token': message, 'secret': secret})
+
+            if sim_response['status'] == 1:
+                response['status'] = 1
+                response['result'] = True
+                response['message'] = 'Social asset successfully disconnected.'
+
+            else:
+                response['message'] = sim_response['message']
+
+        except json.decoder.JSONDecodeError:
+            response['message'] = 'An internal error occurred at the simulation.'
+
+        except ConnectionError:
+            response['message'] = 'Simulation is not online.'
+
+    return json.dumps(response, sort_keys=False)
+
+
+@socket.on('resync_percepts')
+async def resync_percepts(sid, msg):
+    """Send again the last percepts of the agent or social asset with all its fields.
+
+    Note: Only used by the agents and social assets that asked for delta percepts and detected a gap on the sequence
+    number of the percepts received."""
+
+    status, message = controller.do_percepts_resync(msg)
+
+    if status != 1:
+        Logger.error(f'Error to resync the percepts: {message}')
+
+        return json.dumps({'status': status, 'result': False, 'message': message}, sort_keys=False)
+
+    room = controller.manager.get(json.loads(msg)['token'], 'socket')
+    await socket.emit(percepts_event, json.dumps(message), room=room)
+
+    return json.dumps({'status': 1, 'result': True, 'message': 'Percepts resent.'}, sort_keys=False)
+
+
+async def send_initial_percepts(token, info):
+    """Send the initial percepts for the agent informed.
+
+    The message contain the agent and map percepts."""
+
+    room = controller.manager.get(token, 'socket')
+    response = json_formatter.initial_percepts_format(info, token)
+    controller.manager.reset_percepts(token)
+    await socket.emit(initial_percepts_event, response, room=room)
+
+
+async def notify_monitor(event, response):
+    """Queue the update of the monitor, waiting on a thread of the executor if the queue is full and blocks."""
+
+    if not monitor_connected:
+        return
+    Logger.normal('Update monitor.')
+
+    update = notifications.monitor_update(event, response, controller.get_current_match())
+    if update is None:
+        return
+
+    await asyncio.get_event_loop().run_in_executor(None, monitor_publisher.publish, *update)
+
+
+def post_monitor(url, body):
+    """Post the update to the monitor, called by the monitor publisher on its own thread.
+
+    :param url: The path of the endpoint of the monitor.
+    :param body: The update or the list of steps, already encoded."""
+
+    monitor_response = http_sessions.request('POST', monitor_url, url, data=body,
+                                             headers={'Content-Type': 'application/json'})
+
+    if not monitor_response:
+        Logger.error('Error sending data to monitor.')
+
+
+monitor_publisher = MonitorPublisher(post_monitor, int(monitor_queue), monitor_policy)
+
+
+async def stop_monitor():
+    await asyncio.get_event_loop().run_in_executor(None, monitor_publisher.stop, monitor_flush_timeout)
+
+
+async def notify_actors(event, response):
+    """Notify the agents and social assets through sockets, as notify_actors of api.py.
+
+    The messages of all the sockets are emitted at once, so the time to notify them does not add up with each socket
+    waiting to be written."""
+
+    Logger.normal('Notifying the agents.')
+
+    room_response_list = notifications.actors_messages(event, response, controller.manager)
+    await asyncio.gather(*[socket.emit(event, agent_response, room=room) for room, agent_response in room_response_list])
+
+
+async def calculate_route(request):
+    """Send a request for the simulator to calculate a route between the coord given."""
+
+    response = {'status': 0, 'result': False, 'message': ''}
+
+    if not controller.simulation_started():
+        response['message'] = 'The simulator has not started yet.'
+
+    else:
+        json_request = await read_request(request)
+        status, message = controller.check_service_request(json_request)
+
+        if status == 1:
+            # Can be add more types of services
+            sim_response = await simulation_request('GET', 'calculate_route',
+                                                    {'parameters': json_request.get_json(force=True)['parameters'], 'secret': secret})
+
+            if sim_response['status'] == 1:
+                response['status'] = 1
+                response['result'] = True
+                response['response'] = sim_response['response']
+            else:
+                response['message'] = sim_response['message']
+        else:
+            response['message'] = message
+
+    return web.json_response(response)
+
+
+async def terminate(request):
+    """Terminate the process that runs the API.
+
+    Note: This endpoint must be called from the simulation, it is not recommended to the user to call it on his own."""
+
+    valid, message = controller.do_internal_verification(await read_request(request))
+
+    if valid != 1:
+        return web.json_response({'message': 'This endpoint can not be accessed.'})
+
+    if 'back' not in message:
+        return web.json_response({'message': 'This endpoint can not be accessed.'})
+
+    if message['back'] == 0:
+        await stop_monitor()
+        asyncio.ensure_future(auto_destruction())
+    else:
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    return web.json_response('')
+
+
+async def auto_destruction():
+    """Wait one second, so the last messages are sent, and then terminate the process."""
+
+    await asyncio.sleep(1)
+    await simulation_session.close()
+
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+async def start_background_tasks(application):
+    monitor_publisher.start()
+    socket.start_background_task(scheduler.run)
+
+
+app.router.add_get('/sim_config', sim_config)
+app.router.add_get('/connection_stats', connection_stats)
+app.router.add_post('/start_connections', start_connections)
+app.router.add_get('/start_step_cycle', start_step_cycle)
+app.router.add_post('/connect_agent', connect_agent)
+app.router.add_get('/call_service', calculate_route)
+app.router.add_get('/terminate', terminate)
+app.on_startup.append(start_background_tasks)
+
+
+if __name__ == '__main__':
+    Logger.normal(f'API: Serving on http://{base_url}:{api_port}')
+    web.run_app(app, host=base_url, port=int(api_port), print=None)
@@ -105,6 +105,15 @@ class Controller:
             if not isinstance(obj, dict):
                 return 4, 'Object is not a dictionary.'
 
+            if obj.get('percepts', 'full') not in ('full', 'delta'):
+                return 4, 'Percepts must be either full or delta.'
+
+            if obj.get('route', 'full') not in ('full', 'next_k', 'none', 'polyline'):
+                return 4, 'Route must be either full, next_k, none or polyline.'
+
+            if not isinstance(obj.get('route_waypoints', 10), int) or obj.get('route_waypoints', 10) < 1:
+                return 4, 'Route waypoints must be a positive integer.'
+
             token = jwt.encode(obj, 'secret', algorithm='HS256').decode('utf-8')
 
             if self.manager.get(token, 'agent') is not None:
@@ -153,6 +162,19 @@ class Controller:
             step = obj['step']
             agent_info = {'name': obj['name']}
 
+            if obj.get('percepts', 'full') not in ('full', 'delta'):
+                return 4, 'Percepts must be either full or delta.'
+
+            if obj.get('route', 'full') not in ('full', 'next_k', 'none', 'polyline'):
+                return 4, 'Route must be either full, next_k, none or polyline.'
+
+            if not isinstance(obj.get('route_waypoints', 10), int) or obj.get('route_waypoints', 10) < 1:
+                return 4, 'Route waypoints must be a positive integer.'
+
+            for key in ['percepts', 'route', 'route_waypoints']:
+                if key in obj:
+                    agent_info[key] = obj[key]
+
             if not self.asset_request_manager.check_token_request(main_token):
                 return 5, 'There is no social asset request for this token.'
 
@@ -271,6 +293,43 @@ class Controller:
         except Exception as e:
             return 0, f'Unknown error: {str(e)}'
 
+    def do_percepts_resync(self, msg):
+        """Do the resync of the percepts of the agent or social asset that detected a gap on the delta percepts.
+
+        :param msg: Message sent to the API through socket by the agent or social asset.
+        :return tuple: First position with the status and the second position with the percepts or the message."""
+
+        try:
+            obj = json.loads(msg)
+
+            if not self.started:
+                return 5, 'Simulation has not started.'
+
+            if self.terminated:
+                return 5, 'Simulation already terminated.'
+
+            if not isinstance(obj, dict):
+                return 4, 'Object is not a dictionary.'
+
+            if 'token' not in obj:
+                return 3, 'Object does not contain "token" as key.'
+
+            if self.manager.get(obj['token'], 'socket') is None:
+                return 5, 'Socket was not connected.'
+
+            percepts = self.manager.resync_percepts(obj['token'])
+
+            if percepts is None:
+                return 5, 'No delta percepts were sent.'
+
+            return 1, percepts
+
+        except json.JSONDecodeError:
+            return 2, 'Object format is not JSON.'
+
+        except Exception as e:
+            return 0, f'Unknown error: {str(e)}'
+
     def do_agent_socket_disconnection(self, msg):
         """Do the socket disconnect of the agent.
 
@@ -424,11 +483,8 @@ class Controller:
             if self.manager.get(obj['token'], 'socket') is None:
                 return 5, 'Socket was not connect.'
 
-            if not self.manager.edit(obj['token'], 'action_name', obj['action'], kind):
-                return 0, 'Error while editing action.'
-
-            if not self.manager.edit(obj['token'], 'action_params', obj['parameters'], kind):
-                return 0, 'Error while editing parameters.'
+            if not self.manager.post_action(obj['token'], obj['action'], obj['parameters'], kind):
+                return 5, 'Object already sent an action.'
 
             if not self.manager.edit(obj['token'], 'worker', True, kind):
                 return 0, 'Error while editing working state.'
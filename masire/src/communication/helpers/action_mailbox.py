@@ -0,0 +1,50 @@
+import threading
+
+
+class ActionMailbox:
+    """Class that holds the actions sent on the current step in a buffer that is swapped by a new one when the step is
+    closed.
+
+    The actions are only written to the open buffer, so the closed one can be read without any lock nor retry while
+    the actions of the next step arrive. An action that arrives after the swap is kept for the next step."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buffer: dict = {}
+
+    def post(self, token, action, parameters):
+        """Store the action on the open buffer.
+
+        :param token: The token of the agent or social asset.
+        :param action: The name of the action.
+        :param parameters: The parameters of the action.
+        :return bool: True if stored, False if the actor already sent an action on this step."""
+
+        with self.lock:
+            if token in self.buffer:
+                return False
+
+            self.buffer[token] = {'token': token, 'action': action, 'parameters': parameters}
+
+        return True
+
+    def swap(self):
+        """Close the open buffer and open a new one.
+
+        :return list: The actions of the closed buffer, in the order they arrived."""
+
+        with self.lock:
+            closed, self.buffer = self.buffer, {}
+
+        return list(closed.values())
+
+    def discard(self, token):
+        """Remove the action of an actor that is no longer connected.
+
+        :param token: The token of the agent or social asset."""
+
+        with self.lock:
+            self.buffer.pop(token, None)
+
+    def __len__(self):
+        return len(self.buffer)
@@ -1,34 +1,41 @@
 """This module formats the different events to send to the agents and social assets.
 
 Note: The response does not have agent or social asset as key until they are processed."""
+import json
 import logging
+from . import polyline
 logger = logging.getLogger(__name__)
 
-def initial_percepts_format(response, token):
+def index_actors(actors):
+    """Index the agents and social assets of the response by their token.
+
+    The index is built once for the response and shared by the formatting of every actor, so finding the actor of a
+    token does not go through the whole list nor changes the response.
+
+    :param actors: The agents of the initial percepts or the actors of the percepts.
+    :return dict: Dictionary with the token as key and the agent or social asset of the response."""
+
+    return {(actor['agent'] if 'agent' in actor else actor['asset'])['token']: actor for actor in actors}
+
+
+def initial_percepts_format(response, token, agents=None):
     info = {'type': 'initial_percepts', 'map_percepts': {}, 'agent_percepts': {}}
 
     if response:
         if response['status']:
+            if agents is None:
+                agents = index_actors(response['agents'])
 
-            found_index = 0
-            for idx, agent in enumerate(response['agents']):
-                if 'agent' in agent:
-                    if agent['agent']['token'] == token:
-                        info['agent_percepts'] = agent_constants(agent['agent'])
-                        found_index = idx
-                        break
-
-                else:
-                    if agent['asset']['token'] == token:
-                        info['agent_percepts'] = asset_constants(agent['asset'])
-                        found_index = idx
-                        break
-
-            if not info['agent_percepts']:
+            agent = agents.get(token)
+            if agent is None:
                 return event_error_format('Actor not found in response. ')
 
+            if 'agent' in agent:
+                info['agent_percepts'] = agent_constants(agent['agent'])
+            else:
+                info['agent_percepts'] = asset_constants(agent['asset'])
+
             info['map_percepts'] = format_map_percepts_agents(response['map_percepts'])
-            response['agents'].pop(found_index)
 
             return info
         else:
@@ -49,7 +56,7 @@ def format_map_percepts_agents(map_percepts):
     }
 
 
-def percepts_format(response, token):
+def percepts_format(response, token, actors=None):
     info = {'type': 'percepts', 'environment': {}, 'message': ''}
 
     if response:
@@ -57,42 +64,23 @@ def percepts_format(response, token):
             info['status'] = response['status']
             info['result'] = True
 
-            found_index = 0
-            logger.debug(f"total of actors {len(response['actors'])}")
-            for idx, actor in enumerate(response['actors']):
-                # if 'agent' in actor:
-                #     if actor['agent']['token'] == token:
-                #         info['agent'] = agent_variables(actor['agent'])
-                #         info['message'] = actor['message']
-                #         found_index = idx
-                #         break
-                # else:
-                #     if actor['asset']['token'] == token:
-                #         info['agent'] = asset_variables(actor['asset'])
-                #         info['message'] = actor['message']
-                #         found_index = idx
-                #         break
-                # if 'agent' in actor:
-                #     logger.debug(f"actor agent api {actor['agent']['token']}")
-                # else:
-                #     logger.debug(f"actor asset api {actor['asset']['token']}")
-                if 'asset' in actor:
-                    test = 'uhull'
-
-                if 'agent' in actor and actor['agent']['token'] == token:
-                    if actor['agent']['type'] != 'social_asset':
-                        info['agent'] = agent_variables(actor['agent'])
-                    else:
-                        info['agent'] = asset_variables(actor['agent'])
-                    info['message'] = actor['message']
-                    found_index = idx
-                    break
-
-            if 'agent' not in info:
+            if actors is None:
+                actors = index_actors(response['actors'])
+
+            actor = actors.get(token)
+            if actor is None or 'agent' not in actor:
                 return event_error_format('Actor not found in response. ')
 
-            response['actors'].pop(found_index)
-            info['environment'] = response['environment']
+            if actor['agent']['type'] != 'social_asset':
+                info['agent'] = agent_variables(actor['agent'])
+            else:
+                info['agent'] = asset_variables(actor['agent'])
+            info['message'] = actor['message']
+
+            if 'events' in actor:
+                info['environment'] = {**response['environment'], 'events': actor['events']}
+            else:
+                info['environment'] = response['environment']
 
             return info
         else:
@@ -102,6 +90,73 @@ def percepts_format(response, token):
         return event_error_format('Empty simulation response. ')
 
 
+def delta_percepts_format(info, previous, sequence):
+    """Build the percepts of an actor that asked for delta percepts on the connection.
+
+    Only the token and the fields of the actor that changed since the previous percepts are sent, the environment is
+    sent as it is. Without previous percepts all the fields are sent and the percepts are marked as full.
+
+    :param info: The percepts of the actor built by percepts_format.
+    :param previous: The actor fields sent on the previous percepts or None to send all of them.
+    :param sequence: The number of the percepts, so the actor can detect a gap and ask for a resync.
+    :return dict: The percepts with the changed fields of the actor, the sequence number and if they are full."""
+
+    if info['type'] != 'percepts':
+        return info
+
+    agent = info['agent']
+    if previous is not None:
+        agent = {key: value for key, value in agent.items() if key == 'token' or previous.get(key) != value}
+
+    return {**info, 'agent': agent, 'sequence': sequence, 'full': previous is None}
+
+
+def route_format(info, mode, waypoints):
+    """Reduce the route of the actor with the route mode asked on the connection.
+
+    The full mode keeps the route sent by the engine, next_k only the next waypoints, none an empty list and polyline the
+    whole route as an encoded polyline string. A route already encoded by the engine is only changed by the none mode.
+
+    :param info: The percepts of the actor built by percepts_format.
+    :param mode: The route mode of the connection.
+    :param waypoints: The amount of waypoints kept by the next_k mode.
+    :return dict: The percepts with the route reduced."""
+
+    if info['type'] != 'percepts' or mode == 'full':
+        return info
+
+    route = info['agent']['route']
+    if mode == 'none':
+        route = []
+    elif isinstance(route, str):
+        return info
+    elif mode == 'next_k':
+        route = route[:waypoints]
+    else:
+        route = polyline.encode([(location['lat'], location['lon']) for location in route])
+
+    return {**info, 'agent': {**info['agent'], 'route': route}}
+
+
+def dumps_percepts(info, environment, encoded_environment):
+    """Serialise the percepts of an actor, splicing the environment shared by all the actors already encoded.
+
+    The environment is the same object on the percepts of every actor without events of its own, so it is encoded once
+    per step and only the fields of the actor are encoded for each one.
+
+    :param info: The percepts of the actor.
+    :param environment: The environment shared by the actors on the response of the step.
+    :param encoded_environment: The shared environment already encoded as JSON.
+    :return str: The percepts encoded as JSON."""
+
+    if environment is None or info.get('environment') is not environment:
+        return json.dumps(info)
+
+    actor = json.dumps({key: value for key, value in info.items() if key != 'environment'})
+
+    return f'{{"environment": {encoded_environment}, {actor[1:]}'
+
+
 def end_format(response, token):
     if response:
         if response['status']:
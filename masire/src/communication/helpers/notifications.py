@@ -0,0 +1,97 @@
+"""This module builds the messages of the events sent by the API to the monitor and to the agents and social assets.
+
+Both server modes of the API, api.py and async_api.py, send the messages built here, so they only differ on how the
+messages are sent."""
+
+import json
+
+from . import json_formatter
+from .logger import Logger
+
+# Events variables
+initial_percepts_event = 'initial_percepts'
+percepts_event = 'percepts'
+end_event = 'end'
+bye_event = 'bye'
+error_event = 'error'
+
+
+def monitor_update(event, response, match):
+    """Build the update of the monitor for the event.
+
+    :param event: The name of the event.
+    :param response: The response of the simulation.
+    :param match: The current match.
+    :return tuple|None: The path of the endpoint of the monitor, the update and True if it is a step, that can be
+    batched and dropped by the monitor publisher, or None if the event is not sent to the monitor."""
+
+    url = '/simulator'
+
+    if event == initial_percepts_event:
+        return f'{url}/match/{match}/info/map', json_formatter.initial_percepts_monitor_format(response), False
+
+    if event == percepts_event:
+        info = {key: response[key] for key in ['environment', 'partial_report']}
+        info['actors'] = [{key: value for key, value in actor.items() if key != 'events'} for actor in response['actors']]
+        return f'{url}/match/{match}/step', info, True
+
+    if event == end_event:
+        return f'{url}/match/{match}/info/report', json_formatter.end_monitor_format(response), False
+
+    if event == bye_event:
+        return f'{url}/info/report', json_formatter.end_monitor_format(response), False
+
+    Logger.error('Event type in "notify monitor" not found.')
+    return None
+
+
+def actors_messages(event, response, manager):
+    """Build the message of the event for each agent and social asset connected.
+
+    The actors of the response are indexed once and the environment shared by the percepts is encoded once and spliced
+    into the message of each actor.
+
+    Note: If an unknown event name is given, an error message is built since it was almost certainly caused by
+    internal errors.
+
+    :param event: The name of the event.
+    :param response: The response of the simulation.
+    :param manager: The manager of the agents, social assets and sockets.
+    :return list: Tuples with the room of the socket and the encoded message."""
+
+    tokens = [*manager.agents_sockets_manager.get_tokens(), *manager.assets_sockets_manager.get_tokens()]
+    room_response_list = []
+
+    actors = None
+    environment = None
+    encoded_environment = None
+    if event == initial_percepts_event and response and response['status']:
+        actors = json_formatter.index_actors(response['agents'])
+
+    elif event == percepts_event and response and response['status']:
+        actors = json_formatter.index_actors(response['actors'])
+        environment = response['environment']
+        encoded_environment = json.dumps(environment)
+
+    for token in tokens:
+        if event == initial_percepts_event:
+            info = json_formatter.initial_percepts_format(response, token, actors)
+            manager.reset_percepts(token)
+
+        elif event == percepts_event:
+            info = manager.format_percepts(token, json_formatter.percepts_format(response, token, actors))
+
+        elif event == end_event:
+            info = json_formatter.end_format(response, token)
+
+        elif event == bye_event:
+            info = json_formatter.bye_format(response, token)
+
+        else:
+            Logger.error('Wrong event name. Possible internal errors.')
+            info = json_formatter.event_error_format('Error in API.')
+
+        room = manager.get(token, 'socket')
+        room_response_list.append((room, json_formatter.dumps_percepts(info, environment, encoded_environment)))
+
+    return room_response_list
@@ -0,0 +1,64 @@
+"""This module encodes the routes with the encoded polyline algorithm, the same one used by the Google Maps APIs.
+
+Each coordinate is rounded to five decimal places and only its difference to the previous one is written, as groups of
+five bits shifted to printable characters, so a route of thousands of locations becomes a short string that any
+polyline library can decode."""
+
+precision = 5
+
+
+def encode_value(value: int) -> str:
+    value = ~(value << 1) if value < 0 else value << 1
+
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+
+    return ''.join(chunks)
+
+
+def encode(route) -> str:
+    """Encode the locations of the route.
+
+    :param route: List of locations, only the latitude and longitude of each one are encoded.
+    :return str: The encoded polyline."""
+
+    factor = 10 ** precision
+    encoded = []
+    last_lat = last_lon = 0
+    for location in route:
+        lat, lon = round(location[0] * factor), round(location[1] * factor)
+        encoded.append(encode_value(lat - last_lat))
+        encoded.append(encode_value(lon - last_lon))
+        last_lat, last_lon = lat, lon
+
+    return ''.join(encoded)
+
+
+def decode(polyline: str) -> list:
+    """Decode the polyline back to the locations of the route.
+
+    :param polyline: The encoded polyline.
+    :return list: List of tuples with the latitude and longitude of each location."""
+
+    factor = 10 ** precision
+    values = []
+    value = shift = 0
+    for char in polyline:
+        chunk = ord(char) - 63
+        value |= (chunk & 0x1f) << shift
+        shift += 5
+        if chunk < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+
+    route = []
+    lat = lon = 0
+    for index in range(0, len(values) - 1, 2):
+        lat += values[index]
+        lon += values[index + 1]
+        route.append((lat / factor, lon / factor))
+
+    return route
@@ -10,4 +10,9 @@ class SocialAsset:
         self.action_name = ''
         self.action_params = []
         self.asset_info = obj
+        self.delta_percepts = obj.get('percepts') == 'delta'
+        self.route_mode = obj.get('route', 'full')
+        self.route_waypoints = obj.get('route_waypoints', 10)
+        self.sequence = 0
+        self.last_percepts = None
 
@@ -104,7 +104,12 @@ class MatchStepManager(Resource):
             if step is None:
                 try:
                     json_data = request.get_json(force=True)
-                    monitor_manager.add_match_step(match, json_data)
+
+                    # The API sends the steps together as a list when the monitor is behind
+                    steps = json_data if isinstance(json_data, list) else [json_data]
+                    for step_info in steps:
+                        monitor_manager.add_match_step(match, step_info)
+
                     return 'Ok', 200
 
                 except Exception as e:
@@ -2,6 +2,7 @@ from communication.helpers.agents_manager import AgentsManager
 from communication.helpers.social_assets_manager import SocialAssetsManager
 from communication.helpers.sockets_manager import SocketsManager
 from communication.helpers.monitor_manager import MonitorManager
+from communication.helpers import json_formatter
 
 
 class Manager:
@@ -97,6 +98,24 @@ class Manager:
         else:
             return None
 
+    def post_action(self, token, action_name, action_params, kind):
+        """Store the action sent by the agent or social asset on the current step.
+
+        :param token: The token of the agent or social asset.
+        :param action_name: The name of the action.
+        :param action_params: The parameters of the action.
+        :param kind: Either agent or social asset.
+        :return bool: True if stored else False."""
+
+        if kind == 'agent':
+            return self.agents_manager.post_action(token, action_name, action_params)
+
+        elif kind == 'social_asset':
+            return self.social_assets_manager.post_action(token, action_name, action_params)
+
+        else:
+            return False
+
     def get_workers(self, kind):
         """Get all the worker agents or social assets.
 
@@ -112,6 +131,20 @@ class Manager:
         else:
             return None
 
+    def count_sockets(self):
+        """Count the sockets of the agents and social assets connected.
+
+        :return int: The amount of sockets."""
+
+        return self.agents_sockets_manager.count_sockets() + self.assets_sockets_manager.count_sockets()
+
+    def count_workers(self):
+        """Count the agents and social assets that already sent their action on the step.
+
+        :return int: The amount of workers."""
+
+        return self.agents_manager.count_workers() + self.social_assets_manager.count_workers()
+
     def get_kind(self, token):
         """Return the kind of the token.
 
@@ -181,6 +214,52 @@ class Manager:
 
         return True
 
+    def format_percepts(self, token, info):
+        """Reduce the route and turn the percepts into delta percepts as the actor asked on the connection.
+
+        :param token: The identifier of the agent or social asset.
+        :param info: The percepts of the actor built by percepts_format.
+        :return dict: The percepts that will be sent to the actor."""
+
+        kind = self.get_kind(token)
+        actor = self.get(token, kind) if kind is not None else None
+
+        if actor is None or info['type'] != 'percepts':
+            return info
+
+        info = json_formatter.route_format(info, actor.route_mode, actor.route_waypoints)
+        if not actor.delta_percepts:
+            return info
+
+        previous = actor.last_percepts['agent'] if actor.last_percepts is not None else None
+        actor.sequence += 1
+        actor.last_percepts = info
+
+        return json_formatter.delta_percepts_format(info, previous, actor.sequence)
+
+    def reset_percepts(self, token):
+        """Make the next percepts of the actor a full snapshot, used when the actor receives its initial percepts.
+
+        :param token: The identifier of the agent or social asset."""
+
+        kind = self.get_kind(token)
+        if kind is not None:
+            self.get(token, kind).last_percepts = None
+
+    def resync_percepts(self, token):
+        """Return the last percepts sent to the actor with all its fields.
+
+        :param token: The identifier of the agent or social asset.
+        :return dict|None: The full percepts with the current sequence number or None if no percepts were sent."""
+
+        kind = self.get_kind(token)
+        actor = self.get(token, kind) if kind is not None else None
+
+        if actor is None or actor.last_percepts is None:
+            return None
+
+        return json_formatter.delta_percepts_format(actor.last_percepts, None, actor.sequence)
+
     def add_monitor(self, sid):
         return self.monitors_manager.add_monitor(sid)
 
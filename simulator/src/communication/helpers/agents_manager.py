@@ -1,4 +1,4 @@
-import time
+from communication.helpers.action_mailbox import ActionMailbox
 from communication.objects.agent import Agent
 
 
@@ -7,6 +7,8 @@ class AgentsManager:
 
     def __init__(self):
         self.agents = {}
+        self.workers_amount = 0
+        self.mailbox = ActionMailbox()
 
     def add_agent(self, token, agent_info):
         """Add an agent to the dictionary.
@@ -33,35 +35,31 @@ class AgentsManager:
 
         return list(self.agents.values())
 
-    def get_actions(self):
-        """Return a list of all the actions that the agents have sent to the simulation on the previous step.
+    def post_action(self, token, action_name, action_params):
+        """Store the action sent by the agent on the current step.
 
-        Note: RuntimeError can occur if the gap between validating the action and ending the step occur, to prevent that,
-        it will wait one second after the error and then proceed. If the error happens again, then it must be some
-        internal error that are allowing the agents to send actions after the step is finished.
+        :param token: The token of the agent.
+        :param action_name: The name of the action.
+        :param action_params: The parameters of the action.
+        :return bool: True if stored, False if the agent already sent an action on the step."""
 
-        :return list: All the actions sent on the previous step."""
+        if not self.mailbox.post(token, action_name, action_params):
+            return False
 
-        actions = []
-        try:
-            for token in self.agents:
-                if self.agents[token].worker:
-                    action_name = self.agents[token].action_name
-                    action_params = self.agents[token].action_params
+        self.agents[token].action_name = action_name
+        self.agents[token].action_params = action_params
 
-                    actions.append({'token': token, 'action': action_name, 'parameters': action_params})
+        return True
 
-        except RuntimeError:
-            time.sleep(1)
-            actions = []
-            for token in self.agents:
-                if self.agents[token].worker:
-                    action_name = self.agents[token].action_name
-                    action_params = self.agents[token].action_params
+    def get_actions(self):
+        """Return a list of all the actions that the agents have sent to the simulation on the previous step.
+
+        The buffer of the step is swapped by a new one, so the actions are read while the ones of the next step are
+        stored on the new buffer.
 
-                    actions.append({'token': token, 'action': action_name, 'parameters': action_params})
+        :return list: All the actions sent on the previous step."""
 
-        return actions
+        return self.mailbox.swap()
 
     def get_workers(self):
         """Get all the workers. The agent is considered a worker if it sent an action on the previous step.
@@ -70,6 +68,13 @@ class AgentsManager:
 
         return [self.agents[token] for token in self.agents if self.agents[token].worker]
 
+    def count_workers(self):
+        """Count the workers without going through the agents, the amount is kept as the workers change.
+
+        :return int: The amount of workers."""
+
+        return self.workers_amount
+
     def edit_agent(self, token, attribute, new_value):
         """Edit an attribute of some agent.
 
@@ -77,6 +82,9 @@ class AgentsManager:
         :param attribute: The attribute of the agent that will be edited.
         :param new_value: The new value for the attribute given."""
 
+        if attribute == 'worker' and self.agents[token].worker != new_value:
+            self.workers_amount += 1 if new_value else -1
+
         exec(f'self.agents[token].{attribute} = new_value')
 
     def clear_workers(self):
@@ -86,9 +94,15 @@ class AgentsManager:
         for token in self.agents:
             self.agents[token].worker = False
 
+        self.workers_amount = 0
+
     def remove_agent(self, token):
         """Remove an agent from the dictionary.
 
         :param token: The generated token that will be removed from the dictionary."""
 
+        if self.agents[token].worker:
+            self.workers_amount -= 1
+
+        self.mailbox.discard(token)
         del self.agents[token]
@@ -0,0 +1,76 @@
+"""This module keeps the HTTP session of the asyncio server mode of the API, the same as HttpSessions but without
+blocking the event loop while the simulator answers.
+
+Only the connections that could not be opened are tried again, a request already sent is never sent twice."""
+
+import asyncio
+import aiohttp
+
+
+class AsyncHttpSession:
+    """Class that holds the aiohttp session of one destination and the statistics of its pool."""
+
+    def __init__(self, destination: str, timeout: float = 0, retries: int = 2, pool_size: int = 10):
+        """
+        :param destination: The scheme, host and port of the destination, e.g. http://127.0.0.1:8910.
+        :param timeout: Seconds to wait for the connection and for the response, 0 to wait for the response forever.
+        :param retries: Times the connection is tried again if it could not be opened.
+        :param pool_size: Connections kept alive."""
+
+        self.destination: str = destination
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout or 5, sock_read=timeout or None)
+        self.retries: int = retries
+        self.pool_size: int = pool_size
+        self.session = None
+        self.requests: int = 0
+        self.connections: int = 0
+
+    async def on_connection_create(self, session, context, params):
+        self.connections += 1
+
+    def open(self):
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self.on_connection_create)
+
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_size),
+                                             timeout=self.timeout, trace_configs=[trace])
+
+    async def request(self, method: str, path: str, message):
+        """Send the request and return the JSON of the response.
+
+        :param method: The HTTP method.
+        :param path: The path of the endpoint, starting with /.
+        :param message: The JSON body of the request.
+        :return dict: The response of the destination.
+        :raises ConnectionError: If the destination is not online or the request failed."""
+
+        if self.session is None:
+            self.open()
+
+        for attempt in range(self.retries + 1):
+            self.requests += 1
+            try:
+                async with self.session.request(method, self.destination + path, json=message) as response:
+                    return await response.json(content_type=None)
+
+            except aiohttp.ClientConnectorError as e:
+                if attempt == self.retries:
+                    raise ConnectionError(f'{self.destination} is not online: {e}')
+
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+            except aiohttp.ClientConnectionError as e:
+                raise ConnectionError(f'{self.destination} closed the connection: {e}')
+
+            except aiohttp.ClientError as e:
+                raise ConnectionError(f'{self.destination} answered with an error: {e}')
+
+    def stats(self) -> dict:
+        """Return the requests sent and the connections opened, fewer connections show that they are being reused."""
+
+        return {'requests': self.requests, 'connections': self.connections}
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
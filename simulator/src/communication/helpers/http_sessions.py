@@ -0,0 +1,86 @@
+"""This module keeps one HTTP session for each process the API talks to, so the connections are kept alive and reused
+by every step instead of opened for each call.
+
+Each destination has its own pool of connections and its own retry policy. The connections that could not be opened
+are tried again for every method, while the requests already sent are never sent again, so a step is not processed
+twice by the simulator."""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpSessions:
+    """Class that holds the session of each destination and the statistics of its pool."""
+
+    def __init__(self, timeout: float = 0, retries: int = 2, pool_size: int = 10):
+        """
+        :param timeout: Seconds to wait for the connection and for the response, 0 to wait for the response forever.
+        :param retries: Times the connection is tried again if it could not be opened.
+        :param pool_size: Connections kept alive for each destination."""
+
+        self.timeout = (timeout, timeout) if timeout else (5, None)
+        self.retries: int = retries
+        self.pool_size: int = pool_size
+        self.sessions: dict = {}
+        self.lock = threading.Lock()
+
+    def session(self, destination: str) -> requests.Session:
+        """Return the session of the destination, created on its first request.
+
+        :param destination: The scheme, host and port of the destination, e.g. http://127.0.0.1:8910.
+        :return requests.Session: The session of the destination."""
+
+        with self.lock:
+            if destination not in self.sessions:
+                retry = Retry(total=self.retries, connect=self.retries, read=0, status=0, redirect=0,
+                              backoff_factor=0.1)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+
+                session = requests.Session()
+                session.mount(destination, adapter)
+                self.sessions[destination] = session
+
+            return self.sessions[destination]
+
+    def request(self, method: str, destination: str, path: str, **kwargs) -> requests.Response:
+        """Send the request through the session of the destination.
+
+        :param method: The HTTP method.
+        :param destination: The scheme, host and port of the destination.
+        :param path: The path of the endpoint, starting with /.
+        :return requests.Response: The response of the destination."""
+
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session(destination).request(method, destination + path, **kwargs)
+
+    def stats(self) -> dict:
+        """Return the statistics of the pool of each destination.
+
+        The connections opened lower than the requests sent show that the connections are being reused.
+
+        :return dict: Dictionary with the destination as key and the requests sent, the connections opened and the
+        connections idle on its pool."""
+
+        stats = {}
+        with self.lock:
+            for destination, session in self.sessions.items():
+                pools = session.get_adapter(destination).poolmanager.pools
+                pools = [pools[key] for key in pools.keys()]
+
+                stats[destination] = {
+                    'requests': sum(pool.num_requests for pool in pools),
+                    'connections': sum(pool.num_connections for pool in pools),
+                    'idle': sum(connection is not None for pool in pools if pool.pool is not None
+                                for connection in pool.pool.queue)
+                }
+
+        return stats
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+
+            self.sessions.clear()
@@ -0,0 +1,218 @@
+"""This module is the transport between the API and the simulator over a Unix domain socket, chosen with the -ipc
+startup argument instead of the HTTP calls.
+
+The API keeps a single connection open to the simulator and each request waits for its response, as on HTTP. Every
+message is the length of the body (uint32, big endian) followed by the body, a marshal dump of the dictionary sent or
+returned by the endpoint prefixed with M, or its JSON prefixed with J when it holds any type marshal can not dump. The
+requests hold the name of the endpoint and the message that would be its JSON body, the responses are the same
+dictionaries the HTTP endpoints return."""
+
+import os
+import json
+import struct
+import socket
+import asyncio
+import marshal
+import tempfile
+import threading
+import socketserver
+
+_length = struct.Struct('!I')
+
+
+def socket_path(simulation_port) -> str:
+    """Path of the socket of the simulator, derived from its port so both processes find it.
+
+    :param simulation_port: The port of the simulator.
+    :return str: The path of the socket file."""
+
+    return os.path.join(tempfile.gettempdir(), f'disaster_simulator_{simulation_port}.sock')
+
+
+def encode(content) -> bytes:
+    try:
+        return b'M' + marshal.dumps(content)
+    except ValueError:
+        return b'J' + json.dumps(content, separators=(',', ':')).encode()
+
+
+def decode(body: bytes):
+    if body[:1] == b'M':
+        return marshal.loads(body[1:])
+
+    return json.loads(body[1:])
+
+
+def frame(content) -> bytes:
+    body = encode(content)
+    return _length.pack(len(body)) + body
+
+
+def send_message(connection, content):
+    connection.sendall(frame(content))
+
+
+def receive_exactly(connection, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = connection.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError('Connection closed by the other side.')
+
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b''.join(chunks)
+
+
+def receive_message(connection):
+    size, = _length.unpack(receive_exactly(connection, _length.size))
+    return decode(receive_exactly(connection, size))
+
+
+class IpcClient:
+    """Class that sends the requests of the API to the simulator over one persistent connection."""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(self.path)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def request(self, endpoint: str, message: dict):
+        """Send the request and wait for its response.
+
+        A connection closed by the simulator is opened again only if the request could not be sent on it, so a step is
+        never sent twice.
+
+        :param endpoint: The name of the endpoint of the simulator.
+        :param message: The message that would be the JSON body of the HTTP request.
+        :return dict: The response of the endpoint.
+        :raises ConnectionError: If the simulator is not online."""
+
+        with self.lock:
+            for attempt in range(2):
+                reused = self.connection is not None
+                try:
+                    if not reused:
+                        self.connect()
+
+                    send_message(self.connection, {'endpoint': endpoint, 'message': message})
+
+                except OSError as e:
+                    self.close()
+                    if reused and not attempt:
+                        continue
+
+                    raise ConnectionError(f'Simulation is not online: {e}')
+
+                try:
+                    return receive_message(self.connection)
+
+                except OSError as e:
+                    self.close()
+                    raise ConnectionError(f'Simulation closed the connection: {e}')
+
+
+class AsyncIpcClient(IpcClient):
+    """Class that sends the requests of the API to the simulator over one persistent connection, without blocking the
+    event loop of the asyncio server mode."""
+
+    def __init__(self, path):
+        super(AsyncIpcClient, self).__init__(path)
+        self.reader = None
+        self.lock = asyncio.Lock()
+
+    async def connect(self):
+        self.reader, self.connection = await asyncio.open_unix_connection(self.path)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            self.reader = None
+
+    async def receive(self):
+        size, = _length.unpack(await self.reader.readexactly(_length.size))
+        return decode(await self.reader.readexactly(size))
+
+    async def request(self, endpoint: str, message: dict):
+        """Send the request and wait for its response, as IpcClient.request.
+
+        :param endpoint: The name of the endpoint of the simulator.
+        :param message: The message that would be the JSON body of the HTTP request.
+        :return dict: The response of the endpoint.
+        :raises ConnectionError: If the simulator is not online."""
+
+        async with self.lock:
+            for attempt in range(2):
+                reused = self.connection is not None
+                try:
+                    if not reused:
+                        await self.connect()
+
+                    self.connection.write(frame({'endpoint': endpoint, 'message': message}))
+                    await self.connection.drain()
+
+                except OSError as e:
+                    self.close()
+                    if reused and not attempt:
+                        continue
+
+                    raise ConnectionError(f'Simulation is not online: {e}')
+
+                try:
+                    return await self.receive()
+
+                except (OSError, asyncio.IncompleteReadError) as e:
+                    self.close()
+                    raise ConnectionError(f'Simulation closed the connection: {e}')
+
+
+class IpcServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Class that answers the requests of the API on the simulator, one at a time since the engine is not shared."""
+
+    daemon_threads = True
+
+    def __init__(self, path, handlers: dict):
+        """
+        :param path: Path of the socket file, replaced if it already exists.
+        :param handlers: Dictionary with the name of the endpoint as key and the function that receives the message
+        and returns the response."""
+
+        if os.path.exists(path):
+            os.unlink(path)
+
+        self.handlers = handlers
+        self.lock = threading.Lock()
+        super(IpcServer, self).__init__(path, IpcHandler)
+        os.chmod(path, 0o600)
+
+    def dispatch(self, request: dict):
+        handler = self.handlers.get(request.get('endpoint'))
+        if handler is None:
+            return {'status': 0, 'message': f'Unknown endpoint {request.get("endpoint")}.'}
+
+        with self.lock:
+            return handler(request['message'])
+
+
+class IpcHandler(socketserver.BaseRequestHandler):
+    """Class that answers every request sent on one connection until it is closed."""
+
+    def handle(self):
+        while True:
+            try:
+                request = receive_message(self.request)
+            except (OSError, struct.error):
+                return
+
+            send_message(self.request, self.server.dispatch(request))
@@ -0,0 +1,151 @@
+"""This module sends the updates of the monitor from a background thread, so a slow monitor does not delay the steps.
+
+The updates are encoded when published and kept on a bounded queue in the order they were published. When the monitor
+lags behind, the steps of the same match waiting on the queue are sent together as a list in a single POST. Once the
+queue is full, the publisher either waits for the monitor (block) or drops the oldest step waiting (drop), the maps and
+reports of the matches are never dropped."""
+
+import json
+import time
+import logging
+import threading
+import collections
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorPublisher:
+    """Class that holds the queue of the updates and the thread that sends them."""
+
+    block = 'block'
+    drop = 'drop'
+
+    def __init__(self, send, capacity: int = 100, policy: str = 'block', batch: int = 20):
+        """
+        :param send: Function that receives the path and the encoded body and posts it to the monitor.
+        :param capacity: Updates kept on the queue.
+        :param policy: Either block or drop, what is done when the queue is full.
+        :param batch: Steps sent on the same POST at most."""
+
+        self.send = send
+        self.capacity: int = capacity
+        self.policy: str = policy
+        self.batch: int = batch
+        self.queue = collections.deque()
+        self.condition = threading.Condition()
+        self.sending: bool = False
+        self.running: bool = False
+        self.stopped: bool = False
+        self.dropped: int = 0
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def publish(self, path: str, info, batchable: bool = False):
+        """Queue the update to be sent to the monitor.
+
+        :param path: The path of the endpoint of the monitor.
+        :param info: The update.
+        :param batchable: True if the update can be sent with the next ones on a list and dropped, as the steps."""
+
+        if self.stopped:
+            logger.warning(f'Monitor publisher already stopped, update to {path} not sent.')
+            return
+
+        body = json.dumps(info, separators=(',', ':'))
+
+        with self.condition:
+            while len(self.queue) >= self.capacity:
+                if self.policy == MonitorPublisher.drop and self.drop_oldest():
+                    break
+
+                if not self.running:
+                    break
+
+                self.condition.wait()
+
+            self.queue.append((path, body, batchable))
+            self.condition.notify_all()
+
+    def drop_oldest(self) -> bool:
+        for index, (_, _, batchable) in enumerate(self.queue):
+            if batchable:
+                del self.queue[index]
+                self.dropped += 1
+                return True
+
+        return False
+
+    def next_post(self) -> tuple:
+        """Remove the next POST from the queue, with the following steps to the same path if it is a step.
+
+        :return tuple: The path and the body of the POST."""
+
+        path, body, batchable = self.queue.popleft()
+        if not batchable or not self.queue or self.queue[0][0] != path or not self.queue[0][2]:
+            return path, body
+
+        bodies = [body]
+        while self.queue and len(bodies) < self.batch and self.queue[0][0] == path and self.queue[0][2]:
+            bodies.append(self.queue.popleft()[1])
+
+        return path, f'[{",".join(bodies)}]'
+
+    def run(self):
+        """Send the updates until the publisher is stopped and the queue is empty."""
+
+        while True:
+            with self.condition:
+                while not self.queue and self.running:
+                    self.condition.wait()
+
+                if not self.queue:
+                    return
+
+                path, body = self.next_post()
+                self.sending = True
+                self.condition.notify_all()
+
+            try:
+                self.send(path, body)
+            except Exception as e:
+                logger.error(f'Error sending data to monitor: {e}')
+
+            with self.condition:
+                self.sending = False
+                self.condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every update published is sent.
+
+        :param timeout: Seconds to wait at most, None to wait until it is done.
+        :return bool: True if every update was sent else False."""
+
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.queue and not self.sending, timeout)
+
+    def stop(self, timeout: float = None) -> bool:
+        """Send the updates still on the queue and stop the thread, the updates published afterwards are not sent.
+
+        :param timeout: Seconds to wait at most for the updates and the thread, None to wait until it is done.
+        :return bool: True if every update was sent else False."""
+
+        self.stopped = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        flushed = self.flush(timeout)
+
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+        if self.thread is not None:
+            self.thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+
+        if not flushed:
+            logger.error(f'Monitor publisher stopped with {len(self.queue)} updates not sent.')
+
+        return flushed
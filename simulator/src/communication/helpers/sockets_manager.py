@@ -38,6 +38,13 @@ class SocketsManager:
 
         return list(self.socket_clients.keys())
 
+    def count_sockets(self):
+        """Count the registered sockets.
+
+        :return int: The amount of sockets."""
+
+        return len(self.socket_clients)
+
     def remove_socket(self, token):
         """Remove a socket from the dictionary.
 
@@ -0,0 +1,142 @@
+"""This module finishes the steps of the simulation from a single task that lives as long as the API.
+
+Each step waits either for the actions of the agents or for the social assets requested, until all of them are
+received or the deadline is reached, whichever comes first. Reaching the deadline is checked by the task, while the
+readiness finishes the step right away on the handler that received the last action or connection, so no process nor
+HTTP call is made for each step."""
+
+import time
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class StepScheduler:
+    """Class that holds the state of the step being waited and finishes it once."""
+
+    idle = 'idle'
+    actions = 'actions'
+    assets = 'assets'
+
+    def __init__(self, callbacks: dict, sleep=time.sleep, tick: float = 0.01):
+        """
+        :param callbacks: Dictionary with the kind of the wait as key and the function that finishes it.
+        :param sleep: Function used to wait between the deadline checks, so the task can be a green thread.
+        :param tick: Seconds between the deadline checks."""
+
+        self.callbacks: dict = callbacks
+        self.sleep = sleep
+        self.tick: float = tick
+        self.lock = threading.Lock()
+        self.state: str = StepScheduler.idle
+        self.deadline: float = 0
+        self.pending: set = set()
+        self.running: bool = False
+
+    def wait(self, kind: str, timeout: float):
+        """Start waiting for the actions or the social assets of the step.
+
+        A readiness received before the wait started, while the previous step was being finished, moves the deadline to
+        now, so the step is finished by the task instead of recursively inside the one being finished.
+
+        :param kind: Either actions or assets.
+        :param timeout: Seconds until the step is finished without all the actions or social assets."""
+
+        with self.lock:
+            self.state = kind
+            self.deadline = time.monotonic() + (0 if kind in self.pending else timeout)
+
+    def ready(self, kind: str):
+        """Finish the step because all the actions or social assets were received.
+
+        :param kind: Either actions or assets."""
+
+        with self.lock:
+            if self.state != kind:
+                self.pending.add(kind)
+                return
+
+        self.finish(kind)
+
+    def finish(self, kind: str) -> bool:
+        """Finish the step if it is still waiting for the kind given, only the first call finishes it.
+
+        :param kind: Either actions or assets.
+        :return bool: True if the step was finished by this call else False."""
+
+        with self.lock:
+            if self.state != kind:
+                return False
+
+            self.state = StepScheduler.idle
+            self.pending.clear()
+
+        try:
+            self.callbacks[kind]()
+        except Exception as e:
+            logger.critical(f'Error to finish the step: {e}', exc_info=True)
+
+        return True
+
+    def run(self):
+        """Check the deadline of the step being waited until the scheduler is stopped."""
+
+        self.running = True
+        while self.running:
+            self.sleep(self.tick)
+
+            with self.lock:
+                kind = self.state
+                expired = kind != StepScheduler.idle and time.monotonic() >= self.deadline
+
+            if expired:
+                self.finish(kind)
+
+    def stop(self):
+        self.running = False
+
+
+class AsyncStepScheduler(StepScheduler):
+    """Class that finishes the steps of the asyncio server mode, with coroutines as callbacks.
+
+    Everything runs on the event loop, so the state is only changed between the awaits and the lock is never waited."""
+
+    def __init__(self, callbacks: dict, sleep=asyncio.sleep, tick: float = 0.01):
+        super(AsyncStepScheduler, self).__init__(callbacks, sleep, tick)
+
+    async def ready(self, kind: str):
+        with self.lock:
+            if self.state != kind:
+                self.pending.add(kind)
+                return
+
+        await self.finish(kind)
+
+    async def finish(self, kind: str) -> bool:
+        with self.lock:
+            if self.state != kind:
+                return False
+
+            self.state = StepScheduler.idle
+            self.pending.clear()
+
+        try:
+            await self.callbacks[kind]()
+        except Exception as e:
+            logger.critical(f'Error to finish the step: {e}', exc_info=True)
+
+        return True
+
+    async def run(self):
+        self.running = True
+        while self.running:
+            await self.sleep(self.tick)
+
+            with self.lock:
+                kind = self.state
+                expired = kind != StepScheduler.idle and time.monotonic() >= self.deadline
+
+            if expired:
+                await self.finish(kind)
@@ -5,161 +5,132 @@ import os
 import sys
 import time
 import signal
+import threading
 import logging
 import requests
 import multiprocessing
 from flask import request, jsonify
 from flask import Flask
 from flask_cors import CORS
-from werkzeug.serving import run_simple
+from werkzeug.serving import run_simple, WSGIRequestHandler
 from simulation_engine.json_formatter import JsonFormatter
 from communication.helpers.logger import Logger
+from communication.helpers.ipc import IpcServer, socket_path
 
 logging.basicConfig(format="[SIMULATOR] [%(levelname)s] %(message)s",level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-config_path, base_url, simulation_port, api_port, log, load_sim, write_sim, secret = sys.argv[1:]
+config_path, base_url, simulation_port, api_port, log, load_sim, write_sim, secret, ipc = sys.argv[1:]
 load_sim_bool = load_sim.lower() == 'true'
 write_sim_bool = write_sim.lower() == 'true'
 
 app = Flask(__name__)
 formatter = JsonFormatter(config_path, load_sim_bool, write_sim_bool)
 
+# Handlers of the endpoints by name, answered either over HTTP or over the Unix socket chosen with the -ipc argument
+handlers = {}
 
-@app.route('/start', methods=['POST'])
-def start():
-    """Start the engine."""
+# The connections of the API are kept alive, each on its own thread, so the engine is only used by one at a time
+engine_lock = threading.Lock()
 
-    message = request.get_json(force=True)
 
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """Handler that keeps the connections alive and sends the headers and the body of each response without waiting
+    for the acknowledgement of the headers."""
 
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
 
-    return jsonify(formatter.start())
 
+def endpoint(rule, method):
+    """Register the handler on the HTTP route and on the Unix socket.
 
-@app.route('/register_agent', methods=['POST'])
-def register_agent():
-    """Register an agent in the engine."""
+    The handler receives the message and returns the response, only after the secret is checked.
 
-    message = request.get_json(force=True)
+    :param rule: The HTTP route, its name is the name of the endpoint on the Unix socket.
+    :param method: The HTTP method."""
 
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
+    def register(handler):
+        def checked(message):
+            if 'secret' not in message or secret != message['secret']:
+                return dict(message='This endpoint can not be accessed.')
 
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
+            with engine_lock:
+                return handler(message)
 
-    return jsonify(formatter.connect_agent(message['token']))
+        def route():
+            return jsonify(checked(request.get_json(force=True)))
 
+        handlers[rule.strip('/')] = checked
+        app.add_url_rule(rule, handler.__name__, route, methods=[method])
 
-@app.route('/register_asset', methods=['POST'])
-def register_asset():
-    """Register a social asset in the engine."""
+        return checked
 
-    message = request.get_json(force=True)
+    return register
 
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
 
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
+@endpoint('/start', 'POST')
+def start(message):
+    """Start the engine."""
 
-    return jsonify(formatter.connect_social_asset(message['main_token'], message['token']))
+    return formatter.start()
 
 
-@app.route('/finish_social_asset_connections', methods=['POST'])
-def finish_social_asset_connections():
-    """Register a social asset in the engine."""
+@endpoint('/register_agent', 'POST')
+def register_agent(message):
+    """Register an agent in the engine."""
 
-    message = request.get_json(force=True)
+    return formatter.connect_agent(message['token'])
 
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
 
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
+@endpoint('/register_asset', 'POST')
+def register_asset(message):
+    """Register a social asset in the engine."""
 
-    return jsonify(formatter.finish_social_asset_connections(message['tokens']))
+    return formatter.connect_social_asset(message['main_token'], message['token'])
 
 
-@app.route('/delete_agent', methods=['PUT'])
-def delete_agent():
-    """Delete a registered agent from the engine."""
+@endpoint('/finish_social_asset_connections', 'POST')
+def finish_social_asset_connections(message):
+    """Register a social asset in the engine."""
 
-    message = request.get_json(force=True)
+    return formatter.finish_social_asset_connections(message['tokens'])
 
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
 
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
+@endpoint('/delete_agent', 'PUT')
+def delete_agent(message):
+    """Delete a registered agent from the engine."""
 
-    return jsonify(formatter.disconnect_agent(message['token']))
+    return formatter.disconnect_agent(message['token'])
 
 
-@app.route('/delete_asset', methods=['PUT'])
-def delete_asset():
+@endpoint('/delete_asset', 'PUT')
+def delete_asset(message):
     """Delete a registered social asset from the engine."""
 
-    message = request.get_json(force=True)
-
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
-
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
-
-    return jsonify(formatter.disconnect_social_asset(message['token']))
+    return formatter.disconnect_social_asset(message['token'])
 
 
-@app.route('/do_actions', methods=['POST'])
-def do_actions():
+@endpoint('/do_actions', 'POST')
+def do_actions(message):
     """Process all the actions from the agents and social assets."""
 
-    message = request.get_json(force=True)
+    return formatter.do_step(message['actions'])
 
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
 
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
-
-    return jsonify(formatter.do_step(message['actions']))
-
-
-@app.route('/calculate_route', methods=['GET'])
-def calculate_route():
+@endpoint('/calculate_route', 'GET')
+def calculate_route(message):
     """Calculate a route using the current map in the simulation."""
 
-    message = request.get_json(force=True)
-
-    if 'secret' not in message:
-        return jsonify(status=0, message='This endpoint can not be accessed.')
+    return formatter.calculate_route(message['parameters'])
 
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
 
-    return jsonify(formatter.calculate_route(message['parameters']))
-
-
-@app.route('/restart', methods=['PUT'])
-def restart():
+@endpoint('/restart', 'PUT')
+def restart(message):
     """Restart the engine and save the log from the previous one."""
 
     global formatter
 
-    message = request.get_json(force=True)
-
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
-
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
-
     can_restart = formatter.log()
 
     if can_restart['status'] == 1:
@@ -167,21 +138,14 @@ def restart():
     else:
         response = formatter.match_report()
 
-    return jsonify(response)
-
+    return response
 
-@app.route('/terminate', methods=['GET'])
-def finish():
-    """Terminate the process the runs the engine."""
 
-    global app
-    message = request.get_json(force=True)
+@endpoint('/terminate', 'GET')
+def finish(message):
+    """Terminate the process the runs the engine.
 
-    if 'secret' not in message:
-        return jsonify(message='This endpoint can not be accessed.')
-
-    if secret != message['secret']:
-        return jsonify(message='This endpoint can not be accessed.')
+    Note: The HTTP server is only shut down by the call made from this process, always over HTTP."""
 
     if 'api' in message and message['api']:
         if log.lower() == 'true':
@@ -191,7 +155,7 @@ def finish():
     elif 'api' in message and not message['api']:
         request.environ.get('werkzeug.server.shutdown')()
 
-    return jsonify(formatter.simulation_report())
+    return formatter.simulation_report()
 
 
 def auto_destruction():
@@ -215,10 +179,17 @@ if __name__ == '__main__':
     app.config['JSON_SORT_KEYS'] = False
 
     CORS(app)
+
+    if ipc == 'unix':
+        ipc_server = IpcServer(socket_path(simulation_port), handlers)
+        threading.Thread(target=ipc_server.serve_forever, daemon=True).start()
+        logger.info(f'Simulation: Serving on {ipc_server.server_address}')
+
     try:
         if requests.post(f'http://{base_url}:{api_port}/start_connections', json={'secret': secret, 'back': 0}):
             logger.info(f'Simulation: Serving on http://{base_url}:{simulation_port}')
-            run_simple(application=app, hostname=base_url, port=int(simulation_port), use_reloader=False, use_debugger=False)
+            run_simple(application=app, hostname=base_url, port=int(simulation_port), use_reloader=False, use_debugger=False,
+                       threaded=True, request_handler=KeepAliveRequestHandler)
         else:
             logger.critical('Errors occurred during startup.')
     except requests.exceptions.ConnectionError:
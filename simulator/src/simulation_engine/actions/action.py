@@ -1,5 +1,6 @@
 import logging
 from abc import ABC, ABCMeta, abstractmethod, abstractproperty
+from ..simulation_helpers.capabilities import check_demands
 from ..exceptions.exceptions import MASiReException, NoActionsAllowed, NotActive, FailedWrongParam, FailedParameterType, FailedNoMatch
 
 logger = logging.getLogger(__name__)
@@ -12,13 +13,17 @@ class Mediator(ABC):
 
 class Action():
     __metaclass__=ABCMeta
-    
+
+    # Dispatch table shared by every action, keyed by (lowercased name, amount of parameters).
+    actions_table = {}
+
     def __init__(self, agent, game_state, parameters: list, type: str, qtd_args: list):
         logger.debug(f"action {type} created")
         self.agent = agent
-        exec(f'self.agent.last_action = type')
+        self.agent.last_action = type
         self.skills = game_state.actions[type]['abilities']
         self.resources = game_state.actions[type]['resources']
+        self.skills_masks, self.resources_masks = game_state.actions_masks[type]
         self.parameters = parameters
         self.type = type
         self.qtd_args = qtd_args 
@@ -28,6 +33,26 @@ class Action():
 
         self.validate_parameters()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Action.register(cls)
+
+    @staticmethod
+    def register(action_class):
+        """Add the action class to the dispatch table, one entry for each amount of parameters it accepts.
+
+        Every subclass of Action that declares its own action attribute is registered when it is defined, plugins
+        included. A class registered later with the same name and amount of parameters replaces the previous one.
+
+        :param action_class: Class with the attribute action as a tuple (name, list of amounts of parameters)."""
+
+        if not isinstance(action_class.__dict__.get('action'), tuple):
+            return
+
+        name, qtd_args = action_class.action
+        for qtd in qtd_args:
+            Action.actions_table[(name.lower(), qtd)] = action_class
+
     @abstractproperty
     def action(self):
         raise NotImplementedError
@@ -75,23 +100,17 @@ class Action():
         except Exception as e:            
             self._report_exception(e)
 
-    def validate_constraints(self, map):        
-        def check_demand(action_demands, agent_has):
-            for demand in action_demands:
-                it_is = all(s in agent_has for s in demand)
-                if it_is: return it_is
-            return False
-        
+    def validate_constraints(self, map):
         if self.agent.carried and not self.any_time_action:
             raise NoActionsAllowed('Agent being carried.')
 
         # if not self.agent.is_active and not self.agent.last_action == 'deliverRequest':
         #     raise NotActive('Agent is not active.')
 
-        has_skills = check_demand(self.skills, self.agent.abilities)
+        has_skills = check_demands(self.skills_masks, self.agent.abilities_mask)
         if not has_skills: raise FailedParameterType(f'The following skills are required: {self.skills}')
         
-        has_resources = check_demand(self.resources, self.agent.resources)
+        has_resources = check_demands(self.resources_masks, self.agent.resources_mask)
         if not has_resources: raise FailedParameterType(f'The following resources are required: {self.resources}')
 
         self.check_constraints(map)
@@ -130,13 +149,16 @@ class Action():
 
     @staticmethod
     def create_action(agent, action, game_state, parameters):
-        for subclass in Action.__subclasses__():
-            if action.lower() in subclass.action[0].lower() and len(parameters) in subclass.action[1]: 
-                return subclass(agent,game_state,parameters)
+        try:
+            action_class = Action.actions_table.get((action.lower(), len(parameters)))
+        except (AttributeError, TypeError):
+            action_class = None
+
+        if action_class is not None:
+            return action_class(agent, game_state, parameters)
+
         logger.error(f"{agent.token}'s action {action} was not found")
         return NoAction(agent, action)
-            # if action.lower() in subclass.__name__.lower(): 
-            #     return subclass(agent,game_state,parameters)
 
 class NoAction():
     def __init__(self, agent, action):
@@ -172,7 +194,7 @@ class SyncActions(Mediator):
             for act in self._actions: act.execute(map, nodes, events, tasks)
 
             for act in self._actions:
-                exec(f'act.agent.last_action_result = "success"')
+                act.agent.last_action_result = 'success'
         except MASiReException as e:
             logger.debug(e)
             for act in self._actions: 
@@ -1,6 +1,3 @@
-import types
-from symbol import parameters
-
 from ..exceptions.exceptions import (FailedCapacity, FailedItemAmount, FailedLocation, FailedNoMatch, FailedWrongParam)
 from .action import Action
 
@@ -39,7 +36,7 @@ class DeliverPhysical(Action):
             self.mediator.notify(self, "removed_items", removed_items)
         else:
             if map.check_location(self.agent.location, self.cdm_location):
-                if len(parameters) == 2:
+                if len(self.parameters) == 2:
                     delivered_items = self.agents_manager.remove_physical_item(self.parameters[0], 1) 
                 else:
                     delivered_items = self.agents_manager.remove_physical_item(self.parameters[0], self.parameters[1]) 
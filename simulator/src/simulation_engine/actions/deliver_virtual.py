@@ -1,6 +1,4 @@
-import types
 import logging
-from symbol import parameters
 
 from ..exceptions.exceptions import (FailedCapacity, FailedItemAmount,
                                      FailedNoMatch, FailedWrongParam)
@@ -62,8 +62,8 @@ class AnalyzePhoto(Action):
         for photo in self.agent.virtual_storage_vector:
             for victim in photo.victims:
                 victim.active = True
-                for step in self.game_state.steps[:self.game_state.current_step]:
-                    if step['flood'] != None and step['flood'].id == victim.flood_id:
+                for step in self.game_state.steps.until(self.game_state.current_step):
+                    if step['flood'].id == victim.flood_id:
                         step['victims'].append(victim)
                         report.victims.discovered = 1
                         break
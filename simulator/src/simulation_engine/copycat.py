@@ -4,7 +4,11 @@ from simulation_engine.simulation import Simulation
 
 
 class CopyCat:
-    """Class that copy all the objects and responses from inside the engine to prevent from being changed."""
+    """Class that hands the responses of the engine to the formatter.
+
+    The responses hold the live objects of the engine, they are not copied since the formatter only reads them and
+    converts them to JSON before the engine runs again. Only the logs, kept until the end of the simulation while the
+    objects keep changing, are stored as snapshots."""
 
     def __init__(self, config, load_sim, write_sim):
         self.config = config
@@ -14,13 +18,14 @@ class CopyCat:
         self.simulation = Simulation(config, load_sim, write_sim)
 
     def log(self):
-        """Save the log from the simulation and remove the first map from the maps list on the configuration file.
+        """Save a snapshot of the log from the simulation and remove the first map from the maps list on the
+        configuration file.
 
         The first map is removed from the list so when the simulation restart it will use the new map.
 
         :return int: 1 if can be restarted else 0."""
 
-        self.logs[self.config['map']['maps'][0]['osm']] = self.simulation.log()
+        self.logs[self.config['map']['maps'][0]['osm']] = copy.deepcopy(self.simulation.log())
         self.config['map']['maps'].pop(0)
 
         # TODO: fix this
@@ -33,16 +38,16 @@ class CopyCat:
         return 1
 
     def restart(self):
-        """Restart the simulation, returns the copy of the response and the report of the agents.
+        """Restart the simulation, returns the response and the report of the agents.
 
         :return tuple, dict: First position holding the agents, second position the social assets, the third holding
         the current step and a dictionary with the report of the agents."""
 
         response = self.simulation.restart(self.config, self.load_sim, self.write_sim)
-        return copy.deepcopy(response)
+        return response
 
     def connect_agent(self, token):
-        """Connect the agent and returns the copy of the response.
+        """Connect the agent and returns the response.
 
         :param token: The identifier of the agent.
         :return bool: True if the agent was connected else False."""
@@ -50,10 +55,10 @@ class CopyCat:
         response = {'agent_percepts': self.simulation.connect_agent(token),
                     'map_percepts': self.simulation.get_map_percepts()}
 
-        return copy.deepcopy(response)
+        return response
 
     def connect_social_asset(self, main_token, token):
-        """Connect the social asset and returns the copy of the response.
+        """Connect the social asset and returns the response.
 
         :param token: The identifier of the social asset.
         :return bool: True if the social asset was connected else False."""
@@ -61,49 +66,57 @@ class CopyCat:
         response = {'agent_percepts': self.simulation.connect_social_asset(main_token, token),
                     'map_percepts': self.simulation.get_map_percepts()}
 
-        return copy.deepcopy(response)
+        return response
 
     def finish_social_asset_connections(self, tokens):
         response = self.simulation.finish_social_assets_connections(tokens)
 
-        return copy.deepcopy(response)
+        return response
 
     def disconnect_agent(self, token):
-        """Disconnect the agent and returns the copy of the response.
+        """Disconnect the agent and returns the response.
 
         :param token: The identifier of the agent.
         :return bool: True if the agent was connected else False."""
 
         response = self.simulation.disconnect_agent(token)
-        return copy.deepcopy(response)
+        return response
 
     def disconnect_social_asset(self, token):
-        """Disconnect the social asset and returns the copy of the response.
+        """Disconnect the social asset and returns the response.
 
         :param token: The identifier of the social asset.
         :return bool: True if the social asset was connected else False."""
 
         response = self.simulation.disconnect_social_asset(token)
-        return copy.deepcopy(response)
+        return response
 
     def start(self):
-        """Start the simulation and return the copy of the response.
+        """Start the simulation and return the response.
 
         :return tuple: First position holding the agents, second position the social assets and the third holding
         the current step."""
 
         response = self.simulation.start()
-        return copy.deepcopy(response)
+        return response
 
     def do_step(self, token_action_list):
-        """Do one step and return the copy of the response
+        """Do one step and return the response
 
         :param token_action_list: The actions sent by each agent or social asset.
         :return tuple|None: If not terminated the first position holds the results from the actions sent and the second,
         the current step, else None."""
 
         response = self.simulation.do_step(token_action_list)
-        return copy.deepcopy(response)
+        return response
+
+    def perceive(self, events):
+        """Select the events perceived by the agents of the roles with a perception radius.
+
+        :param events: The events of the step returned by start, restart or do_step.
+        :return dict: Dictionary with the token of the agent as key and the events it perceives."""
+
+        return self.simulation.perceive(events)
 
     def get_logs(self):
         """Return a copy of all the logs along with the folder structure based on date.
@@ -1,5 +1,7 @@
 import random
+from functools import partial
 import simulation_engine.simulation_helpers.events_formatter as formatter
+from simulation_engine.simulation_helpers.steps import Steps, LazySteps
 
 from ..simulation_objects.flood import Flood
 from ..simulation_objects.photo import Photo
@@ -25,23 +27,55 @@ class Generator(GeneratorBase):
         self.water_sample_id: int = 0
         self.social_asset_id = 0
         self.measure_unit = 100000
-        random.seed(config['map']['randomSeed'])
+        self.seed = config['map']['randomSeed']
+        self.lookahead = self.generate_variables.get('lookahead')
+        self.seed_by_step = self.lookahead is not None or self.generate_variables.get('seedByStep', False)
+        self.random = random.Random() if self.seed_by_step else random
+        random.seed(self.seed)
 
-    def generate_events(self, map) -> list:
+    def generate_events(self, map) -> Steps:
         """Generate all the events based on probabilities.
 
         If the probability of a flood to occur is bigger than the drawn number, an event is created. Except the first
         step which will always have a flood.
 
-        :return list: All the steps containing either a dictionary with the event or a dictionary with a None flood."""
+        When a lookahead is given on the configuration file the steps are only generated when they are about to be
+        reached, see generate_step.
 
-        events = [0] * self.steps
+        :return Steps: The steps holding a dictionary with the event, only the steps with a flood are stored."""
 
-        flood, propagation = self.generate_event(0)
+        if self.lookahead is not None:
+            return LazySteps(self.steps, partial(self.generate_step, map), self.lookahead)
+
+        events = Steps(self.steps)
+
+        for i in range(self.steps):
+            event = self.generate_step(map, i)
+            if event is not None:
+                events[i] = event
+
+        return events
+
+    def generate_step(self, map, step) -> dict:
+        """Generate the events of one step.
+
+        The steps must be generated in order, since the identifiers of the events continue from the previous step. With
+        seedByStep, or a lookahead, each step draws from its own generator seeded with the random seed and the step
+        number, so the result is the same whenever the step is generated.
+
+        :return dict|None: Dictionary with the event or None if there is no flood on the step."""
+
+        if self.seed_by_step:
+            self.random.seed(f'{self.seed}-{step}')
+
+        if step and self.random.randint(1, 100) > self.generate_variables['flood']['probability']:
+            return None
+
+        flood, propagation = self.generate_event(step)
         flood.affect_map(map, self)
         nodes: list = flood.nodes
         event: dict = {
-            'step': 0, 
+            'step': step,
             'flood': flood,
             'victims': self.generate_victims(nodes),
             'water_samples': self.generate_water_samples(nodes),
@@ -49,26 +83,6 @@ class Generator(GeneratorBase):
             'propagation': propagation
         }
 
-        events[0] = event
-
-        flood_probability: int = self.generate_variables['flood']['probability']
-        i: int = 1
-        while i < self.steps:
-            event: dict = {'step': -1, 'flood': None, 'victims': [], 'water_samples': [], 'photos': [], 'propagation': []}
-
-            if random.randint(1, 100) <= flood_probability:
-                event['step'] = i
-                event['flood'], propagation = self.generate_event(i)
-                event['flood'].affect_map(map, self)
-                nodes: list = event['flood'].nodes
-                event['victims']: list = self.generate_victims(nodes)
-                event['water_samples']: list = self.generate_water_samples(nodes)
-                event['photos']: list = self.generate_photos(nodes)
-                event['propagation']: list = propagation
-
-            events[i] = event
-            i += 1
-
         from simulation_engine.simulation_helpers.report import Report 
         report = Report()
         report.total_events = self.flood_id
@@ -76,7 +90,7 @@ class Generator(GeneratorBase):
         report.total_photos = self.photo_id
         report.total_samples = self.water_sample_id
 
-        return events
+        return event
 
     def generate_event(self, step) -> Event:
         """Generate one flood.
@@ -86,12 +100,12 @@ class Generator(GeneratorBase):
         :return Flood: Flood event with dimensions gotten from the configuration file."""
 
         dimensions: dict = {'shape': 'circle', 'radius': (
-            random.uniform(self.generate_variables['flood']['circle']['minRadius'],
+            self.random.uniform(self.generate_variables['flood']['circle']['minRadius'],
                            self.generate_variables['flood']['circle']['maxRadius']) / self.measure_unit
         )}
 
-        flood_lat: float = random.uniform(self.area['minLat'], self.area['maxLat'])
-        flood_lon: float = random.uniform(self.area['minLon'], self.area['maxLon'])
+        flood_lat: float = self.random.uniform(self.area['minLat'], self.area['maxLat'])
+        flood_lon: float = self.random.uniform(self.area['minLon'], self.area['maxLon'])
 
         dimensions['location']: tuple = self.map.align_coords(flood_lat, flood_lon)
 
@@ -105,7 +119,7 @@ class Generator(GeneratorBase):
                 list_of_nodes: list = self.map.nodes_in_radius(dimensions['location'], dimensions['length'])
 
         if self.generate_variables['flood']['minPeriod']:
-            period: int = int((random.randint(self.generate_variables['flood']['minPeriod'],
+            period: int = int((self.random.randint(self.generate_variables['flood']['minPeriod'],
                                               self.generate_variables['flood']['maxPeriod']) / self.generate_variables[
                                    'step_unit']))
 
@@ -138,7 +152,7 @@ class Generator(GeneratorBase):
                                                      dimensions['radius'] + d_prop['perStep'] * prop)
                 difference = self.get_difference(old_nodes, new_nodes)
 
-                if random.randint(0, 100) < victim_probability:
+                if self.random.randint(0, 100) < victim_probability:
                     if difference:
                         propagation.append(self.generate_victims_in_propagation(difference))
                     else:
@@ -163,15 +177,15 @@ class Generator(GeneratorBase):
         photo_min_size: int = self.generate_variables['photo']['minSize']
         photo_max_size: int = self.generate_variables['photo']['maxSize']
 
-        amount: int = random.randint(self.generate_variables['photo']['minAmount'],
+        amount: int = self.random.randint(self.generate_variables['photo']['minAmount'],
                                      self.generate_variables['photo']['maxAmount'])
         photos: list = [0] * amount
         i: int = 0
         while i < amount:
-            photo_location: tuple = self.map.get_node_coord(random.choice(nodes))
-            photo_size: int = random.randint(photo_min_size, photo_max_size)
+            photo_location: tuple = self.map.get_node_coord(self.random.choice(nodes))
+            photo_size: int = self.random.randint(photo_min_size, photo_max_size)
             photo_victims: list = []
-            if random.randint(0, 100) <= victim_probability:
+            if self.random.randint(0, 100) <= victim_probability:
                 photo_victims = self.generate_photo_victims(photo_location)
 
             photos[i] = Photo(self.flood_id, self.photo_id, photo_size, photo_location, photo_victims)
@@ -191,16 +205,16 @@ class Generator(GeneratorBase):
         victim_min_lifetime: int = self.generate_variables['victim']['minLifetime']
         victim_max_lifetime: int = self.generate_variables['victim']['maxLifetime']
 
-        amount: int = random.randint(self.generate_variables['victim']['minAmount'],
+        amount: int = self.random.randint(self.generate_variables['victim']['minAmount'],
                                      self.generate_variables['victim']['maxAmount'])
         victims: list = [0] * amount
         i: int = 0
         while i < amount:
-            victim_size: int = random.randint(victim_min_size, victim_max_size)
-            victim_lifetime: int = int(random.randint(victim_min_lifetime, victim_max_lifetime)
+            victim_size: int = self.random.randint(victim_min_size, victim_max_size)
+            victim_lifetime: int = int(self.random.randint(victim_min_lifetime, victim_max_lifetime)
                                        / self.generate_variables['step_unit'])
 
-            victim_location: tuple = self.map.get_node_coord(random.choice(nodes))
+            victim_location: tuple = self.map.get_node_coord(self.random.choice(nodes))
 
             victims[i] = Victim(self.flood_id, self.victim_id, victim_size, victim_lifetime, victim_location, False)
             self.victim_id = self.victim_id + 1
@@ -215,16 +229,16 @@ class Generator(GeneratorBase):
         victim_min_lifetime: int = self.generate_variables['victim']['minLifetime']
         victim_max_lifetime: int = self.generate_variables['victim']['maxLifetime']
 
-        amount: int = random.randint(self.generate_variables['flood']['propagationInfo']['minVictimsPerPropagation'],
+        amount: int = self.random.randint(self.generate_variables['flood']['propagationInfo']['minVictimsPerPropagation'],
                                      self.generate_variables['flood']['propagationInfo']['maxVictimsPerPropagation'])
         victims: list = [0] * amount
         i: int = 0
         while i < amount:
-            victim_size: int = random.randint(victim_min_size, victim_max_size)
-            victim_lifetime: int = int(random.randint(victim_min_lifetime, victim_max_lifetime)
+            victim_size: int = self.random.randint(victim_min_size, victim_max_size)
+            victim_lifetime: int = int(self.random.randint(victim_min_lifetime, victim_max_lifetime)
                                        / self.generate_variables['step_unit'])
 
-            victim_location: tuple = self.map.get_node_coord(random.choice(nodes))
+            victim_location: tuple = self.map.get_node_coord(self.random.choice(nodes))
 
             victims[i] = Victim(self.flood_id, self.victim_id, victim_size, victim_lifetime, victim_location, False)
             self.victim_id = self.victim_id + 1
@@ -245,13 +259,13 @@ class Generator(GeneratorBase):
         victim_min_lifetime: int = self.generate_variables['victim']['minLifetime']
         victim_max_lifetime: int = self.generate_variables['victim']['maxLifetime']
 
-        amount: int = random.randint(self.generate_variables['victim']['minAmount'],
+        amount: int = self.random.randint(self.generate_variables['victim']['minAmount'],
                                      self.generate_variables['victim']['maxAmount'])
         victims: list = [0] * amount
         i: int = 0
         while i < amount:
-            victim_size: int = random.randint(victim_min_size, victim_max_size)
-            victim_lifetime: int = int(random.randint(victim_min_lifetime, victim_max_lifetime)
+            victim_size: int = self.random.randint(victim_min_size, victim_max_size)
+            victim_lifetime: int = int(self.random.randint(victim_min_lifetime, victim_max_lifetime)
                                        / self.generate_variables['step_unit'])
 
             victims[i] = Victim(self.flood_id, self.victim_id, victim_size, victim_lifetime, location, True)
@@ -268,13 +282,13 @@ class Generator(GeneratorBase):
         water_sample_min_size: int = self.generate_variables['waterSample']['minSize']
         water_sample_max_size: int = self.generate_variables['waterSample']['maxSize']
 
-        amount: int = random.randint(self.generate_variables['waterSample']['minAmount'],
+        amount: int = self.random.randint(self.generate_variables['waterSample']['minAmount'],
                                      self.generate_variables['waterSample']['maxAmount'])
         water_samples: list = [0] * amount
         i: int = 0
         while i < amount:
-            water_sample_location: tuple = self.map.get_node_coord(random.choice(nodes))
-            water_sample_size: int = random.randint(water_sample_min_size, water_sample_max_size)
+            water_sample_location: tuple = self.map.get_node_coord(self.random.choice(nodes))
+            water_sample_size: int = self.random.randint(water_sample_min_size, water_sample_max_size)
             water_samples[i] = WaterSample(self.flood_id, self.water_sample_id, water_sample_size,
                                            water_sample_location)
             self.water_sample_id = self.water_sample_id + 1
@@ -283,15 +297,18 @@ class Generator(GeneratorBase):
         return water_samples
 
     def generate_social_assets(self):
+        if self.seed_by_step:
+            self.random.seed(f'{self.seed}-social_assets')
+
         amount: int = self.generate_variables['socialAsset']['amount']
 
         social_assets: list = [0] * amount
 
         i: int = 0
         while i < amount:
-            location: list = [random.uniform(self.area['minLat'], self.area['maxLat']),
-                              random.uniform(self.area['minLon'], self.area['maxLon'])]
-            profession: str = random.choice(self.generate_variables['socialAsset']['professions'])
+            location: list = [self.random.uniform(self.area['minLat'], self.area['maxLat']),
+                              self.random.uniform(self.area['minLon'], self.area['maxLon'])]
+            profession: str = self.random.choice(self.generate_variables['socialAsset']['professions'])
             abilities = self.generate_assets_variables[profession]['abilities']
             resources = self.generate_assets_variables[profession]['resources']
 
@@ -1,8 +1,12 @@
 import json
 import copy
 import logging
+from functools import partial
 
+from . import scenario_format
 from .genarator_base import GeneratorBase
+from .scenario_format import ScenarioReader, ScenarioWriter
+from ..simulation_helpers.steps import Steps, LazySteps
 from ..simulation_objects.photo import Photo
 from ..simulation_objects.victim import Victim
 from ..simulation_objects.water_sample import WaterSample
@@ -12,48 +16,110 @@ from ..simulation_objects.social_asset_marker import SocialAssetMarker
 logger = logging.getLogger(__name__)
 
 class Loader(GeneratorBase):
-    def __init__(self, config, map, path_to_events):
-        events_file = json.load(open(path_to_events, 'r'))
-        self.number_steps = events_file['map']['steps']
-        self.events = events_file['matchs'][0]['steps']
-        self.social_assets = events_file['matchs'][0]['social_assets']
+    def __init__(self, config, map, path_to_events, match=0):
+        self.reader = None
+
+        if scenario_format.is_scenario_file(path_to_events):
+            self.reader = ScenarioReader(path_to_events)
+            self.number_steps = self.reader.header['map']['steps']
+            self.match = Loader.check_match(path_to_events, match, len(self.reader.matches))
+            self.events = None
+            self.social_assets = self.reader.read_social_assets(self.match)
+        else:
+            with open(path_to_events, 'r') as file:
+                events_file = json.load(file)
+
+            self.number_steps = events_file['map']['steps']
+            self.match = Loader.check_match(path_to_events, match, len(events_file['matchs']))
+            self.events = events_file['matchs'][self.match]['steps']
+            self.social_assets = events_file['matchs'][self.match]['social_assets']
 
-    def generate_events(self, map) -> list:
-        # from simulation_engine.simulation_helpers.report import total_events, total_victims, total_photos, total_samples 
-        from simulation_engine.simulation_helpers.report import Report 
-        report = Report()
-        template = dict(step=-1, flood=None, victims=[], photos=[], water_samples=[],propagation=[])
-        events: list = [template.copy() for i in range(self.number_steps)]
+    @staticmethod
+    def check_match(path_to_events, match, amount) -> int:
+        """Return the match to load from the events file, the first one if the file does not record the match asked.
+
+        Each map may have its own events file, recording fewer matches than the ones already run.
+
+        :param path_to_events: Path to the events file.
+        :param match: The index of the match asked.
+        :param amount: The amount of matches recorded on the file.
+        :return int: The index of the match loaded.
+        :raises ScenarioFormatError: If the file does not record any match."""
+
+        if not amount:
+            raise scenario_format.ScenarioFormatError(f'{path_to_events} does not record any match.')
+
+        if match >= amount:
+            logger.warning(f'{path_to_events} records {amount} matches, the first one is loaded for the match {match}.')
+            return 0
+
+        return match
+
+    def generate_events(self, map) -> Steps:
+        if self.reader is not None:
+            return LazySteps(self.number_steps, partial(self.load_step, map), 0)
+
+        events = Steps(self.number_steps)
 
         for e in iter(self.events):  
             if e is None: 
                 continue          
-            e_obj = Event(**e['flood'])
-            report.total_events += 1
-            report.victims.known = len(e['victims'])
-            report.photos.request = len(e['photos'])
-            report.samples.request = len(e['water_samples'])
-            e_obj.affect_map(map, self)
-
-            sim_step = events[e_obj.step]
-            sim_step['step'] = e['step']
-            sim_step['flood'] = e_obj
-            sim_step['victims'] = [Victim(**victim, photo=False) for victim in e['victims']]            
-            sim_step['propagation'] = [[Victim(**victim, photo=False) for victim in s] for s in e['propagation']]
-            for p in sim_step['propagation']:
-                report.victims.known = len(p)
-
-            photos = []
-            for photo in e['photos']:
-                victims_in_photo = [Victim(**victim, photo=True) for victim in photo['victims']]
-                report.victims.hidden = len(photo['victims'])
-
-                photos.append(Photo(photo['flood_id'], photo['identifier'], photo['size'], photo['location'], victims_in_photo))
-                sim_step['photos'] = photos
-
-            sim_step['water_samples'] = [WaterSample(**sample) for sample in e['water_samples']]
+            sim_step = self.create_step(e, map)
+            events[sim_step['flood'].step] = sim_step
+
         return events
 
+    def load_step(self, map, step):
+        """Decode the step from the scenario file, only when the cycle reaches it.
+
+        :param map: The map of the simulation.
+        :param step: The number of the step.
+        :return dict|None: The step or None if the step has no flood."""
+
+        e = self.reader.read_step(self.match, step)
+        if step == self.number_steps - 1:
+            self.close()
+
+        if e is None:
+            return None
+
+        return self.create_step(e, map)
+
+    def close(self):
+        """Close the scenario file, once every step of the match was read or the match is replaced."""
+
+        if self.reader is not None:
+            self.reader.close()
+
+    def create_step(self, e, map) -> dict:
+        # from simulation_engine.simulation_helpers.report import total_events, total_victims, total_photos, total_samples 
+        from simulation_engine.simulation_helpers.report import Report 
+        report = Report()
+
+        e_obj = Event(**e['flood'])
+        report.total_events += 1
+        report.victims.known = len(e['victims'])
+        report.photos.request = len(e['photos'])
+        report.samples.request = len(e['water_samples'])
+        e_obj.affect_map(map, self)
+
+        sim_step = dict(step=e['step'], flood=e_obj, photos=[])
+        sim_step['victims'] = [Victim(**victim, photo=False) for victim in e['victims']]            
+        sim_step['propagation'] = [[Victim(**victim, photo=False) for victim in s] for s in e['propagation']]
+        for p in sim_step['propagation']:
+            report.victims.known = len(p)
+
+        photos = []
+        for photo in e['photos']:
+            victims_in_photo = [Victim(**victim, photo=True) for victim in photo['victims']]
+            report.victims.hidden = len(photo['victims'])
+
+            photos.append(Photo(photo['flood_id'], photo['identifier'], photo['size'], photo['location'], victims_in_photo))
+            sim_step['photos'] = photos
+
+        sim_step['water_samples'] = [WaterSample(**sample) for sample in e['water_samples']]
+        return sim_step
+
     def generate_social_assets(self) -> list:
         social_assets: list = [0] * len(self.social_assets)
 
@@ -64,13 +130,27 @@ class Loader(GeneratorBase):
         return social_assets
 
     @staticmethod
-    def write_first_match(config, steps, social_assets, generator, file_name):
+    def write_first_match(config, steps, social_assets, generator, file_name, binary=False):
+        """Write the first match to a new events file.
+
+        :param config: The configuration file.
+        :param steps: The steps of the match.
+        :param social_assets: The social assets markers of the match.
+        :param generator: The generator of the match.
+        :param file_name: Path to the events file.
+        :param binary: True to write the indexed scenario container, False to write the indented JSON events file."""
+
         config_copy = copy.deepcopy(config)
         del config_copy['generate']
         del config_copy['socialAssets']
         del config_copy['agents']
         del config_copy['actions']
 
+        if binary:
+            with ScenarioWriter(file_name, config_copy) as writer:
+                writer.add_match(map(Loader.get_json_event, steps), generator.get_json_social_assets(social_assets))
+            return
+
         match = dict(steps=Loader.get_json_events(steps),
                      social_assets=generator.get_json_social_assets(social_assets))
 
@@ -79,39 +159,62 @@ class Loader(GeneratorBase):
         with open(file_name, 'w+') as file:
             file.write(json.dumps(config_copy, sort_keys=False, indent=4, default=lambda o: o.dict()))
 
-    def write_match(self, generator, file_name):
+    @staticmethod
+    def write_match(steps, social_assets, generator, file_name):
+        """Add the match to the events file written by write_first_match.
+
+        The match is appended to a scenario container without reading nor rewriting the matches already recorded, a
+        JSON events file is read and written again with the new match.
+
+        :param steps: The steps of the match.
+        :param social_assets: The social assets markers of the match.
+        :param generator: The generator of the match.
+        :param file_name: Path to the events file written by write_first_match."""
+
+        if scenario_format.is_scenario_file(file_name):
+            with ScenarioWriter(file_name) as writer:
+                writer.add_match(map(Loader.get_json_event, steps), generator.get_json_social_assets(social_assets))
+            return
+
         with open(file_name, 'r') as file:
             config = json.loads(file.read())
 
-        match = dict(steps=generator.get_json_events(self.steps),
-                     social_assets=generator.get_json_social_assets(self.social_assets_manager.social_assets_markers))
+        match = dict(steps=Loader.get_json_events(steps),
+                     social_assets=generator.get_json_social_assets(social_assets))
 
         config['matchs'].append(match)
 
         with open(file_name, 'w') as file:
-            file.write(json.dumps(config, sort_keys=False, indent=4, default=lambda o: o.__dict__))
+            file.write(json.dumps(config, sort_keys=False, indent=4, default=lambda o: o.dict()))
 
     @staticmethod
     def get_json_events(events):
         json_events = []
 
         for event in events:
-            events_dict = None
-
-            if event['flood'] is not None:
-                events_dict = dict()
-                events_dict['step'] = event['step']
-                events_dict['flood'] = event['flood'].dict()
-                events_dict['victims'] = [victim.dict() for victim in event['victims']]
-                events_dict['photos'] = [photo.dict() for photo in event['photos']]
-                events_dict['water_samples'] = [sample.dict() for sample in event['water_samples']]
-                if len(event['propagation']) >= 1:
-                    prop = []
-                    for s in range(len(event['propagation'])):
-                        prop.append([victim.dict() for victim in event['propagation'][s]])
-                    events_dict['propagation'] = prop
-                else:
-                    events_dict['propagation'] = []
+            events_dict = Loader.get_json_event(event)
+            if events_dict is not None:
                 json_events.append(events_dict)
 
-        return json_events
\ No newline at end of file
+        return json_events
+
+    @staticmethod
+    def get_json_event(event):
+        events_dict = None
+
+        if event['flood'] is not None:
+            events_dict = dict()
+            events_dict['step'] = event['step']
+            events_dict['flood'] = event['flood'].dict()
+            events_dict['victims'] = [victim.dict() for victim in event['victims']]
+            events_dict['photos'] = [photo.dict() for photo in event['photos']]
+            events_dict['water_samples'] = [sample.dict() for sample in event['water_samples']]
+            if len(event['propagation']) >= 1:
+                prop = []
+                for s in range(len(event['propagation'])):
+                    prop.append([victim.dict() for victim in event['propagation'][s]])
+                events_dict['propagation'] = prop
+            else:
+                events_dict['propagation'] = []
+
+        return events_dict
@@ -0,0 +1,174 @@
+"""Generation backend that draws the victims, photos and water samples in batches from a NumPy random generator.
+
+Seed contract: the scenario only depends on the randomSeed of the map and on the generate section of the configuration
+file, and it is not the same scenario generated by the random backend for the same seed. For each step s:
+
+- The flood of the step (probability, radius, location, period and propagation rings) is drawn from
+  random.Random(f'{randomSeed}-{s}'), the same as the seedByStep mode of the random backend.
+- The items of the step are drawn from numpy.random.Generator(PCG64(SeedSequence(entropy, spawn_key=(s,)))), in the
+  order: victims of each propagation ring, victims, water samples and photos with their victims. The entropy is the
+  randomSeed itself when it is a non negative integer, else the SHA-256 digest of its string, as a big endian integer.
+- The social assets are drawn from random.Random(f'{randomSeed}-social_assets').
+
+Since every step has its own streams, this backend can also be used with a lookahead."""
+
+import random
+import hashlib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .generator import Generator
+from ..simulation_objects.photo import Photo
+from ..simulation_objects.victim import Victim
+from ..simulation_objects.water_sample import WaterSample
+
+
+def available() -> bool:
+    """Check if the backend can be used.
+
+    :return bool: True if NumPy is installed else False."""
+
+    return numpy is not None
+
+
+def seed_entropy(seed) -> int:
+    """Convert the random seed of the configuration file to the entropy of the NumPy seed sequence.
+
+    :param seed: The randomSeed of the map.
+    :return int: The non negative integer used as entropy."""
+
+    if isinstance(seed, int) and not isinstance(seed, bool) and seed >= 0:
+        return seed
+
+    return int.from_bytes(hashlib.sha256(str(seed).encode()).digest(), 'big')
+
+
+class NodeStore:
+    """Class that holds the coordinates of all the nodes of the map in one array."""
+
+    def __init__(self, map):
+        self.indexes: dict = {node: index for index, node in enumerate(map.router.rnodes)}
+        self.coords = numpy.array(list(map.router.rnodes.values()), dtype=numpy.float64).reshape(-1, 2)
+
+    def gather(self, nodes: list, choices) -> list:
+        """Return the coordinates of the chosen nodes.
+
+        :param nodes: List of nodes ids.
+        :param choices: Array with the positions of the chosen nodes on the list.
+        :return list: List with the tuples of latitude and longitude."""
+
+        indexes = numpy.fromiter((self.indexes[node] for node in nodes), dtype=numpy.int64, count=len(nodes))
+
+        return list(map(tuple, self.coords[indexes[choices]].tolist()))
+
+
+class NumpyGenerator(Generator):
+    """Class that generate all the events drawing the items of each step in batches."""
+
+    def __init__(self, config, map):
+        super(NumpyGenerator, self).__init__(config, map)
+        self.seed_by_step = True
+        self.random = random.Random()
+        self.entropy: int = seed_entropy(self.seed)
+        self.rng = None
+        self.node_store = NodeStore(map)
+
+    def generate_step(self, map, step) -> dict:
+        self.rng = numpy.random.Generator(numpy.random.PCG64(numpy.random.SeedSequence(self.entropy,
+                                                                                       spawn_key=(step,))))
+
+        return super(NumpyGenerator, self).generate_step(map, step)
+
+    def draw(self, minimum: int, maximum: int, size=None):
+        """Draw integers between minimum and maximum, both included.
+
+        :return numpy.ndarray|int: The drawn integers."""
+
+        return self.rng.integers(minimum, maximum, endpoint=True, size=size)
+
+    def draw_victims(self, amount: int):
+        """Draw the sizes and lifetimes of a batch of victims.
+
+        :return tuple: List with the sizes and list with the lifetimes."""
+
+        sizes = self.draw(self.generate_variables['victim']['minSize'],
+                          self.generate_variables['victim']['maxSize'], amount)
+        lifetimes = self.draw(self.generate_variables['victim']['minLifetime'],
+                              self.generate_variables['victim']['maxLifetime'], amount)
+        lifetimes = (lifetimes / self.generate_variables['step_unit']).astype(numpy.int64)
+
+        return sizes.tolist(), lifetimes.tolist()
+
+    def create_victims(self, amount: int, locations: list, photo: bool) -> list:
+        sizes, lifetimes = self.draw_victims(amount)
+
+        victims = [Victim(self.flood_id, identifier, size, lifetime, location, photo)
+                   for identifier, size, lifetime, location
+                   in zip(range(self.victim_id, self.victim_id + amount), sizes, lifetimes, locations)]
+        self.victim_id += amount
+
+        return victims
+
+    def generate_victims(self, nodes: list) -> list:
+        amount = int(self.draw(self.generate_variables['victim']['minAmount'],
+                               self.generate_variables['victim']['maxAmount']))
+        locations = self.node_store.gather(nodes, self.rng.integers(len(nodes), size=amount))
+
+        return self.create_victims(amount, locations, False)
+
+    def generate_victims_in_propagation(self, nodes: list) -> list:
+        propagation_info = self.generate_variables['flood']['propagationInfo']
+        amount = int(self.draw(propagation_info['minVictimsPerPropagation'],
+                               propagation_info['maxVictimsPerPropagation']))
+        locations = self.node_store.gather(nodes, self.rng.integers(len(nodes), size=amount))
+
+        return self.create_victims(amount, locations, False)
+
+    def generate_water_samples(self, nodes: list) -> list:
+        amount = int(self.draw(self.generate_variables['waterSample']['minAmount'],
+                               self.generate_variables['waterSample']['maxAmount']))
+        locations = self.node_store.gather(nodes, self.rng.integers(len(nodes), size=amount))
+        sizes = self.draw(self.generate_variables['waterSample']['minSize'],
+                          self.generate_variables['waterSample']['maxSize'], amount).tolist()
+
+        water_samples = [WaterSample(self.flood_id, identifier, size, location)
+                         for identifier, size, location
+                         in zip(range(self.water_sample_id, self.water_sample_id + amount), sizes, locations)]
+        self.water_sample_id += amount
+
+        return water_samples
+
+    def generate_photos(self, nodes: list) -> list:
+        amount = int(self.draw(self.generate_variables['photo']['minAmount'],
+                               self.generate_variables['photo']['maxAmount']))
+        locations = self.node_store.gather(nodes, self.rng.integers(len(nodes), size=amount))
+        sizes = self.draw(self.generate_variables['photo']['minSize'],
+                          self.generate_variables['photo']['maxSize'], amount).tolist()
+        with_victims = (self.draw(0, 100, amount) <= self.generate_variables['photo']['victimProbability']).tolist()
+
+        victims_amounts = self.draw(self.generate_variables['victim']['minAmount'],
+                                    self.generate_variables['victim']['maxAmount'], sum(with_victims)).tolist()
+        victims_locations = [location for location, has_victims in zip(locations, with_victims) if has_victims]
+        victims_locations = [location for location, victims_amount in zip(victims_locations, victims_amounts)
+                             for _ in range(victims_amount)]
+        victims = iter(self.create_victims(len(victims_locations), victims_locations, True))
+        victims_amounts = iter(victims_amounts)
+
+        photos = []
+        for identifier, size, location, has_victims in zip(range(self.photo_id, self.photo_id + amount), sizes,
+                                                            locations, with_victims):
+            photo_victims = [next(victims) for _ in range(next(victims_amounts))] if has_victims else []
+            photos.append(Photo(self.flood_id, identifier, size, location, photo_victims))
+
+        self.photo_id += amount
+
+        return photos
+
+    def generate_photo_victims(self, location: tuple) -> list:
+        amount = int(self.draw(self.generate_variables['victim']['minAmount'],
+                               self.generate_variables['victim']['maxAmount']))
+
+        return self.create_victims(amount, [location] * amount, True)
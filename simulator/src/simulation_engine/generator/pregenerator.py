@@ -0,0 +1,140 @@
+"""This module generates the scenarios of all the matches at once, on a pool of processes.
+
+Each match, one for each map on the configuration file, is generated with its own seed derived from the random seed,
+the index of the match and the name of the map, so the scenarios do not depend on the amount of workers nor on the
+order the matches are generated."""
+
+import copy
+from concurrent.futures import ProcessPoolExecutor
+
+import simulation_engine.simulation_helpers.events_formatter as formatter
+from simulation_engine.simulation_helpers.map import Map
+from simulation_engine.simulation_helpers.report import Report
+from .genarator_base import GeneratorBase
+from .scenario_cache import ScenarioCache, scenario_key
+
+_maps: dict = {}
+
+
+def derive_seed(seed, match: int, map_config: dict) -> str:
+    """Derive the seed of one match.
+
+    :param seed: The randomSeed of the configuration file.
+    :param match: The index of the match.
+    :param map_config: The configuration of the map used on the match.
+    :return str: The seed of the match."""
+
+    return f'{seed}-{match}-{map_config["name"]}'
+
+
+def match_config(config: dict, match: int) -> dict:
+    """Return the configuration of one match, with only its map and its derived seed.
+
+    :param config: The configuration file.
+    :param match: The index of the match.
+    :return dict: The configuration used to generate the match."""
+
+    config = copy.deepcopy(config)
+    config['map']['maps'] = [config['map']['maps'][match]]
+    config['map']['randomSeed'] = derive_seed(config['map']['randomSeed'], match, config['map']['maps'][0])
+    config['generate'].pop('lookahead', None)
+
+    return config
+
+
+class PregeneratedMatch(GeneratorBase):
+    """Class that holds the scenario of a match generated by a worker, used by the cycle in place of the generator."""
+
+    def __init__(self, steps, social_assets: list, generator):
+        self.steps = steps
+        self.social_assets: list = social_assets
+        self.flood_id: int = generator.flood_id
+        self.victim_id: int = generator.victim_id
+        self.photo_id: int = generator.photo_id
+        self.water_sample_id: int = generator.water_sample_id
+
+    def generate_events(self, map):
+        return self.steps
+
+    def update_report(self):
+        """Update the report totals as the generator does."""
+
+        report = Report()
+        report.total_events = self.flood_id
+        report.total_victims = self.victim_id
+        report.total_photos = self.photo_id
+        report.total_samples = self.water_sample_id
+
+    def generate_social_assets(self) -> list:
+        return self.social_assets
+
+    @staticmethod
+    def get_json_social_assets(social_assets):
+        return formatter.format_assets(social_assets)
+
+
+def generate_scenario(create_generator, config: dict, map, folder=None) -> PregeneratedMatch:
+    """Generate the scenario of the configuration, or load it from the scenario cache when it is enabled.
+
+    :param create_generator: Function that creates the generator from the configuration and the map.
+    :param config: The configuration file, with the map of the match first on the maps list.
+    :param map: The map of the match.
+    :param folder: The folder of the scenario cache, the default one when None.
+    :return PregeneratedMatch: The steps and the social assets markers of the match."""
+
+    cache = ScenarioCache(folder) if ScenarioCache.enabled(config) else None
+    if cache is not None:
+        key = scenario_key(config)
+        scenario = cache.load(key)
+        if scenario is not None:
+            return scenario
+
+    generator = create_generator(config, map)
+    steps = generator.generate_events(map)
+    scenario = PregeneratedMatch(steps, generator.generate_social_assets(), generator)
+
+    if cache is not None:
+        cache.store(key, scenario)
+
+    return scenario
+
+
+def generate_match(create_generator, config: dict, match: int) -> PregeneratedMatch:
+    """Generate the scenario of one match, the maps are loaded once by process.
+
+    :param create_generator: Function that creates the generator from the configuration and the map.
+    :param config: The configuration file.
+    :param match: The index of the match.
+    :return PregeneratedMatch: The steps and the social assets markers of the match."""
+
+    config = match_config(config, match)
+    map_config = config['map']['maps'][0]
+
+    map = _maps.get(map_config['osm'])
+    if map is None:
+        map = Map(map_config, config['map']['proximity'], config['map']['movementRestrictions'])
+        _maps[map_config['osm']] = map
+
+    return generate_scenario(create_generator, config, map)
+
+
+class Pregenerator:
+    """Class that starts the generation of all the matches and hands them to the cycle when needed."""
+
+    def __init__(self, config: dict, workers: int, create_generator):
+        executor = ProcessPoolExecutor(max_workers=workers)
+        self.matches = [executor.submit(generate_match, create_generator, config, match)
+                        for match in range(len(config['map']['maps']))]
+        executor.shutdown(wait=False)
+
+    def get(self, match: int) -> PregeneratedMatch:
+        """Wait for the scenario of the match and return it, updating the report totals as the generator does.
+
+        :param match: The index of the match.
+        :return PregeneratedMatch: The scenario of the match."""
+
+        scenario = self.matches[match].result()
+        self.matches[match] = None
+        scenario.update_report()
+
+        return scenario
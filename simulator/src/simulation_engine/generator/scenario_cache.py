@@ -0,0 +1,157 @@
+"""This module keeps the generated scenarios on disk, so the runs with the same configuration skip the generation.
+
+The key of a scenario is the SHA-256 digest of every part of the configuration file read by the generators (the steps,
+the random seed, the proximity, the map of the match, the generate and the social assets sections), of the OSM file
+itself and of the sources of the generators and of the pickled objects, so any relevant change, including a change of
+the code, writes a new entry instead of loading a stale one. The entries are pickled with the highest protocol and
+written atomically, a corrupted entry is generated again. Only the entries used most recently are kept on the folder."""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+import pathlib
+import tempfile
+import functools
+
+from . import numpy_generator
+
+logger = logging.getLogger(__name__)
+
+root = pathlib.Path(__file__).parents[4]
+
+engine = pathlib.Path(__file__).parents[1]
+
+# Sources of the generators and of the objects pickled on the entries, any change on them invalidates the entries
+sources = ['generator/*.py', 'simulation_objects/*.py', 'simulation_helpers/steps.py']
+
+# Entries kept on the folder, the least recently used are removed once there are more
+max_entries = 32
+
+
+@functools.lru_cache(maxsize=None)
+def sources_digest() -> str:
+    """Compute the digest of the sources that generate and define the objects of the scenarios.
+
+    :return str: The hexadecimal SHA-256 digest of the sources, in the order of their paths."""
+
+    digest = hashlib.sha256()
+    for path in sorted(path for pattern in sources for path in engine.glob(pattern)):
+        digest.update(path.relative_to(engine).as_posix().encode())
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+def osm_digest(map_config: dict) -> str:
+    """Compute the digest of the OSM file of the map.
+
+    :param map_config: The configuration of the map.
+    :return str: The hexadecimal SHA-256 digest of the file."""
+
+    digest = hashlib.sha256()
+    with open(root / map_config['osm'], 'rb') as osm:
+        for chunk in iter(lambda: osm.read(1 << 20), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def scenario_key(config: dict) -> str:
+    """Compute the key of the scenario generated from the configuration.
+
+    :param config: The configuration file, with the map of the match first on the maps list.
+    :return str: The hexadecimal SHA-256 digest that identifies the scenario."""
+
+    generate = dict(config['generate'])
+    if generate.get('backend', 'random') == 'numpy' and not numpy_generator.available():
+        generate['backend'] = 'random'
+
+    relevant = {
+        'sources': sources_digest(),
+        'steps': config['map']['steps'],
+        'randomSeed': config['map']['randomSeed'],
+        'proximity': config['map']['proximity'],
+        'map': config['map']['maps'][0],
+        'generate': generate,
+        'socialAssets': config['socialAssets'],
+        'osm': osm_digest(config['map']['maps'][0])
+    }
+    content = json.dumps(relevant, sort_keys=True, separators=(',', ':'), default=str)
+
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class ScenarioCache:
+    """Class that loads and stores the scenarios on the cache folder."""
+
+    def __init__(self, folder=None, max_entries: int = max_entries):
+        """
+        :param folder: The folder of the entries, files/cache when None.
+        :param max_entries: Entries kept on the folder."""
+
+        self.folder = pathlib.Path(folder) if folder is not None else root / 'files' / 'cache'
+        self.max_entries: int = max_entries
+
+    @staticmethod
+    def enabled(config: dict) -> bool:
+        """Check if the scenarios of the configuration can be cached.
+
+        The scenarios generated step by step with a lookahead are never complete, so they are not cached.
+
+        :param config: The configuration file.
+        :return bool: True if the cache is enabled else False."""
+
+        return config['map'].get('scenarioCache', True) and config['generate'].get('lookahead') is None
+
+    def path(self, key: str) -> pathlib.Path:
+        return self.folder / f'{key}.bin'
+
+    def load(self, key: str):
+        """Load the scenario stored with the key.
+
+        :param key: The key of the scenario.
+        :return PregeneratedMatch|None: The scenario or None if it is not on the cache or can not be read."""
+
+        try:
+            with open(self.path(key), 'rb') as entry:
+                scenario = pickle.load(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'Scenario cache entry {key} could not be read and will be generated again: {e}')
+            return None
+
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            pass
+
+        return scenario
+
+    def store(self, key: str, scenario):
+        """Store the scenario with the key, the entry is only visible after it is completely written.
+
+        :param key: The key of the scenario.
+        :param scenario: The scenario of the match."""
+
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as entry:
+                pickle.dump(scenario, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self.path(key))
+            self.evict()
+        except OSError as e:
+            logger.warning(f'Scenario cache entry {key} could not be written: {e}')
+
+    def evict(self):
+        """Remove the entries used least recently, until only max_entries are left on the folder."""
+
+        entries = sorted(self.folder.glob('*.bin'), key=lambda path: path.stat().st_mtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
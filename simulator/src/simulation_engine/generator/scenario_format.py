@@ -0,0 +1,249 @@
+"""Indexed binary container of the scenarios recorded with -write_sim and loaded with -load_sim.
+
+The container holds the same content as the JSON events file, the configuration without the matches on the header and
+the steps and social assets of each match as records, so any step of any match can be read without decoding the rest:
+
+    header:  magic, version (uint16), length (uint32) and the JSON of the configuration without the matchs key
+    records: zlib compressed JSON of each step with a flood, as returned by Loader.get_json_events, and of the social
+             assets of each match
+    index:   offset of the previous index (uint64, 0 if there is none), amount of matches (uint32) and for each match the offset (uint64) and length (uint32) of the social
+             assets record, the amount of steps (uint32) and the step (uint32), offset (uint64) and length (uint32)
+             of each step record
+    footer:  offset of the index (uint64) and the magic
+
+All the integers are little endian. The index is written after the records, so the matches are written one at a time
+without holding the whole scenario in memory. A match is appended to an existing container by writing its records and
+a new index with only the new matches after the old footer, the indexes are chained by their previous offsets and the
+last footer points to the last index, so recording a match never reads nor rewrites the matches before it.
+
+Usage: python3 scenario_format.py <input> <output>, converts a JSON events file to a container and back."""
+
+import sys
+import json
+import zlib
+import struct
+
+magic = b'DSSCN\x00'
+version = 2
+
+_header = struct.Struct('<HI')
+_index = struct.Struct('<QI')
+_match = struct.Struct('<QII')
+_step = struct.Struct('<IQI')
+_footer = struct.Struct(f'<Q{len(magic)}s')
+
+
+class ScenarioFormatError(Exception):
+    """Exception raised when the file is not a valid scenario container."""
+
+
+def is_scenario_file(path) -> bool:
+    """Check if the file is a scenario container instead of a JSON events file.
+
+    :param path: Path to the file.
+    :return bool: True if the file starts with the magic of the container else False."""
+
+    with open(path, 'rb') as file:
+        return file.read(len(magic)) == magic
+
+
+def encode(content) -> bytes:
+    return zlib.compress(json.dumps(content, separators=(',', ':'), default=lambda o: o.dict()).encode())
+
+
+def decode(record: bytes):
+    return json.loads(zlib.decompress(record))
+
+
+def read_footer(file) -> int:
+    file.seek(-_footer.size, 2)
+    index_offset, footer_magic = _footer.unpack(file.read(_footer.size))
+    if footer_magic != magic:
+        raise ScenarioFormatError(f'{file.name} is not a complete scenario file.')
+
+    return index_offset
+
+
+class ScenarioWriter:
+    """Class that writes the matches of a scenario to a new container, or appends them to an existing one."""
+
+    def __init__(self, path, header=None):
+        """
+        :param path: Path to the container.
+        :param header: The configuration without the matches for a new container, None to append to the existing one."""
+
+        self.index: list = []
+        self.previous: int = 0
+        self.start: int = 0
+
+        if header is None:
+            self.file = open(path, 'r+b')
+            self.previous = read_footer(self.file)
+            self.start = self.file.seek(0, 2)
+        else:
+            self.file = open(path, 'wb')
+            content = json.dumps(header, separators=(',', ':'), default=lambda o: o.dict()).encode()
+            self.file.write(magic + _header.pack(version, len(content)) + content)
+
+    def write_record(self, content) -> tuple:
+        record = encode(content)
+        offset = self.file.tell()
+        self.file.write(record)
+
+        return offset, len(record)
+
+    def add_match(self, steps, social_assets: list):
+        """Write the records of one match.
+
+        :param steps: The steps with a flood, as returned by Loader.get_json_events.
+        :param social_assets: The social assets markers, as returned by get_json_social_assets."""
+
+        steps_index = [(step['step'], *self.write_record(step)) for step in steps if step is not None]
+        self.index.append((self.write_record(social_assets), steps_index))
+
+    def close(self):
+        """Write the index and the footer, the container can only be read after it is closed."""
+
+        index_offset = self.file.tell()
+        self.file.write(_index.pack(self.previous, len(self.index)))
+        for (assets_offset, assets_length), steps_index in self.index:
+            self.file.write(_match.pack(assets_offset, assets_length, len(steps_index)))
+            self.file.write(b''.join(_step.pack(*entry) for entry in steps_index))
+
+        self.file.write(_footer.pack(index_offset, magic))
+        self.file.close()
+
+    def abort(self):
+        """Discard the matches written, so the container is never left with an index of incomplete records.
+
+        The matches appended are removed and the container stays as it was, a new container is left without footer
+        and can not be read."""
+
+        if self.start:
+            self.file.truncate(self.start)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ScenarioReader:
+    """Class that reads the records of a container on demand."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+
+        if self.file.read(len(magic)) != magic:
+            raise ScenarioFormatError(f'{path} is not a scenario file.')
+
+        file_version, length = _header.unpack(self.file.read(_header.size))
+        if file_version != version:
+            raise ScenarioFormatError(f'Scenario file version {file_version} is not supported.')
+
+        self.header: dict = json.loads(self.file.read(length))
+
+        self.matches: list = []
+        index_offset = read_footer(self.file)
+        while index_offset:
+            self.file.seek(index_offset)
+            index_offset, amount = _index.unpack(self.file.read(_index.size))
+            self.matches[:0] = [self.read_match_index() for _ in range(amount)]
+
+    def read_match_index(self) -> tuple:
+        assets_offset, assets_length, amount = _match.unpack(self.file.read(_match.size))
+        steps = {step: (offset, length) for step, offset, length in _step.iter_unpack(self.file.read(_step.size * amount))}
+
+        return (assets_offset, assets_length), steps
+
+    def read_record(self, offset: int, length: int):
+        self.file.seek(offset)
+        return decode(self.file.read(length))
+
+    def steps(self, match: int) -> list:
+        """Return the steps with a flood of the match.
+
+        :param match: The index of the match.
+        :return list: The numbers of the steps, in order."""
+
+        return sorted(self.matches[match][1])
+
+    def read_step(self, match: int, step: int):
+        """Decode one step of the match.
+
+        :param match: The index of the match.
+        :param step: The number of the step.
+        :return dict|None: The step as returned by Loader.get_json_events or None if the step has no flood."""
+
+        entry = self.matches[match][1].get(step)
+        if entry is None:
+            return None
+
+        return self.read_record(*entry)
+
+    def read_social_assets(self, match: int) -> list:
+        """Decode the social assets markers of the match.
+
+        :param match: The index of the match.
+        :return list: The social assets as returned by get_json_social_assets."""
+
+        return self.read_record(*self.matches[match][0])
+
+    def read_match(self, match: int) -> dict:
+        """Decode the whole match.
+
+        :param match: The index of the match.
+        :return dict: The match as stored on the JSON events file."""
+
+        return dict(steps=[self.read_step(match, step) for step in self.steps(match)],
+                    social_assets=self.read_social_assets(match))
+
+    def __iter__(self):
+        return (self.read_match(match) for match in range(len(self.matches)))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def from_json(events: dict, path):
+    """Write the content of a JSON events file to a new container.
+
+    :param events: The content of the JSON events file.
+    :param path: Path to the container."""
+
+    header = {key: value for key, value in events.items() if key != 'matchs'}
+    with ScenarioWriter(path, header) as writer:
+        for match in events['matchs']:
+            writer.add_match(match['steps'], match['social_assets'])
+
+
+def to_json(path) -> dict:
+    """Read a whole container back to the content of a JSON events file.
+
+    :param path: Path to the container.
+    :return dict: The content of the JSON events file."""
+
+    with ScenarioReader(path) as reader:
+        return dict(reader.header, matchs=list(reader))
+
+
+if __name__ == '__main__':
+    source, target = sys.argv[1:3]
+
+    if is_scenario_file(source):
+        with open(target, 'w') as output:
+            output.write(json.dumps(to_json(source), sort_keys=False, indent=4))
+    else:
+        with open(source, 'r') as events_file:
+            from_json(json.load(events_file), target)
@@ -6,6 +6,7 @@ import traceback
 from simulation_engine.copycat import CopyCat
 from simulation_engine.simulation_helpers.logger import Logger
 from simulation_engine.simulation_helpers.report import Report
+from communication.helpers import polyline
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,10 @@ class JsonFormatter:
         self.logger = logging.getLogger(__name__) 
         config_location = pathlib.Path(__file__).parents[3] / config
         # self.copycat = CopyCat(json.load(open(config_location, 'r')), load_sim, write_sim)
-        self.copycat = CopyCat(json.load(open(config, 'r')), load_sim, write_sim)
+        config = json.load(open(config, 'r'))
+        self.copycat = CopyCat(config, load_sim, write_sim)
+        self.routes = {role: (info.get('routeMode', 'full'), info.get('routeWaypoints', 10))
+                       for role, info in config['agents'].items()}
 
     def log(self):
         """Do the log and returns a JSON response.
@@ -31,8 +35,8 @@ class JsonFormatter:
     def restart(self):
         """Restart the simulation and returns a JSON response.
 
-        All the agents, social assets and events are converted, the copycat class prevents from the formatter changing
-        the objects inside the engine. 
+        All the agents, social assets and events are converted straight from the objects inside the engine, since they
+        are only read and converted before the engine changes them again.
 
         :return dict: Dictionary with status representing if any errors were found, the list of agents and social assets,
         the event with the flood, victims, photos and water samples and a general message."""
@@ -48,6 +52,7 @@ class JsonFormatter:
             json_agents = self.jsonify_agents(agents)
             json_actors = [{'agent': agent, 'message': message} for agent in json_agents]
             environment = {'events': self.jsonify_events(step), 'step': current_step}
+            self.jsonify_perceived_events(json_actors, step)
 
             percepts = {'status': 1, 'actors': json_actors, 'environment': environment, 'message': 'Simulation restarted.'}
             initial_percepts = {'status': 1, 'agents': json_agents_init, 'map_percepts': new_map_percepts, 'message': ''}
@@ -249,8 +254,8 @@ class JsonFormatter:
     def start(self):
         """Start the simulation and returns a JSON response.
 
-        All the agents, social assets and events are converted, the copycat class prevents from the formatter changing
-        the objects inside the engine.
+        All the agents, social assets and events are converted straight from the objects inside the engine, since they
+        are only read and converted before the engine changes them again.
 
         :return dict: Dictionary with status representing if any errors were found, the list of agents and social assets,
         the event with the flood, victims, photos and water samples and a general message."""
@@ -264,6 +269,7 @@ class JsonFormatter:
             json_agents = self.jsonify_agents(response[0])
             json_actors = [{'agent': agent, 'message': message} for agent in [*json_agents]]
             environment = {'events': self.jsonify_events(response[1]), 'step': response[2]}
+            self.jsonify_perceived_events(json_actors, response[1])
             map_percepts = response[3]
 
             Logger.normal(message)
@@ -323,6 +329,7 @@ class JsonFormatter:
 
             json_events = self.jsonify_events(response[1])
             environment = {'events': json_events, 'step': response[2]}
+            self.jsonify_perceived_events(json_actors, response[1])
 
             if response[3]:
                 Logger.normal('A social asset request connection will start.')
@@ -424,7 +431,7 @@ class JsonFormatter:
 
         json_virtual_items = self.jsonify_delivered_items(agent.virtual_storage_vector)
 
-        json_route = [self.format_location(location) for location in agent.route]
+        json_route = self.jsonify_route(agent.role, agent.route)
 
         json_social_assets = self.jsonify_social_assets(agent.social_assets)
 
@@ -491,6 +498,29 @@ class JsonFormatter:
             'virtual_storage_vector': json_virtual_items
         }
 
+    def jsonify_route(self, role, route):
+        """Transform the route of the agent with the route mode of its role.
+
+        The full mode sends every location of the route, next_k only the next routeWaypoints locations, none an empty
+        list and polyline the whole route as an encoded polyline string. The destination distance is always sent.
+
+        :param role: The role of the agent.
+        :param route: The remaining route of the agent.
+        :return list|str: The locations of the route or the encoded polyline."""
+
+        mode, waypoints = self.routes.get(role, ('full', 0))
+
+        if mode == 'none':
+            return []
+
+        if mode == 'polyline':
+            return polyline.encode(route)
+
+        if mode == 'next_k':
+            route = route[:waypoints]
+
+        return [self.format_location(location) for location in route]
+
     @staticmethod
     def format_location(location):
         """Format the attribute location to a dict with the coordinates (Agent protocol)
@@ -516,67 +546,119 @@ class JsonFormatter:
                 pass
 
             if event.type == 'flood':
-                flood = {
-                    'identifier': event.id,
-                    'type': 'flood',
-                    'location': self.format_location(event.dimension['location']),
-                    'shape': event.dimension['shape']
-                }
+                formatted_list.append(self.jsonify_flood(event))
 
-                if event.dimension['shape'] == 'circle':
-                    flood['radius'] = event.dimension['radius']
+            elif event.type == 'victim':
+                formatted_list.append(self.jsonify_victim(event))
 
-                formatted_list.append(flood)
+            elif event.type == 'photo':
+                formatted_list.append(self.jsonify_photo(event))
 
-            elif event.type == 'victim':
-                victim = {
-                    'flood_id': event.flood_id,
-                    'identifier': event.identifier,
-                    'type': 'victim',
-                    'location': self.format_location(event.location),
-                    'size': event.size,
-                    'lifetime': event.lifetime
-                }
+            else:
+                formatted_list.append(self.jsonify_water_sample(event))
 
-                formatted_list.append(victim)
+        return formatted_list
 
-            elif event.type == 'photo':
-                photo_victims = []
-                for victim in event.victims:
-                    if victim.active:
-                        json_victim = {
-                            'flood_id': victim.flood_id,
-                            'identifier': victim.identifier,
-                            'type': 'victim',
-                            'location': self.format_location(victim.location),
-                            'size': victim.size,
-                            'lifetime': victim.lifetime
-                        }
-                        photo_victims.append(json_victim)
-
-                photo = {
-                    'flood_id': event.flood_id,
-                    'identifier': event.identifier,
-                    'type': 'photo',
-                    'location': self.format_location(event.location),
-                    'size': event.size,
-                    'victims': photo_victims
-                }
+    def jsonify_perceived_events(self, json_actors, events_list):
+        """Add the events perceived by the agents of the roles with a perception radius to their actors.
 
-                formatted_list.append(photo)
+        The actors of the other roles and the social assets have no events of their own and perceive all the events
+        of the environment.
 
-            else:
-                water_sample = {
-                    'flood_id': event.flood_id,
-                    'identifier': event.identifier,
-                    'type': 'water_sample',
-                    'location': self.format_location(event.location),
-                    'size': event.size
-                }
+        :param json_actors: List of the actors already converted to JSON.
+        :param events_list: The events of the step returned by the engine."""
 
-                formatted_list.append(water_sample)
+        perceived = self.copycat.perceive(events_list)
+        if not perceived:
+            return
 
-        return formatted_list
+        for actor in json_actors:
+            events = perceived.get(actor['agent']['token'])
+            if events is not None:
+                actor['events'] = self.jsonify_events(events)
+
+    def jsonify_flood(self, flood):
+        """Transform the flood into a JSON object, reusing the one cached on the flood while its radius is the same.
+
+        :param flood: The flood object saved in the simulation.
+        :return dict: Dictionary with the information from the flood."""
+
+        percept = flood.percept
+        if percept is None or percept.get('radius') != flood.dimension.get('radius'):
+            percept = {
+                'identifier': flood.id,
+                'type': 'flood',
+                'location': self.format_location(flood.dimension['location']),
+                'shape': flood.dimension['shape']
+            }
+
+            if flood.dimension['shape'] == 'circle':
+                percept['radius'] = flood.dimension['radius']
+
+            flood.percept = percept
+
+        return percept
+
+    def jsonify_victim(self, victim):
+        """Transform the victim into a JSON object, reusing the one cached on the victim while its lifetime is the same.
+
+        :param victim: The victim object saved in the simulation.
+        :return dict: Dictionary with the information from the victim."""
+
+        percept = victim.percept
+        if percept is None or percept['lifetime'] != victim.lifetime:
+            percept = {
+                'flood_id': victim.flood_id,
+                'identifier': victim.identifier,
+                'type': 'victim',
+                'location': self.format_location(victim.location),
+                'size': victim.size,
+                'lifetime': victim.lifetime
+            }
+            victim.percept = percept
+
+        return percept
+
+    def jsonify_photo(self, photo):
+        """Transform the photo into a JSON object, reusing the one cached on the photo while its active victims are the
+        same.
+
+        :param photo: The photo object saved in the simulation.
+        :return dict: Dictionary with the information from the photo and its active victims."""
+
+        photo_victims = [self.jsonify_victim(victim) for victim in photo.victims if victim.active]
+
+        percept = photo.percept
+        if percept is None or len(percept['victims']) != len(photo_victims) or \
+                any(cached is not victim for cached, victim in zip(percept['victims'], photo_victims)):
+            percept = {
+                'flood_id': photo.flood_id,
+                'identifier': photo.identifier,
+                'type': 'photo',
+                'location': self.format_location(photo.location),
+                'size': photo.size,
+                'victims': photo_victims
+            }
+            photo.percept = percept
+
+        return percept
+
+    def jsonify_water_sample(self, water_sample):
+        """Transform the water sample into a JSON object, cached on the water sample since it never changes.
+
+        :param water_sample: The water sample object saved in the simulation.
+        :return dict: Dictionary with the information from the water sample."""
+
+        if water_sample.percept is None:
+            water_sample.percept = {
+                'flood_id': water_sample.flood_id,
+                'identifier': water_sample.identifier,
+                'type': 'water_sample',
+                'location': self.format_location(water_sample.location),
+                'size': water_sample.size
+            }
+
+        return water_sample.percept
 
     def jsonify_delivered_items(self, items):
         """Transform all the items to JSON.
@@ -591,47 +673,13 @@ class JsonFormatter:
 
         for item in items:
             if item.type == 'victim':
-                json_item = {
-                    'flood_id': item.flood_id,
-                    'identifier': item.identifier,
-                    'type': 'victim',
-                    'location': self.format_location(item.location),
-                    'size': item.size,
-                    'lifetime': item.lifetime
-                }
+                json_item = self.jsonify_victim(item)
 
             elif item.type == 'photo':
-                json_photo_victims = []
-
-                for victim in item.victims:
-                    if victim.active:
-                        json_victim = {
-                            'flood_id': victim.flood_id,
-                            'identifier': victim.identifier,
-                            'type': 'victim',
-                            'location': self.format_location(victim.location),
-                            'size': victim.size,
-                            'lifetime': victim.lifetime
-                        }
-                        json_photo_victims.append(json_victim)
-
-                json_item = {
-                    'flood_id': item.flood_id,
-                    'identifier': item.identifier,
-                    'type': 'photo',
-                    'location': self.format_location(item.location),
-                    'size': item.size,
-                    'victims': json_photo_victims
-                }
+                json_item = self.jsonify_photo(item)
 
             elif item.type == 'water_sample':
-                json_item = {
-                    'flood_id': item.flood_id,
-                    'identifier': item.identifier,
-                    'type': 'water_sample',
-                    'location': self.format_location(item.location),
-                    'size': item.size
-                }
+                json_item = self.jsonify_water_sample(item)
 
             elif item.type == 'social_asset':
                 json_item = self.jsonify_asset(item)
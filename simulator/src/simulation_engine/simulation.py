@@ -126,6 +126,14 @@ class Simulation:
 
         return actions_results, step, self.cycler.current_step, requests
 
+    def perceive(self, events):
+        """Select the events perceived by the agents of the roles with a perception radius.
+
+        :param events: The events of the step returned by start, restart or do_step.
+        :return dict: Dictionary with the token of the agent as key and the events it perceives."""
+
+        return self.cycler.perceive(events)
+
     def calculate_route(self, parameters):
         """Return the route calculated with the parameters given.
 
@@ -186,56 +194,57 @@ class Simulation:
         water_samples_collected = 0
         water_samples_ignored = 0
 
-        for i in range(current_step):
-            if self.cycler.steps[i]['flood'] is None:
-                continue
+        if self.cycler.entity_store is not None:
+            victims_dead_ignored = self.cycler.entity_store.victims_dead_ignored()
 
-            floods_amount += 1
-            victims_in_events += len(self.cycler.steps[i]['victims'])
+        else:
+            for step in self.cycler.steps.until(current_step):
+                floods_amount += 1
+                victims_in_events += len(step['victims'])
 
-            for victim in self.cycler.steps[i]['victims']:
-                if not victim.active and victim.lifetime > 0:
-                    victims_saved += 1
+                for victim in step['victims']:
+                    if not victim.active and victim.lifetime > 0:
+                        victims_saved += 1
 
-                elif not victim.active and victim.lifetime <= 0:
-                    victims_dead_delivered += 1
+                    elif not victim.active and victim.lifetime <= 0:
+                        victims_dead_delivered += 1
 
-                elif victim.lifetime <= 0:
-                    victims_dead_ignored += 1
+                    elif victim.lifetime <= 0:
+                        victims_dead_ignored += 1
 
-                else:
-                    victims_ignored += 1
+                    else:
+                        victims_ignored += 1
 
-            for photo in self.cycler.steps[i]['photos']:
-                if not photo.active:
-                    photos_taken += 1
+                for photo in step['photos']:
+                    if not photo.active:
+                        photos_taken += 1
 
-                victims_in_photo += len(photo.victims)
+                    victims_in_photo += len(photo.victims)
 
-                if photo.analyzed:
-                    photos_analyzed += 1
+                    if photo.analyzed:
+                        photos_analyzed += 1
 
-                    for victim in photo.victims:
-                        if not victim.active and victim.lifetime > 0:
-                            victims_saved += 1
+                        for victim in photo.victims:
+                            if not victim.active and victim.lifetime > 0:
+                                victims_saved += 1
 
-                        elif not victim.active and victim.lifetime == 0:
-                            victims_dead_delivered += 1
+                            elif not victim.active and victim.lifetime == 0:
+                                victims_dead_delivered += 1
 
-                        elif not victim.lifetime:
-                            victims_dead_ignored += 1
+                            elif not victim.lifetime:
+                                victims_dead_ignored += 1
 
-                        victims_in_photo += 1
+                            victims_in_photo += 1
 
-                else:
-                    photos_ignored += 1
+                    else:
+                        photos_ignored += 1
 
-            for water_sample in self.cycler.steps[i]['water_samples']:
-                if not water_sample.active:
-                    water_samples_collected += 1
+                for water_sample in step['water_samples']:
+                    if not water_sample.active:
+                        water_samples_collected += 1
 
-                else:
-                    water_samples_ignored += 1
+                    else:
+                        water_samples_ignored += 1
 
         # from .simulation_helpers.report import total_events, total_victims, total_photos, total_samples   
         from simulation_engine.simulation_helpers.report import Report   
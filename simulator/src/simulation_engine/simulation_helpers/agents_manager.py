@@ -1,17 +1,20 @@
 from collections import namedtuple
 from simulation_engine.simulation_objects.agent import Agent
+from simulation_engine.simulation_helpers.capabilities import compile_mask
 
-Role = namedtuple('Role', 'abilities resources size name battery battery_by_movement speed physical_capacity virtual_capacity')
+Role = namedtuple('Role', 'abilities resources size name battery battery_by_movement speed physical_capacity virtual_capacity '
+                           'abilities_mask resources_mask')
 
 
 class AgentsManager:
     """Class that will handle all the changes on the agents inside the engine."""
 
-    def __init__(self, roles_info, cdm_location):
+    def __init__(self, roles_info, cdm_location, entity_store=None):
         self.agents = {}
         self.cdm_location = cdm_location
         self.roles = self.generate_roles(roles_info)
         self.assets = None
+        self.new_agent = entity_store.new_agent if entity_store is not None else Agent
 
     def restart(self, roles_info, cdm_location):
         """Restart the class by erasing all the agents and recreating them with the same tokens.
@@ -45,7 +48,9 @@ class AgentsManager:
                 roles_info[role]['batteryByMovement'],
                 roles_info[role]['speed'],
                 roles_info[role]['physicalCapacity'],
-                roles_info[role]['virtualCapacity'])
+                roles_info[role]['virtualCapacity'],
+                compile_mask(roles_info[role]['abilities']),
+                compile_mask(roles_info[role]['resources']))
             for i in range(roles_info[role]['amount']):
                 roles.append(temp_role)
 
@@ -61,7 +66,7 @@ class AgentsManager:
             return False
 
         role = self.roles.pop(0)
-        self.agents[token] = Agent(token, self.cdm_location, *role)
+        self.agents[token] = self.new_agent(token, self.cdm_location, *role)
 
         return self.agents[token]
 
@@ -0,0 +1,57 @@
+"""This module compiles the abilities and resources strings from the configuration file into integer bitmasks.
+
+Every distinct string receives its own bit the first time it is seen, the same bit is used by the roles, the
+professions and the actions demands, so validating an action is reduced to bitwise operations."""
+
+_bits: dict = {}
+
+
+def compile_mask(names: list) -> int:
+    """Compile a list of abilities or resources into a bitmask.
+
+    :param names: List of abilities or resources names.
+    :return int: Bitmask with one bit set for each name."""
+
+    mask: int = 0
+    for name in names:
+        bit = _bits.get(name)
+        if bit is None:
+            bit = 1 << len(_bits)
+            _bits[name] = bit
+
+        mask |= bit
+
+    return mask
+
+
+def compile_demands(demands: list) -> list:
+    """Compile the demands of an action, each demand being a list of names that must be present at once.
+
+    :param demands: List of lists of abilities or resources names.
+    :return list: List of bitmasks, one for each demand."""
+
+    return [compile_mask(demand) for demand in demands]
+
+
+def compile_actions(actions_info: dict) -> dict:
+    """Compile the abilities and resources demands of every action from the configuration file.
+
+    :param actions_info: The actions section of the configuration file.
+    :return dict: Dictionary with the action name as key and a tuple with the abilities and resources masks."""
+
+    return {name: (compile_demands(info['abilities']), compile_demands(info['resources']))
+            for name, info in actions_info.items()}
+
+
+def check_demands(demands_masks: list, mask: int) -> bool:
+    """Check if the mask satisfies at least one of the demands.
+
+    :param demands_masks: List of compiled demands.
+    :param mask: The compiled abilities or resources of the actor.
+    :return bool: True if any demand is fully contained in the mask else False."""
+
+    for demand in demands_masks:
+        if demand & mask == demand:
+            return True
+
+    return False
@@ -8,12 +8,18 @@ from math import sqrt
 
 from ..exceptions.exceptions import *
 from simulation_engine.generator.generator import Generator
+from simulation_engine.generator import numpy_generator
+from simulation_engine.generator.pregenerator import Pregenerator, generate_scenario
+from simulation_engine.generator.scenario_cache import ScenarioCache
 from simulation_engine.generator.loader import Loader
 # from simulation_engine.loader.loader import Loader
 from simulation_engine.simulation_helpers.agents_manager import AgentsManager
 from simulation_engine.simulation_helpers.map import Map
 from simulation_engine.simulation_helpers.social_assets_manager import SocialAssetsManager
 from simulation_engine.simulation_helpers.report import Report 
+from simulation_engine.simulation_helpers.capabilities import compile_actions
+from simulation_engine.simulation_helpers.perception import Perception
+from simulation_engine.simulation_helpers import entity_store
 from ..actions.action import *
 from ..actions.move import *
 from ..actions.deliver_virtual import *
@@ -28,19 +34,34 @@ class Cycle:
     def __init__(self, config, load_sim, write_sim):
         self.map = Map(config['map']['maps'][0], config['map']['proximity'], config['map']['movementRestrictions'])
         self.actions = config['actions']
+        self.actions_masks = compile_actions(self.actions)
         self.max_steps = config['map']['steps']
         self.cdm_location = (config['map']['maps'][0]['centerLat'], config['map']['maps'][0]['centerLon'])
-        self.agents_manager = AgentsManager(config['agents'], self.cdm_location)
+        self.entity_store = self.create_entity_store(config['map'])
+        self.agents_manager = AgentsManager(config['agents'], self.cdm_location, self.entity_store)
+        self.perception = Perception(config['agents'])
+        self.match = 0
+        self.pregenerator = None
+        self.loader = None
 
         if load_sim:
             path_to_events = pathlib.Path(__file__).parents[4] / config['map']['maps'][0]['events']
-            generator = Loader(config, self.map, path_to_events)
+            generator = self.loader = Loader(config, self.map, path_to_events)
+        elif config['map'].get('pregenerate'):
+            self.pregenerator = Pregenerator(config, config['map']['pregenerate'], Cycle.create_generator)
+            generator = self.pregenerator.get(self.match)
+        elif ScenarioCache.enabled(config):
+            generator = generate_scenario(Cycle.create_generator, config, self.map)
+            generator.update_report()
         else:
-            generator = Generator(config, self.map)
+            generator = self.create_generator(config, self.map)
 
         self.steps = generator.generate_events(self.map)
+        if self.entity_store is not None:
+            self.entity_store.attach_steps(self.steps)
+
         self.social_assets_manager = SocialAssetsManager(config['map'], config['socialAssets'],
-                                                         generator.generate_social_assets())
+                                                         generator.generate_social_assets(), self.entity_store)
         self.agents_manager.assets = self.social_assets_manager
 
         if write_sim:
@@ -52,8 +73,12 @@ class Cycle:
             hour = '{:0>2d}'.format(hour)
             minute = '{:0>2d}'.format(minute)
 
-            self.sim_file = str((path / f'Auto_Generate_Config_File_{sim_id}_at_{hour}h_{minute}min.txt'))
-            Loader.write_first_match(config, self.steps, self.social_assets_manager.social_assets_markers, generator, self.sim_file)
+            binary = config['map'].get('scenarioFormat', 'json') == 'binary'
+            extension = 'bin' if binary else 'txt'
+
+            self.sim_file = str((path / f'Auto_Generate_Config_File_{sim_id}_at_{hour}h_{minute}min.{extension}'))
+            Loader.write_first_match(config, self.steps, self.social_assets_manager.social_assets_markers, generator,
+                                     self.sim_file, binary)
 
         self.map_percepts = config['map']
         # self.max_floods = generator.flood_id
@@ -66,29 +91,79 @@ class Cycle:
 
     def restart(self, config, load_sim, write_sim):
         self.map.restart(config['map']['maps'][0], config['map']['proximity'], config['map']['movementRestrictions'])
+        self.match += 1
+
+        if self.loader is not None:
+            self.loader.close()
 
         if load_sim:
-            generator = Loader(config)
+            path_to_events = pathlib.Path(__file__).parents[4] / config['map']['maps'][0]['events']
+            generator = self.loader = Loader(config, self.map, path_to_events, self.match)
+        elif self.pregenerator is not None:
+            generator = self.pregenerator.get(self.match)
+        elif ScenarioCache.enabled(config):
+            generator = generate_scenario(Cycle.create_generator, config, self.map)
+            generator.update_report()
         else:
-            generator = Generator(config, self.map)
+            generator = self.create_generator(config, self.map)
+
+        if self.entity_store is not None:
+            self.entity_store.clear()
 
         self.steps = generator.generate_events(self.map)
+        if self.entity_store is not None:
+            self.entity_store.attach_steps(self.steps)
+
         self.social_assets_manager = SocialAssetsManager(config['map'], config['socialAssets'],
-                                                         generator.generate_social_assets())
+                                                         generator.generate_social_assets(), self.entity_store)
 
         if write_sim:
             self.write_match(generator, self.sim_file)
 
         self.map_percepts = config['map']
-        self.max_floods = generator.flood_id
-        self.max_victims = generator.victim_id
-        self.max_photos = generator.photo_id
-        self.max_water_samples = generator.water_sample_id
+        # self.max_floods = generator.flood_id
+        # self.max_victims = generator.victim_id
+        # self.max_photos = generator.photo_id
+        # self.max_water_samples = generator.water_sample_id
         self.delivered_items = []
         self.current_step = 0
         self.max_steps = config['map']['steps']
         self.cdm_location = (config['map']['maps'][0]['centerLat'], config['map']['maps'][0]['centerLon'])
         self.agents_manager.restart(config['agents'], self.cdm_location)
+        self.perception.restart(config['agents'])
+
+    @staticmethod
+    def create_generator(config, map):
+        """Create the generator of the scenario with the backend chosen on the generate configuration.
+
+        :param config: The configuration file.
+        :param map: The map of the simulation.
+        :return Generator: The random backend generator or the NumPy one."""
+
+        if config['generate'].get('backend', 'random') != 'numpy':
+            return Generator(config, map)
+
+        if not numpy_generator.available():
+            logger.warning('NumPy is not installed, the random generation backend is used.')
+            return Generator(config, map)
+
+        return numpy_generator.NumpyGenerator(config, map)
+
+    @staticmethod
+    def create_entity_store(map_info):
+        """Create the columnar store of the simulation objects when it is enabled on the map configuration.
+
+        :param map_info: The map section of the configuration file.
+        :return EntityStore|None: The store or None if it is disabled or NumPy is not installed."""
+
+        if not map_info.get('entityStore', False):
+            return None
+
+        if not entity_store.available():
+            logger.warning('NumPy is not installed, the entity store is disabled.')
+            return None
+
+        return entity_store.EntityStore()
 
     # def write_first_match(self, config, generator, file_name):
     #     config_copy = copy.deepcopy(config)
@@ -106,16 +181,7 @@ class Cycle:
     #         file.write(json.dumps(config_copy, sort_keys=False, indent=4))
 
     def write_match(self, generator, file_name):
-        with open(file_name, 'r') as file:
-            config = json.loads(file.read())
-
-        match = dict(steps=generator.get_json_events(self.steps),
-                     social_assets=generator.get_json_social_assets(self.social_assets_manager.social_assets_markers))
-
-        config['matchs'].append(match)
-
-        with open(file_name, 'w') as file:
-            file.write(json.dumps(config, sort_keys=False, indent=4))
+        Loader.write_match(self.steps, self.social_assets_manager.social_assets_markers, generator, file_name)
 
     def connect_agent(self, token):
         return self.agents_manager.connect(token)
@@ -160,33 +226,37 @@ class Cycle:
 
     def get_step(self):
         events = []
-        for step in self.steps[:(self.current_step+1)]:
-            if step['flood']:
-                if step['flood'].active:
-                    events.append(step['flood'])
+        for step in self.steps.until(self.current_step + 1):
+            if step['flood'].active:
+                events.append(step['flood'])
 
-                    for victim in step['victims']:
-                        if victim.active:
-                            events.append(victim)
+                for victim in step['victims']:
+                    if victim.active:
+                        events.append(victim)
 
-                    for photo in step['photos']:
-                        if photo.active:
-                            events.append(photo)
+                for photo in step['photos']:
+                    if photo.active:
+                        events.append(photo)
 
-                    for water_sample in step['water_samples']:
-                        if water_sample.active:
-                            events.append(water_sample)
+                for water_sample in step['water_samples']:
+                    if water_sample.active:
+                        events.append(water_sample)
 
         return events
 
+    def perceive(self, events):
+        """Select the events perceived by the active agents of the roles with a perception radius.
+
+        :param events: The active events of the step, as returned by get_step.
+        :return dict: Dictionary with the token of the agent as key and the events it perceives."""
+
+        return self.perception.perceive(self.agents_manager.get_active_info(), events)
+
     def get_previous_steps(self):
         previous_steps = []
-        for i in range(self.current_step):
-            if self.steps[i]['flood'] is None:
-                continue
-
-            if self.steps[i]['flood'].active:
-                previous_steps.append(self.steps[i])
+        for step in self.steps.until(self.current_step):
+            if step['flood'].active:
+                previous_steps.append(step)
 
         return previous_steps
 
@@ -209,29 +279,29 @@ class Cycle:
         return self.current_step == self.max_steps
 
     def update_steps(self):
-        for i in range(self.current_step):
-            if self.steps[i]['flood'] is None:
-                continue
-            
-            if self.steps[i]['propagation']:
-                new_victims = self.steps[i]['propagation'].pop(0)
+        if self.entity_store is not None:
+            return self.update_stored_steps()
+
+        for step in self.steps.until(self.current_step):
+            if step['propagation']:
+                new_victims = step['propagation'].pop(0)
                 for victim in new_victims:
                     victim.active = True
 
-                self.steps[i]['victims'].extend(new_victims)
+                step['victims'].extend(new_victims)
 
-            if self.steps[i]['flood'].keeped:
-                self.steps[i]['flood'].update_state()
+            if step['flood'].keeped:
+                step['flood'].update_state()
 
-                if self.steps[i]['flood'].active:
+                if step['flood'].active:
                     finished = True
 
-                    for victim in self.steps[i]['victims']:
+                    for victim in step['victims']:
                         if victim.active:
                             finished = False
                             victim.lifetime -= 1
 
-                    for photo in self.steps[i]['photos']:
+                    for photo in step['photos']:
                         if photo.active:
                             finished = False
 
@@ -243,40 +313,65 @@ class Cycle:
                             elif not photo.analyzed:
                                 finished = False
 
-                    for water_sample in self.steps[i]['water_samples']:
+                    for water_sample in step['water_samples']:
                         if water_sample.active:
                             finished = False
                             break
 
                     if finished:
-                        self.steps[i]['flood'].active = False
+                        step['flood'].active = False
 
-            elif self.steps[i]['flood'].active:
-                self.steps[i]['flood'].update_state()
+            elif step['flood'].active:
+                step['flood'].update_state()
 
-                if not self.steps[i]['flood'].active:
-                    for victim in self.steps[i]['victims']:
+                if not step['flood'].active:
+                    for victim in step['victims']:
                         victim.active = False
 
-                    for water_sample in self.steps[i]['water_samples']:
+                    for water_sample in step['water_samples']:
                         water_sample.active = False
 
-                    for photo in self.steps[i]['photos']:
+                    for photo in step['photos']:
                         photo.active = False
 
                         for victim in photo.victims:
                             victim.active = False
 
                 else:
-                    for victim in self.steps[i]['victims']:
+                    for victim in step['victims']:
                         if victim.active:
                             victim.lifetime -= 1
 
-                    for photo in self.steps[i]['photos']:
+                    for photo in step['photos']:
                         for victim in photo.victims:
                             if victim.active:
                                 victim.lifetime -= 1
 
+    def update_stored_steps(self):
+        """Update the steps as update_steps does, with the victims and the tasks of all the floods updated at once on
+        the entity store."""
+
+        ended_floods = []
+        active_floods = []
+        for step in self.steps.until(self.current_step):
+            if step['propagation']:
+                new_victims = step['propagation'].pop(0)
+                for victim in new_victims:
+                    victim.active = True
+
+                step['victims'].extend(new_victims)
+
+            if step['flood'].active:
+                step['flood'].update_state()
+
+                if step['flood'].active:
+                    active_floods.append(step['flood'].id)
+                else:
+                    ended_floods.append(step['flood'].id)
+
+        self.entity_store.deactivate_floods(ended_floods)
+        self.entity_store.age_victims(active_floods)
+
     def finish_social_assets_connections(self, tokens):
         result = []
 
@@ -298,14 +393,15 @@ class Cycle:
         events = []
         # tasks = {k:v for (k,v) in self.steps if k == 'water_sample' and len(v) > 0}
         tasks = {}
-        tasks['water_samples'] = [w for e in self.steps for w in e['water_samples'] if w.active]
-        tasks['victims'] = [w for e in self.steps for w in e['victims'] if w.active]
-        tasks['photos'] = [w for e in self.steps for w in e['photos'] if w.active]
+        reached_steps = list(self.steps.until(self.current_step + 1))
+        tasks['water_samples'] = [w for e in reached_steps for w in e['water_samples'] if w.active]
+        tasks['victims'] = [w for e in reached_steps for w in e['victims'] if w.active]
+        tasks['photos'] = [w for e in reached_steps for w in e['photos'] if w.active]
         # tasks['water_samples'] = ((w for w in e['water_samples'] if not w.active) for e in self.steps )
-        for i in range(self.current_step+1):
-            if self.steps[i]['flood'] and self.steps[i]['flood'].active:
-                nodes.extend(self.steps[i]['flood'].nodes)
-                events.append(self.steps[i]['flood'].dimension)
+        for step in self.steps.until(self.current_step + 1):
+            if step['flood'].active:
+                nodes.extend(step['flood'].nodes)
+                events.append(step['flood'].dimension)
         
         for token_action_param in token_action_dict:
             token, action, parameters = token_action_param.values()
@@ -364,10 +460,10 @@ class Cycle:
             nodes = []
             events = []
 
-            for i in range(self.current_step):
-                if self.steps[i]['flood'] and self.steps[i]['flood'].active:
-                    nodes.extend(self.steps[i]['flood'].list_of_nodes)
-                    events.append(self.steps[i]['flood'].dimensions)
+            for step in self.steps.until(self.current_step):
+                if step['flood'].active:
+                    nodes.extend(step['flood'].list_of_nodes)
+                    events.append(step['flood'].dimensions)
 
             result, route, distance = self.map.get_route(start, end, [parameters[4]], parameters[5], nodes, events)
 
@@ -0,0 +1,345 @@
+"""This module keeps the hot attributes of the agents and of the tasks (victims, photos and water samples) in NumPy
+arrays, one array by attribute, so the bookkeeping done on every step is reduced to vectorised operations.
+
+The simulation objects keep their API: the stored classes are subclasses where the columnar attributes are thin views
+over one row of the arrays. NumPy is optional, when it is not installed the store is not available and every attribute
+stays on the objects themselves."""
+
+import copy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from simulation_engine.simulation_objects.agent import Agent
+from simulation_engine.simulation_objects.social_asset import SocialAsset
+from simulation_engine.simulation_objects.victim import Victim
+from simulation_engine.simulation_objects.photo import Photo
+from simulation_engine.simulation_objects.water_sample import WaterSample
+
+AGENT, SOCIAL_ASSET = 0, 1
+VICTIM, PHOTO, WATER_SAMPLE = 0, 1, 2
+
+
+def available() -> bool:
+    """Check if the store can be used.
+
+    :return bool: True if NumPy is installed else False."""
+
+    return numpy is not None
+
+
+class Table:
+    """Class that holds the arrays of one kind of entity, each row being one object."""
+
+    def __init__(self, columns: dict, capacity: int = 64):
+        self.capacity = capacity
+        self.size = 0
+        self.objects = []
+        self.columns = {name: numpy.zeros((capacity, *shape), dtype=dtype) for name, (dtype, shape) in columns.items()}
+
+    def add(self, obj) -> int:
+        """Reserve a new row for the object, growing the arrays when they are full.
+
+        :param obj: The object that will be viewed over the row.
+        :return int: The index of the row."""
+
+        if self.size == self.capacity:
+            self.capacity *= 2
+            for name, column in self.columns.items():
+                grown = numpy.zeros((self.capacity, *column.shape[1:]), dtype=column.dtype)
+                grown[:self.size] = column
+                self.columns[name] = grown
+
+        self.objects.append(obj)
+        self.size += 1
+
+        return self.size - 1
+
+    def get(self, name):
+        """Return the used part of a column.
+
+        :param name: The name of the column.
+        :return numpy.ndarray: View over the rows already reserved."""
+
+        return self.columns[name][:self.size]
+
+    def select(self, mask) -> list:
+        """Return the objects of the rows selected by the mask.
+
+        :param mask: Boolean array with one position for each row.
+        :return list: The objects in the order they were added."""
+
+        return [self.objects[row] for row in numpy.flatnonzero(mask)]
+
+    def clear(self):
+        """Release all the rows, keeping the allocated arrays."""
+
+        self.size = 0
+        self.objects.clear()
+
+
+class Column:
+    """Descriptor that gives access to one position of a column, used in place of the slot of the object."""
+
+    def __init__(self, table: str, name: str, vector: bool = False):
+        self.table = table
+        self.name = name
+        self.vector = vector
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = getattr(instance.store, self.table).columns[self.name][instance.store_row]
+        if self.vector:
+            return tuple(value.tolist())
+
+        return value.item()
+
+    def __set__(self, instance, value):
+        getattr(instance.store, self.table).columns[self.name][instance.store_row] = value
+
+
+class Stored:
+    """Behaviour shared by all the stored classes.
+
+    A copy of a stored object is detached from the store, so the snapshots taken of the simulation objects are not
+    changed by the next steps."""
+
+    __slots__ = ()
+    base_class: type = object
+
+    def __deepcopy__(self, memo):
+        clone = self.base_class.__new__(self.base_class)
+        memo[id(self)] = clone
+        for field in self.base_class.__slots__:
+            setattr(clone, field, copy.deepcopy(getattr(self, field), memo))
+
+        return clone
+
+
+class StoredAgent(Stored, Agent):
+    __slots__ = ('store', 'store_row')
+    base_class = Agent
+    location = Column('agents', 'location', vector=True)
+    is_active = Column('agents', 'active')
+    max_charge = Column('agents', 'max_charge')
+    actual_battery = Column('agents', 'battery')
+    battery_by_movement = Column('agents', 'battery_by_movement')
+
+    def __init__(self, store, *args, **kwargs):
+        self.store = store
+        self.store_row = store.agents.add(self)
+        store.agents.columns['kind'][self.store_row] = AGENT
+        super(StoredAgent, self).__init__(*args, **kwargs)
+
+
+class StoredSocialAsset(Stored, SocialAsset):
+    __slots__ = ('store', 'store_row')
+    base_class = SocialAsset
+    location = Column('agents', 'location', vector=True)
+    is_active = Column('agents', 'active')
+
+    def __init__(self, store, *args, **kwargs):
+        self.store = store
+        self.store_row = store.agents.add(self)
+        store.agents.columns['kind'][self.store_row] = SOCIAL_ASSET
+        super(StoredSocialAsset, self).__init__(*args, **kwargs)
+
+
+class StoredVictim(Stored, Victim):
+    __slots__ = ('store', 'store_row')
+    base_class = Victim
+    location = Column('tasks', 'location', vector=True)
+    active = Column('tasks', 'active')
+    flood_id = Column('tasks', 'flood_id')
+    lifetime = Column('tasks', 'lifetime')
+    in_photo = Column('tasks', 'in_photo')
+
+    def __init__(self, store, *args, **kwargs):
+        self.store = store
+        self.store_row = store.tasks.add(self)
+        store.tasks.columns['kind'][self.store_row] = VICTIM
+        super(StoredVictim, self).__init__(*args, **kwargs)
+
+
+class StoredPhoto(Stored, Photo):
+    __slots__ = ('store', 'store_row')
+    base_class = Photo
+    location = Column('tasks', 'location', vector=True)
+    active = Column('tasks', 'active')
+    flood_id = Column('tasks', 'flood_id')
+
+    def __init__(self, store, *args, **kwargs):
+        self.store = store
+        self.store_row = store.tasks.add(self)
+        store.tasks.columns['kind'][self.store_row] = PHOTO
+        super(StoredPhoto, self).__init__(*args, **kwargs)
+
+
+class StoredWaterSample(Stored, WaterSample):
+    __slots__ = ('store', 'store_row')
+    base_class = WaterSample
+    location = Column('tasks', 'location', vector=True)
+    active = Column('tasks', 'active')
+    flood_id = Column('tasks', 'flood_id')
+
+    def __init__(self, store, *args, **kwargs):
+        self.store = store
+        self.store_row = store.tasks.add(self)
+        store.tasks.columns['kind'][self.store_row] = WATER_SAMPLE
+        super(StoredWaterSample, self).__init__(*args, **kwargs)
+
+
+class EntityStore:
+    """Class that holds the columns of the agents, social assets and tasks of one match."""
+
+    def __init__(self):
+        self.agents = Table({'kind': (numpy.int8, ()),
+                             'location': (numpy.float64, (2,)),
+                             'active': (numpy.bool_, ()),
+                             'max_charge': (numpy.int64, ()),
+                             'battery': (numpy.int64, ()),
+                             'battery_by_movement': (numpy.int64, ())})
+
+        self.tasks = Table({'kind': (numpy.int8, ()),
+                            'location': (numpy.float64, (2,)),
+                            'active': (numpy.bool_, ()),
+                            'flood_id': (numpy.int64, ()),
+                            'lifetime': (numpy.int64, ()),
+                            'in_photo': (numpy.bool_, ())})
+
+    def clear(self):
+        """Release all the rows, used when the match is restarted."""
+
+        self.agents.clear()
+        self.tasks.clear()
+
+    def new_agent(self, *args, **kwargs):
+        """Create an agent viewed over a new row, receiving the same arguments as Agent."""
+
+        return StoredAgent(self, *args, **kwargs)
+
+    def new_social_asset(self, *args, **kwargs):
+        """Create a social asset viewed over a new row, receiving the same arguments as SocialAsset."""
+
+        return StoredSocialAsset(self, *args, **kwargs)
+
+    def attach_steps(self, steps):
+        """Replace the tasks of the generated steps by stored ones, also for the steps generated later.
+
+        :param steps: The steps created by the generator or the loader.
+        :return Steps: The same steps, now holding only stored tasks."""
+
+        steps.watch(self.attach_step)
+
+        return steps
+
+    def attach_step(self, step: dict):
+        step['victims'] = [self.attach_victim(victim) for victim in step['victims']]
+        step['water_samples'] = [self.attach_water_sample(sample) for sample in step['water_samples']]
+        step['photos'] = [self.attach_photo(photo) for photo in step['photos']]
+        step['propagation'] = [[self.attach_victim(victim) for victim in victims] for victims in step['propagation']]
+
+    def attach_victim(self, victim):
+        stored = StoredVictim(self, victim.flood_id, victim.identifier, victim.size, victim.lifetime,
+                              victim.location, victim.in_photo)
+        stored.active = victim.active
+
+        return stored
+
+    def attach_photo(self, photo):
+        stored = StoredPhoto(self, photo.flood_id, photo.identifier, photo.size, photo.location,
+                             [self.attach_victim(victim) for victim in photo.victims])
+        stored.active = photo.active
+        stored.analyzed = photo.analyzed
+
+        return stored
+
+    def attach_water_sample(self, water_sample):
+        stored = StoredWaterSample(self, water_sample.flood_id, water_sample.identifier, water_sample.size,
+                                   water_sample.location)
+        stored.active = water_sample.active
+
+        return stored
+
+    def proximity(self, proximity: float):
+        """Check which tasks are close to each agent, in the same way as Map.check_location.
+
+        :param proximity: The distance, in degrees, to consider two locations at the same place.
+        :return numpy.ndarray: Boolean matrix with one line by agent row and one column by task row, inactive agents
+        and inactive tasks are never close."""
+
+        agents = self.agents.get('location')
+        tasks = self.tasks.get('location')
+        close = numpy.all(numpy.abs(agents[:, None, :] - tasks[None, :, :]) <= proximity, axis=2)
+
+        return close & self.agents.get('active')[:, None] & self.tasks.get('active')[None, :]
+
+    def at_location(self, location, proximity: float) -> list:
+        """Return the active agents and social assets at the location, as the ones at the CDM.
+
+        :param location: The location to check.
+        :param proximity: The distance, in degrees, to consider two locations at the same place.
+        :return list: The objects that are at the location."""
+
+        close = numpy.all(numpy.abs(self.agents.get('location') - numpy.asarray(location)) <= proximity, axis=1)
+
+        return self.agents.select(close & self.agents.get('active'))
+
+    def discharge(self, rows=None):
+        """Discharge the battery of the agents as Agent.discharge does, all at once.
+
+        :param rows: The rows of the agents that will be discharged, all the agents if None."""
+
+        if rows is None:
+            rows = numpy.flatnonzero(self.agents.get('kind') == AGENT)
+
+        battery = self.agents.columns['battery']
+        battery[rows] = numpy.maximum(battery[rows] - self.agents.columns['battery_by_movement'][rows], 0)
+
+    def active_tasks(self, kind: int) -> list:
+        """Return the active tasks of the given kind.
+
+        :param kind: One of VICTIM, PHOTO or WATER_SAMPLE.
+        :return list: The active tasks in the order they were added."""
+
+        return self.tasks.select((self.tasks.get('kind') == kind) & self.tasks.get('active'))
+
+    def deactivate_floods(self, floods_ids: list):
+        """Deactivate all the tasks of the floods that have ended.
+
+        :param floods_ids: Identifiers of the ended floods."""
+
+        if floods_ids:
+            self.tasks.get('active')[numpy.isin(self.tasks.get('flood_id'), floods_ids)] = False
+
+    def age_victims(self, floods_ids: list):
+        """Decrease the lifetime of the active victims of the floods still going on.
+
+        The victims found in a photo are also listed in the step of the flood once analysed, so they are aged twice,
+        the same as iterating over the steps and the photos.
+
+        :param floods_ids: Identifiers of the active floods."""
+
+        if not floods_ids:
+            return
+
+        victims = (self.tasks.get('kind') == VICTIM) & self.tasks.get('active')
+        victims &= numpy.isin(self.tasks.get('flood_id'), floods_ids)
+        lifetime = self.tasks.get('lifetime')
+        lifetime[victims] -= 1 + self.tasks.get('in_photo')[victims]
+
+    def victims_dead_ignored(self) -> int:
+        """Count the active victims that are already dead, the same way Simulation.log does over the steps.
+
+        :return int: Amount of dead victims that were not rescued."""
+
+        victims = (self.tasks.get('kind') == VICTIM) & self.tasks.get('active')
+        lifetime = self.tasks.get('lifetime')
+        in_photo = self.tasks.get('in_photo')
+
+        return int(numpy.count_nonzero(victims & (lifetime <= 0))
+                   + numpy.count_nonzero(victims & in_photo & (lifetime == 0)))
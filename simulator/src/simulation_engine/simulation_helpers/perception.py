@@ -0,0 +1,110 @@
+"""This module limits the events perceived by the agents to the ones around them.
+
+The roles with a perceptionRadius on the configuration file only perceive the floods that reach their radius and the
+victims, photos and water samples inside it, plus every event they perceived before while it is still active. The
+events of the step are indexed once on a grid with cells as large as the largest radius, so each agent only checks
+the events of the cells around it and the cost of a step follows the density around the agents instead of the size of
+the scenario. The roles without a radius keep perceiving every event."""
+
+import math
+
+measure_unit = 100000
+
+
+class Perception:
+    """Class that selects the events perceived by each agent."""
+
+    def __init__(self, roles_info: dict):
+        self.radius: dict = {}
+        self.cell: float = 0
+        self.known: dict = {}
+        self.restart(roles_info)
+
+    def restart(self, roles_info: dict):
+        """Read the radius of the roles again and forget the events perceived on the previous match.
+
+        :param roles_info: The agents section of the configuration file."""
+
+        self.radius = {role: info['perceptionRadius'] / measure_unit for role, info in roles_info.items()
+                       if info.get('perceptionRadius') is not None}
+        self.cell = max(self.radius.values(), default=0)
+        self.known.clear()
+
+    def enabled(self) -> bool:
+        return bool(self.radius)
+
+    def cell_of(self, location) -> tuple:
+        return math.floor(location[0] / self.cell), math.floor(location[1] / self.cell)
+
+    def index(self, events: list) -> tuple:
+        """Split the events of the step in the floods and the grid with the other events.
+
+        :param events: The active events of the step, as returned by Cycle.get_step.
+        :return tuple: The list of floods and the dictionary with the cell as key and the events inside it."""
+
+        floods = []
+        grid = {}
+        for event in events:
+            if event.type == 'flood':
+                floods.append(event)
+            else:
+                grid.setdefault(self.cell_of(event.location), []).append(event)
+
+        return floods, grid
+
+    @staticmethod
+    def flood_reach(flood) -> float:
+        dimension = flood.dimension
+        return dimension.get('radius', max(dimension.get('height', 0), dimension.get('length', 0)))
+
+    def around(self, location, radius: float, floods: list, grid: dict) -> set:
+        """Find the events around the location.
+
+        :param location: The location of the agent.
+        :param radius: The perception radius of the agent.
+        :param floods: The floods of the step.
+        :param grid: The grid with the other events of the step.
+        :return set: The events inside the radius."""
+
+        lat, lon = location
+        perceived = {flood for flood in floods
+                     if math.hypot(lat - flood.dimension['location'][0], lon - flood.dimension['location'][1])
+                     <= radius + self.flood_reach(flood)}
+
+        min_x, min_y = self.cell_of((lat - radius, lon - radius))
+        max_x, max_y = self.cell_of((lat + radius, lon + radius))
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                for event in grid.get((x, y), ()):
+                    if math.hypot(lat - event.location[0], lon - event.location[1]) <= radius:
+                        perceived.add(event)
+
+        return perceived
+
+    def perceive(self, agents: list, events: list) -> dict:
+        """Select the events perceived by each agent of a role with a radius.
+
+        :param agents: The agents of the simulation.
+        :param events: The active events of the step, as returned by Cycle.get_step.
+        :return dict: Dictionary with the token of the agent as key and its events, in the same order of the events
+        of the step."""
+
+        if not self.radius:
+            return {}
+
+        floods, grid = self.index(events)
+        active = set(events)
+
+        perceived = {}
+        for agent in agents:
+            radius = self.radius.get(agent.role)
+            if radius is None:
+                continue
+
+            known = self.known.get(agent.token, set()) & active
+            known |= self.around(agent.location, radius, floods, grid)
+            self.known[agent.token] = known
+
+            perceived[agent.token] = [event for event in events if event in known]
+
+        return perceived
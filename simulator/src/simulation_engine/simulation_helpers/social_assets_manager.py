@@ -1,6 +1,7 @@
 import random
 from collections import namedtuple
 from simulation_engine.simulation_objects.social_asset import SocialAsset
+from simulation_engine.simulation_helpers.capabilities import compile_mask
 
 
 Capacities = namedtuple('Capacities', 'abilities resources location profession size speed physical_capacity virtual_capacity')
@@ -9,13 +10,15 @@ Capacities = namedtuple('Capacities', 'abilities resources location profession s
 class SocialAssetsManager:
     """Class that will handle all the changes on the social assets inside the engine."""
 
-    def __init__(self, map_info, social_assets_info, social_assets_markers):
+    def __init__(self, map_info, social_assets_info, social_assets_markers, entity_store=None):
         self.social_assets = {}
         self.social_assets_markers = social_assets_markers
         self.cdm_location = [map_info['maps'][0]['centerLat'], map_info['maps'][0]['centerLon']]
         random.seed(map_info['randomSeed'])
         self.requests = {}
         self.social_assets_info = social_assets_info
+        self.professions_masks = self.generate_professions_masks(social_assets_info)
+        self.new_social_asset = entity_store.new_social_asset if entity_store is not None else SocialAsset
 
     def restart(self, map_info, social_assets_info, social_assets_markers):
         self.social_assets.clear()
@@ -24,6 +27,17 @@ class SocialAssetsManager:
         random.seed(map_info['randomSeed'])
         self.requests.clear()
         self.social_assets_info = social_assets_info
+        self.professions_masks = self.generate_professions_masks(social_assets_info)
+
+    @staticmethod
+    def generate_professions_masks(social_assets_info):
+        """Compile the abilities and resources of each profession into bitmasks.
+
+        :param social_assets_info: The information of the available professions (doctor, nurse, teacher).
+        :return dict: Dictionary with the profession as key and a tuple with the abilities and resources masks."""
+
+        return {profession: (compile_mask(info['abilities']), compile_mask(info['resources']))
+                for profession, info in social_assets_info.items()}
 
     def connect(self, token, id, profession):
         abilities = self.social_assets_info[profession]['abilities']
@@ -35,8 +49,11 @@ class SocialAssetsManager:
         physical_capacity = self.social_assets_info[profession]['physicalCapacity']
         virtual_capacity = self.social_assets_info[profession]['virtualCapacity']
 
-        social_asset = SocialAsset(id, token, abilities, resources, location,
-                                   profession, size, speed, physical_capacity, virtual_capacity)
+        abilities_mask, resources_mask = self.professions_masks[profession]
+
+        social_asset = self.new_social_asset(id, token, abilities, resources, location,
+                                             profession, size, speed, physical_capacity, virtual_capacity,
+                                             abilities_mask, resources_mask)
 
         self.social_assets[token] = social_asset
 
@@ -0,0 +1,99 @@
+import bisect
+from types import MappingProxyType
+
+
+class Steps:
+    """Class that holds the steps of a match, only the steps with a flood are stored.
+
+    Indexing a step without a flood returns a read only empty step, so the steps can still be accessed by their
+    number, while iterating goes only through the steps with a flood, in order."""
+
+    __slots__ = ('amount', 'events', 'indexes', 'watchers')
+    empty = MappingProxyType({'step': -1, 'flood': None, 'victims': (), 'water_samples': (), 'photos': (),
+                              'propagation': ()})
+
+    def __init__(self, amount: int):
+        self.amount: int = amount
+        self.events: dict = {}
+        self.indexes: list = []
+        self.watchers: list = []
+
+    def __len__(self):
+        return self.amount
+
+    def __getitem__(self, step: int):
+        if not 0 <= step < self.amount:
+            raise IndexError(f'Step {step} out of range.')
+
+        return self.events.get(step, self.empty)
+
+    def __setitem__(self, step: int, event: dict):
+        if not 0 <= step < self.amount:
+            raise IndexError(f'Step {step} out of range.')
+
+        if step not in self.events:
+            bisect.insort(self.indexes, step)
+
+        self.events[step] = event
+        for watcher in self.watchers:
+            watcher(event)
+
+    def __iter__(self):
+        return (self.events[step] for step in self.indexes)
+
+    def until(self, stop: int):
+        """Iterate over the steps with a flood before the given step.
+
+        :param stop: The first step that will not be returned.
+        :return generator: The steps in order."""
+
+        return (self.events[step] for step in self.indexes[:bisect.bisect_left(self.indexes, stop)])
+
+    def watch(self, watcher):
+        """Call the watcher with every step with a flood, the ones already stored and the ones stored later.
+
+        :param watcher: Function that receives the dictionary of the step."""
+
+        for step in self.indexes:
+            watcher(self.events[step])
+
+        self.watchers.append(watcher)
+
+
+class LazySteps(Steps):
+    """Class that holds the steps of a match generating them only when they are about to be reached.
+
+    Accessing a step generates, in order, all the steps until the lookahead after it."""
+
+    __slots__ = ('generate', 'lookahead', 'generated')
+
+    def __init__(self, amount: int, generate, lookahead: int):
+        super(LazySteps, self).__init__(amount)
+        self.generate = generate
+        self.lookahead: int = lookahead
+        self.generated: int = 0
+
+    def extend(self, step: int):
+        """Generate the steps until the lookahead after the given step.
+
+        :param step: The step that will be accessed."""
+
+        stop = min(step + self.lookahead + 1, self.amount)
+        while self.generated < stop:
+            event = self.generate(self.generated)
+            if event is not None:
+                self[self.generated] = event
+
+            self.generated += 1
+
+    def __getitem__(self, step: int):
+        self.extend(step)
+        return super(LazySteps, self).__getitem__(step)
+
+    def __iter__(self):
+        self.extend(self.amount)
+        return super(LazySteps, self).__iter__()
+
+    def until(self, stop: int):
+        self.extend(stop - 1)
+        return super(LazySteps, self).until(stop)
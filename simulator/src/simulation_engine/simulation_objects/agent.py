@@ -1,13 +1,21 @@
 from simulation_engine.exceptions.exceptions import *
+from simulation_engine.simulation_helpers.capabilities import compile_mask
 import copy
 
 class Agent:
     """Class that represents the Agent inside the simulation."""
 
+    __slots__ = ('token', 'is_active', 'carried', 'min_size', 'location', 'last_action', 'last_action_result', 'role',
+                 'abilities', 'resources', 'abilities_mask', 'resources_mask', 'max_charge', 'actual_battery',
+                 'battery_by_movement', 'speed', 'route', 'destination_distance', 'physical_capacity',
+                 'physical_storage', 'physical_storage_vector', 'virtual_capacity', 'virtual_storage',
+                 'virtual_storage_vector', 'social_assets')
+    type: str = 'agent'
+
     def __init__(self, token, cdm_location, abilities, resources, size,
-                 role_name, battery, battery_by_movement, speed, physical_capacity, virtual_capacity):
+                 role_name, battery, battery_by_movement, speed, physical_capacity, virtual_capacity,
+                 abilities_mask=None, resources_mask=None):
         self.token = token
-        self.type = 'agent'
         self.is_active = True
         self.carried = False
         self.min_size = size
@@ -17,6 +25,8 @@ class Agent:
         self.role = role_name
         self.abilities = abilities
         self.resources = resources
+        self.abilities_mask = abilities_mask if abilities_mask is not None else compile_mask(abilities)
+        self.resources_mask = resources_mask if resources_mask is not None else compile_mask(resources)
         self.max_charge = battery
         self.actual_battery = battery
         self.battery_by_movement = battery_by_movement
@@ -209,4 +219,4 @@ class Agent:
         self.social_assets.clear()
 
     def __repr__(self):
-        return str(self.__dict__.copy())
+        return str({'type': self.type, **{field: getattr(self, field) for field in Agent.__slots__}})
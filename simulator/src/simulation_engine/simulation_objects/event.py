@@ -5,9 +5,12 @@ from .victim import Victim
 class Event(object):
     __metaclass__ = ABCMeta
 
+    __slots__ = ('active', 'id', 'step', 'end', 'dimension', 'nodes', 'propagation', 'keeped', 'percept')
+    dict_fields = ('type', 'id', 'step', 'end', 'dimension', 'propagation')
+    type: str = 'flood'
+
     def __init__(self, id:int, step:int, end: int, dimension: dict, propagation: dict,  **kwargs):
         self.active: bool = False
-        self.type: str = 'flood'
         self.id = id
         self.step = step
         self.end: int = end
@@ -20,6 +23,7 @@ class Event(object):
             self.propagation = Propagation(0,0)
 
         self.keeped = False
+        self.percept = None
     
     def update_state(self, current_step):
         self.__active = self.expires <= current_step
@@ -28,11 +32,11 @@ class Event(object):
             self.list_of_nodes.extend(propagates(self))
     
     def activate(self):
-        self.__active = True
+        self.active = True
     def deactivate(self):
-        self.__active = False
+        self.active = False
     def is_activated(self):
-        return self.__active
+        return self.active
     
     def affect_map(self, map, generator):
         self.nodes = generator.get_nodes(self.dimension['location'], self.dimension['shape'],self.dimension['radius'],map)
@@ -52,11 +56,7 @@ class Event(object):
         return self.step <= other.step
 
     def dict(self):
-        event = self.__dict__.copy()
-        del event['active']
-        del event['keeped']
-        del event['nodes']
-        return event
+        return {field: getattr(self, field) for field in self.dict_fields}
 
     def to_json(self):
         return json.dumps(self.dict(),default=lambda o: o.__dict__)
@@ -3,22 +3,22 @@ import json
 class Photo:
     """Class that represents a photo event inside the simulation."""
 
+    __slots__ = ('flood_id', 'identifier', 'active', 'size', 'location', 'victims', 'analyzed', 'percept')
+    dict_fields = ('flood_id', 'identifier', 'size', 'location', 'victims')
+    type: str = 'photo'
+
     def __init__(self, flood_id: int, identifier: int, size: int, location: tuple, victims: list, **kwargs):
         self.flood_id: int = flood_id
         self.identifier: int = identifier
         self.active: bool = False
-        self.type: str = 'photo'
         self.size: int = size
         self.location: tuple = location
         self.victims: list = victims
         self.analyzed: bool = False
+        self.percept = None
     
     def dict(self):
-        photo = self.__dict__.copy()
-        del photo['active']
-        del photo['type']
-        del photo['analyzed']
-        return photo
+        return {field: getattr(self, field) for field in self.dict_fields}
 
     def to_json(self):
         return json.dumps(self.dict())
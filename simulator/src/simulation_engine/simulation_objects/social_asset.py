@@ -1,13 +1,21 @@
 from simulation_engine.exceptions.exceptions import *
+from simulation_engine.simulation_helpers.capabilities import compile_mask
 
 
 class SocialAsset:
     """Class that represents the SocialAsset inside the simulation."""
 
-    def __init__(self, identifier, token, abilities, resources, location, profession, size, speed, physical_capacity, virtual_capacity):
+    __slots__ = ('identifier', 'token', 'is_active', 'carried', 'min_size', 'location', 'last_action',
+                 'last_action_result', 'profession', 'abilities', 'resources', 'abilities_mask', 'resources_mask',
+                 'speed', 'route', 'destination_distance', 'physical_capacity', 'physical_storage',
+                 'physical_storage_vector', 'virtual_capacity', 'virtual_storage', 'virtual_storage_vector',
+                 'social_assets')
+    type: str = 'social_asset'
+
+    def __init__(self, identifier, token, abilities, resources, location, profession, size, speed, physical_capacity, virtual_capacity,
+                 abilities_mask=None, resources_mask=None):
         self.identifier = identifier
         self.token = token
-        self.type = 'social_asset'
         self.is_active = True
         self.carried = False
         self.min_size = size
@@ -17,6 +25,8 @@ class SocialAsset:
         self.profession = profession
         self.abilities = abilities
         self.resources = resources
+        self.abilities_mask = abilities_mask if abilities_mask is not None else compile_mask(abilities)
+        self.resources_mask = resources_mask if resources_mask is not None else compile_mask(resources)
         self.speed = speed
         self.route = []
         self.destination_distance = 0
@@ -191,4 +201,4 @@ class SocialAsset:
         self.is_active = False
 
     def __repr__(self):
-        return str(self.__dict__.copy())
+        return str({'type': self.type, **{field: getattr(self, field) for field in SocialAsset.__slots__}})
@@ -1,4 +1,6 @@
 class SocialAssetMarker:
+    __slots__ = ('identifier', 'location', 'profession', 'abilities', 'resources', 'active')
+
     def __init__(self, identifier: int, location: tuple, profession: str, abilities: list, resources: list):
         self.identifier: int = identifier
         self.location: tuple = location
@@ -8,4 +10,4 @@ class SocialAssetMarker:
         self.active: bool = True
 
     def __repr__(self):
-        return str(self.__dict__)
+        return str({field: getattr(self, field) for field in self.__slots__})
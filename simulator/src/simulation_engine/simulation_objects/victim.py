@@ -3,8 +3,11 @@ import json
 class Victim:
     """Class that represents a victim inside the simulation."""
 
+    __slots__ = ('active', 'flood_id', 'identifier', 'size', 'location', 'lifetime', 'in_photo', 'percept')
+    dict_fields = ('flood_id', 'identifier', 'size', 'location', 'lifetime', 'in_photo')
+    type: str = 'victim'
+
     def __init__(self, flood_id: int, identifier: int, size: int, lifetime: int, location: tuple, photo: bool, **kwargs):
-        self.type: str = 'victim'
         self.active: bool = False
         self.flood_id: int = flood_id
         self.identifier: int = identifier
@@ -12,12 +15,10 @@ class Victim:
         self.location: tuple = location
         self.lifetime: int = lifetime
         self.in_photo: bool = photo
+        self.percept = None
 
     def dict(self):
-        victim = self.__dict__.copy()
-        del victim['active']
-        del victim['type']
-        return victim
+        return {field: getattr(self, field) for field in self.dict_fields}
 
     def to_json(self):
         return json.dumps(self.dict())
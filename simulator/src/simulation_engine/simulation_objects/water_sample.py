@@ -1,19 +1,22 @@
+import json
+
 class WaterSample:
     """Class that represents a water sample inside the simulation."""
 
+    __slots__ = ('flood_id', 'identifier', 'active', 'size', 'location', 'percept')
+    dict_fields = ('flood_id', 'identifier', 'size', 'location')
+    type: str = 'water_sample'
+
     def __init__(self, flood_id: int, identifier: int, size: int, location: tuple, **kwargs):
         self.flood_id: int = flood_id
         self.identifier: int = identifier
         self.active: bool = False
-        self.type: str = 'water_sample'
         self.size: int = size
         self.location: tuple = location
+        self.percept = None
 
     def dict(self):
-        sample = self.__dict__.copy()
-        del sample['active']
-        del sample['type']
-        return sample
+        return {field: getattr(self, field) for field in self.dict_fields}
 
     def to_json(self):
         return json.dumps(self.dict())
@@ -33,6 +33,12 @@ class Parser:
         self.parser.add_argument('-load_sim', required=False, type=bool, default=False)
         self.parser.add_argument('-write_sim', required=False, type=bool, default=False)
         self.parser.add_argument('-secret', required=False, type=str, default='')
+        self.parser.add_argument('-ipc', required=False, type=str, default='http')
+        self.parser.add_argument('-http_timeout', required=False, type=int, default=0)
+        self.parser.add_argument('-http_retries', required=False, type=int, default=2)
+        self.parser.add_argument('-monitor_queue', required=False, type=int, default=100)
+        self.parser.add_argument('-monitor_policy', required=False, type=str, default='block')
+        self.parser.add_argument('-api_mode', required=False, type=str, default='sync')
 
     def check_arguments(self):
         """Check all the arguments to prevent wrong format.
@@ -103,6 +109,24 @@ class Parser:
         if str(args['write_sim']).lower() != 'true' and str(args['write_sim']).lower() != 'false':
             return 0, f'Invalid value for write_sim argument: "{args["write_sim"]}".'
 
+        if args['ipc'] != 'http' and args['ipc'] != 'unix':
+            return 0, f'Invalid option given to ipc argument: "{args["ipc"]}".'
+
+        if int(args['http_timeout']) < 0:
+            return 0, 'HTTP timeout can not be negative, use 0 to wait for the responses without a timeout.'
+
+        if int(args['http_retries']) < 0:
+            return 0, 'HTTP retries can not be negative.'
+
+        if int(args['monitor_queue']) < 1:
+            return 0, 'Monitor queue must hold at least one update.'
+
+        if args['monitor_policy'] != 'block' and args['monitor_policy'] != 'drop':
+            return 0, f'Invalid option given to monitor_policy argument: "{args["monitor_policy"]}".'
+
+        if args['api_mode'] != 'sync' and args['api_mode'] != 'async':
+            return 0, f'Invalid option given to api_mode argument: "{args["api_mode"]}".'
+
         return 1, 'Arguments ok.'
 
     def get_argument(self, arg):
@@ -153,7 +177,7 @@ class Parser:
         if args.url == 'localhost':
             args.url = '127.0.0.1'
 
-        return [args.conf, args.url, args.sp, args.ap, args.log, args.load_sim, args.write_sim, secret]
+        return [args.conf, args.url, args.sp, args.ap, args.log, args.load_sim, args.write_sim, secret, args.ipc]
 
     def get_api_arguments(self):
         """Return all the arguments necessary for the API.
@@ -170,7 +194,8 @@ class Parser:
         if args.url == 'localhost':
             args.url = '127.0.0.1'
 
-        return [args.url, args.ap, args.sp, args.mp, args.step_t, args.first_t, args.mtd, args.log, args.sa_timeout, secret]
+        return [args.url, args.ap, args.sp, args.mp, args.step_t, args.first_t, args.mtd, args.log, args.sa_timeout, secret, args.ipc,
+                args.http_timeout, args.http_retries, args.monitor_queue, args.monitor_policy]
 
     def get_arguments(self):
         """Return all the arguments.
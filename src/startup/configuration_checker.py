@@ -91,6 +91,7 @@ class Checker:
         :returns str: Appropriate message for the user understand his error."""
 
         keys = ['id', 'steps', 'maps', 'proximity', 'randomSeed', 'movementRestrictions']
+        optional_keys = ['entityStore', 'pregenerate', 'scenarioCache', 'scenarioFormat']
 
         map = json.load(open(self.config, 'r'))['map']
         for key in keys:
@@ -98,9 +99,25 @@ class Checker:
                 return 0, f'Map: {key} is missing.'
 
         for key in map:
-            if key not in keys:
+            if key not in keys and key not in optional_keys:
                 return 0, f'Map: Key {key} is not in the list of allowed keys.'
 
+        if not isinstance(map.get('entityStore', False), bool):
+            return 0, 'Map: EntityStore is not a valid type.'
+
+        if not isinstance(map.get('scenarioCache', True), bool):
+            return 0, 'Map: ScenarioCache is not a valid type.'
+
+        if map.get('scenarioFormat', 'json') not in ('json', 'binary'):
+            return 0, 'Map: ScenarioFormat must be either json or binary.'
+
+        if 'pregenerate' in map:
+            if not isinstance(map['pregenerate'], int):
+                return 0, 'Map: Pregenerate is not a valid type.'
+
+            if map['pregenerate'] < 0:
+                return 0, 'Map: Pregenerate can not be negative.'
+
         if not isinstance(map['id'], str) and not isinstance(map['id'], int):
             return 0, 'Map: ID is not a valid type.'
 
@@ -245,6 +262,7 @@ class Checker:
         keys = ['drone', 'car', 'boat']
         sub_keys = ['abilities', 'resources', 'size', 'amount', 'speed', 'physicalCapacity',
                     'virtualCapacity', 'battery', 'batteryByMovement']
+        optional_sub_keys = ['perceptionRadius', 'routeMode', 'routeWaypoints']
 
         agents = json.load(open(self.config, 'r'))['agents']
 
@@ -264,7 +282,7 @@ class Checker:
                     return 0, f'Agents: Sub key {sub_key} from {str(key).title()} is missing.'
 
             for sub_key in agents[key]:
-                if sub_key not in sub_keys:
+                if sub_key not in sub_keys and sub_key not in optional_sub_keys:
                     return 0, f'Agents: Sub key {sub_key} from {str(key).title()} is not int the list of allowed sub keys.'
 
             if not isinstance(agents[key]['abilities'], list):
@@ -294,6 +312,23 @@ class Checker:
             if not isinstance(agents[key]['batteryByMovement'], int):
                 return 0, f'Agents: Sub key Battery By Movement from {str(key).title()} is not a valid type.'
 
+            if 'perceptionRadius' in agents[key]:
+                if not isinstance(agents[key]['perceptionRadius'], (int, float)):
+                    return 0, f'Agents: Sub key Perception Radius from {str(key).title()} is not a valid type.'
+
+                if agents[key]['perceptionRadius'] <= 0:
+                    return 0, f'Agents: Sub key Perception Radius from {str(key).title()} must be positive.'
+
+            if agents[key].get('routeMode', 'full') not in ['full', 'next_k', 'none', 'polyline']:
+                return 0, f'Agents: Sub key Route Mode from {str(key).title()} is not full, next_k, none or polyline.'
+
+            if 'routeWaypoints' in agents[key]:
+                if not isinstance(agents[key]['routeWaypoints'], int):
+                    return 0, f'Agents: Sub key Route Waypoints from {str(key).title()} is not a valid type.'
+
+                if agents[key]['routeWaypoints'] < 1:
+                    return 0, f'Agents: Sub key Route Waypoints from {str(key).title()} must be positive.'
+
         return 1, 'Agents: Ok.'
 
     def test_actions_key(self):
@@ -331,6 +366,7 @@ class Checker:
         :returns str: Appropriate message for the user understand his error."""
 
         keys = ['flood', 'photo', 'victim', 'waterSample', 'socialAsset', 'step_unit']
+        optional_keys = ['seedByStep', 'lookahead', 'backend']
 
         generate = json.load(open(self.config, 'r'))['generate']
 
@@ -339,9 +375,22 @@ class Checker:
                 return 0, f'Generate: {key} is missing.'
 
         for key in generate:
-            if key not in keys:
+            if key not in keys and key not in optional_keys:
                 return 0, f'Generate: Key {key} is not in the list of allowed keys.'
 
+        if not isinstance(generate.get('seedByStep', False), bool):
+            return 0, 'Generate: SeedByStep is not a valid type.'
+
+        if generate.get('backend', 'random') not in ['random', 'numpy']:
+            return 0, 'Generate: Backend must be either "random" or "numpy".'
+
+        if 'lookahead' in generate:
+            if not isinstance(generate['lookahead'], int):
+                return 0, 'Generate: Lookahead is not a valid type.'
+
+            if generate['lookahead'] < 0:
+                return 0, 'Generate: Lookahead can not be negative.'
+
         if not isinstance(generate['flood'], dict):
             return 0, 'Generate: Flood is not a valid type.'
 
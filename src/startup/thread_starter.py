@@ -105,7 +105,10 @@ class Starter:
 
         Note that this method only returns when the processes end."""
 
-        api_path = os.getcwd() + '/masire/api.py'
+        if self.parser.get_argument('api_mode') == 'async':
+            api_path = os.getcwd() + '/masire/async_api.py'
+        else:
+            api_path = os.getcwd() + '/masire/api.py'
         api_process_arguments = (api_path, api_arguments, self.env_handler.venv_path, python_version)
         api_process = Process(target=self.start_api, args=api_process_arguments, daemon=True)
 
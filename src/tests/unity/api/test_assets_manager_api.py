@@ -37,10 +37,12 @@ def test_get_all():
 def test_get_actions():
     assert not manager.get_actions()
     manager.social_assets['token1'].worker = True
-    manager.social_assets['token1'].action_name = 'pass'
+    assert manager.post_action('token1', 'pass', [])
+    assert not manager.post_action('token1', 'move', [])
     actions = manager.get_actions()
     assert actions
     assert actions[0]['action'] == 'pass'
+    assert not manager.get_actions()
 
 
 def test_get_workers():
@@ -0,0 +1,197 @@
+import sys
+import json
+import socket
+import asyncio
+import pathlib
+import importlib
+import threading
+import socketserver
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+socketio = pytest.importorskip('socketio')
+pytest.importorskip('jwt')
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.helpers.async_http import AsyncHttpSession
+
+map_percepts = {'proximity': 0.1, 'minLat': -30.1, 'maxLat': -30.0, 'minLon': -51.2, 'maxLon': -51.1,
+                'centerLat': -30.05, 'centerLon': -51.15}
+
+
+def agent(token, action):
+    return {'token': token, 'type': 'drone', 'role': 'drone', 'abilities': [], 'resources': [], 'max_charge': 100,
+            'speed': 1, 'size': 1, 'physical_capacity': 1, 'virtual_capacity': 1, 'active': True,
+            'last_action': action, 'last_action_result': True, 'location': {'lat': -30.05, 'lon': -51.15},
+            'route': [], 'carried': False, 'destination_distance': 0, 'battery': 100, 'physical_storage': 0,
+            'physical_storage_vector': [], 'virtual_storage': 0, 'virtual_storage_vector': [], 'social_assets': []}
+
+
+def percepts(step, token, action):
+    return {'status': 1, 'message': 'Step completed.', 'environment': {'events': [], 'step': step},
+            'partial_report': {}, 'actors': [{'agent': agent(token, action), 'message': 'Action completed.'}]}
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class Simulation(BaseHTTPRequestHandler):
+    """Stub of the simulator that answers the endpoints called on the first step of one agent."""
+
+    protocol_version = 'HTTP/1.1'
+    received = []
+    token = None
+
+    def answer(self):
+        message = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        Simulation.received.append((self.path, message))
+
+        if self.path == '/register_agent':
+            Simulation.token = message['token']
+            response = {'status': 1, 'agents': [{'agent': agent(message['token'], 'pass')}],
+                        'map_percepts': map_percepts}
+        elif self.path == '/start':
+            response = percepts(0, Simulation.token, '')
+        elif self.path == '/do_actions':
+            response = percepts(1, Simulation.token, message['actions'][0]['action'])
+        else:
+            response = {'status': 1, 'message': 'Terminated.'}
+
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = answer
+
+    def log_message(self, *args):
+        pass
+
+
+class Truncated(BaseHTTPRequestHandler):
+    """Stub that closes the connection before sending the whole body of the response."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Length', '100')
+        self.end_headers()
+        self.wfile.write(b'{"status"')
+
+    def log_message(self, *args):
+        pass
+
+
+def free_port():
+    with socket.socket() as listener:
+        listener.bind(('127.0.0.1', 0))
+        return listener.getsockname()[1]
+
+
+@pytest.fixture
+def async_api():
+    simulation = ThreadingHTTPServer(('127.0.0.1', 0), Simulation)
+    threading.Thread(target=simulation.serve_forever, daemon=True).start()
+
+    api_port = free_port()
+    argv = sys.argv
+    sys.argv = ['async_api.py', '127.0.0.1', str(api_port), str(simulation.server_address[1]), str(free_port()),
+                '5', '5', 'time', 'false', '5', 'secret', 'http', '5', '0', '10', 'block', '1']
+    sys.modules.pop('async_api', None)
+    try:
+        module = importlib.import_module('async_api')
+    finally:
+        sys.argv = argv
+
+    yield module, api_port
+
+    module.scheduler.stop()
+    module.monitor_publisher.stop(1)
+    sys.modules.pop('async_api', None)
+    simulation.shutdown()
+    simulation.server_close()
+
+
+def test_first_step(async_api):
+    module, api_port = async_api
+    url = f'http://127.0.0.1:{api_port}'
+    received = {'initial_percepts': [], 'percepts': []}
+
+    async def step():
+        runner = aiohttp.web.AppRunner(module.app)
+        await runner.setup()
+        await aiohttp.web.TCPSite(runner, '127.0.0.1', api_port).start()
+
+        client = socketio.AsyncClient()
+        percepts_received = asyncio.Event()
+
+        @client.on('initial_percepts')
+        async def initial_percepts(msg):
+            received['initial_percepts'].append(msg)
+
+        @client.on('percepts')
+        async def on_percepts(msg):
+            received['percepts'].append(json.loads(msg))
+            percepts_received.set()
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(f'{url}/start_connections', json={'secret': 'secret', 'back': 0}) as response:
+                    assert response.status == 200
+
+                async with session.post(f'{url}/connect_agent', json={'name': 'agent1'}) as response:
+                    connection = await response.json()
+                    assert connection['status'] == 1
+
+            token = connection['message']
+            await client.connect(url)
+            await client.emit('register_agent', {'token': token})
+
+            await asyncio.wait_for(percepts_received.wait(), 5)
+            assert not received['percepts'][0]['environment']['step']
+
+            percepts_received.clear()
+            await client.emit('send_action', json.dumps({'token': token, 'action': 'pass', 'parameters': []}))
+            await asyncio.wait_for(percepts_received.wait(), 5)
+
+        finally:
+            await client.disconnect()
+            await module.simulation_session.close()
+            await runner.cleanup()
+
+        return token
+
+    token = asyncio.get_event_loop().run_until_complete(step())
+
+    assert [path for path, _ in Simulation.received] == ['/register_agent', '/start', '/do_actions']
+    assert Simulation.received[2][1]['actions'] == [{'token': token, 'action': 'pass', 'parameters': []}]
+
+    assert received['initial_percepts'][0]['agent_percepts']['token'] == token
+    assert received['percepts'][1]['environment']['step'] == 1
+    assert received['percepts'][1]['agent']['last_action'] == 'pass'
+
+
+def test_payload_error():
+    simulation = ThreadingHTTPServer(('127.0.0.1', 0), Truncated)
+    threading.Thread(target=simulation.serve_forever, daemon=True).start()
+
+    async def request():
+        session = AsyncHttpSession(f'http://127.0.0.1:{simulation.server_address[1]}', retries=0)
+        try:
+            with pytest.raises(ConnectionError):
+                await session.request('POST', '/do_actions', {'actions': []})
+        finally:
+            await session.close()
+
+    asyncio.get_event_loop().run_until_complete(request())
+
+    simulation.shutdown()
+    simulation.server_close()
@@ -0,0 +1,48 @@
+import sys
+import pathlib
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.controllers.manager import Manager
+from communication.helpers.json_formatter import delta_percepts_format
+
+
+def percepts(location, battery):
+    return {'type': 'percepts', 'status': 1, 'result': True, 'message': 'Step completed.',
+            'environment': {'events': [], 'step': 1},
+            'agent': {'token': 'token1', 'location': location, 'battery': battery, 'route': []}}
+
+
+def test_delta_percepts_format():
+    full = delta_percepts_format(percepts([1, 2], 10), None, 1)
+    assert full['full'] and full['sequence'] == 1
+    assert full['agent'] == percepts([1, 2], 10)['agent']
+
+    delta = delta_percepts_format(percepts([1, 3], 10), full['agent'], 2)
+    assert not delta['full'] and delta['sequence'] == 2
+    assert delta['agent'] == {'token': 'token1', 'location': [1, 3]}
+    assert delta['environment'] == {'events': [], 'step': 1}
+
+    error = {'type': 'error', 'message': 'Error.'}
+    assert delta_percepts_format(error, full['agent'], 3) is error
+
+
+def test_manager():
+    manager = Manager()
+    manager.add('token1', {'name': 'delta', 'percepts': 'delta'}, 'agent')
+    manager.add('token2', {'name': 'full'}, 'agent')
+
+    assert manager.format_percepts('token2', percepts([1, 2], 10)) == percepts([1, 2], 10)
+    assert manager.resync_percepts('token1') is None
+
+    assert manager.format_percepts('token1', percepts([1, 2], 10))['full']
+    delta = manager.format_percepts('token1', percepts([1, 2], 9))
+    assert delta['agent'] == {'token': 'token1', 'battery': 9} and delta['sequence'] == 2
+
+    resync = manager.resync_percepts('token1')
+    assert resync['full'] and resync['sequence'] == 2 and resync['agent']['battery'] == 9
+
+    manager.reset_percepts('token1')
+    assert manager.format_percepts('token1', percepts([1, 2], 9))['full']
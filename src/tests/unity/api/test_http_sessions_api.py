@@ -0,0 +1,77 @@
+import sys
+import json
+import pathlib
+import threading
+import socketserver
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.helpers.http_sessions import HttpSessions
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    received = []
+
+    def do_POST(self):
+        message = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        Handler.received.append(message)
+
+        body = json.dumps({'status': 1, 'step': message['step']}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def destination():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_reuse(destination):
+    sessions = HttpSessions()
+
+    for step in range(20):
+        assert sessions.request('POST', destination, '/do_actions', json={'step': step}).json() == {'status': 1, 'step': step}
+
+    assert sessions.session(destination) is sessions.session(destination)
+    assert sessions.stats() == {destination: {'requests': 20, 'connections': 1, 'idle': 1}}
+
+    sessions.close()
+    assert sessions.stats() == {}
+
+
+def test_timeout():
+    assert HttpSessions().timeout == (5, None)
+    assert HttpSessions(timeout=3).timeout == (3, 3)
+
+
+def test_not_online():
+    sessions = HttpSessions(retries=1)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        sessions.request('POST', 'http://127.0.0.1:1', '/do_actions', json={'step': 0})
+
+    assert sessions.stats()['http://127.0.0.1:1']['requests'] == 2
@@ -0,0 +1,93 @@
+import sys
+import socket
+import asyncio
+import pathlib
+import tempfile
+import threading
+
+import pytest
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.helpers import ipc
+
+
+def test_encoding():
+    content = {'status': 1, 'actors': [{'token': 'a', 'location': [-20.1, -44.2], 'route': None}]}
+
+    assert ipc.encode(content)[:1] == b'M'
+    assert ipc.decode(ipc.encode(content)) == content
+
+    class Number(float):
+        pass
+
+    fallback = {'value': Number(1.5)}
+    assert ipc.encode(fallback)[:1] == b'J'
+    assert ipc.decode(ipc.encode(fallback)) == {'value': 1.5}
+
+
+def test_framing():
+    first, second = socket.socketpair()
+    content = {'actions': [{'token': str(i), 'action': 'move', 'parameters': [i]} for i in range(10000)]}
+
+    sender = threading.Thread(target=ipc.send_message, args=(first, content))
+    sender.start()
+    assert ipc.receive_message(second) == content
+    sender.join()
+
+    first.close()
+    with pytest.raises(ConnectionError):
+        ipc.receive_message(second)
+    second.close()
+
+
+def test_request():
+    folder = tempfile.mkdtemp()
+    path = str(pathlib.Path(folder) / 'simulation.sock')
+
+    handlers = {'do_actions': lambda message: {'status': 1, 'actions': message['actions']}}
+    server = ipc.IpcServer(path, handlers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = ipc.IpcClient(path)
+    for step in range(3):
+        assert client.request('do_actions', {'actions': [step]}) == {'status': 1, 'actions': [step]}
+    assert client.request('start', {})['status'] == 0
+
+    connection = client.connection
+    connection.shutdown(socket.SHUT_RDWR)
+    connection.close()
+    client.connection = connection
+    assert client.request('do_actions', {'actions': []}) == {'status': 1, 'actions': []}
+    assert client.connection is not connection
+
+    server.shutdown()
+    server.server_close()
+    client.close()
+
+    with pytest.raises(ConnectionError):
+        ipc.IpcClient(str(pathlib.Path(folder) / 'missing.sock')).request('start', {})
+
+
+def test_async_request():
+    folder = tempfile.mkdtemp()
+    path = str(pathlib.Path(folder) / 'simulation.sock')
+
+    server = ipc.IpcServer(path, {'register_agent': lambda message: {'status': 1, 'token': message['token']}})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    async def requests():
+        client = ipc.AsyncIpcClient(path)
+        responses = await asyncio.gather(*[client.request('register_agent', {'token': str(token)}) for token in range(20)])
+        assert responses == [{'status': 1, 'token': str(token)} for token in range(20)]
+
+        client.close()
+        assert await client.request('register_agent', {'token': 'a'}) == {'status': 1, 'token': 'a'}
+        client.close()
+
+    asyncio.get_event_loop().run_until_complete(requests())
+
+    server.shutdown()
+    server.server_close()
@@ -61,7 +61,7 @@ def test_initial_percepts_format():
     assert response['type'] == 'initial_percepts'
     assert response['map_percepts'] == map_percepts
     assert response['agent_percepts'] == agent_percepts
-    assert len(responses['agents']) == 1
+    assert len(responses['agents']) == 2
 
     response = initial_percepts_format(responses, 'asset')
 
@@ -71,7 +71,7 @@ def test_initial_percepts_format():
     assert response['type'] == 'initial_percepts'
     assert response['map_percepts'] == map_percepts
     assert response['agent_percepts'] == asset_percepts
-    assert len(responses['agents']) == 0
+    assert len(responses['agents']) == 2
 
 
 def test_format_map_percepts_agents():
@@ -147,7 +147,7 @@ def test_percepts_format():
     assert response['environment'] is None
     assert response['agent'] == agent_percepts
     assert response['message'] == 'ok'
-    assert len(responses['actors']) == 1
+    assert len(responses['actors']) == 2
 
     response = percepts_format(responses, 'asset')
 
@@ -160,7 +160,7 @@ def test_percepts_format():
     assert response['environment'] is None
     assert response['agent'] == asset_percepts
     assert response['message'] == 'ok'
-    assert len(responses['actors']) == 0
+    assert len(responses['actors']) == 2
 
 
 def test_end_format():
@@ -73,11 +73,11 @@ def test_get_actions():
     assert not manager.get_actions('agent')
 
     manager.get(token, 'agent').worker = True
-    manager.get(token, 'agent').action_name = 'pass'
+    assert manager.post_action(token, 'pass', [], 'agent')
     assert manager.get_actions('agent') == [{'action': 'pass', 'parameters': [], 'token': token}]
 
     manager.get(token_2, 'social_asset').worker = True
-    manager.get(token_2, 'social_asset').action_name = 'pass'
+    assert manager.post_action(token_2, 'pass', [], 'social_asset')
     assert manager.get_actions('social_asset') == [{'action': 'pass', 'parameters': [], 'token': token_2}]
 
     assert manager.get_actions('None') is None
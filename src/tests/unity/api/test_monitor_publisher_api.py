@@ -0,0 +1,114 @@
+import sys
+import json
+import pathlib
+import threading
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.helpers.monitor_publisher import MonitorPublisher
+
+
+class Monitor:
+    def __init__(self):
+        self.posts = []
+        self.paused = threading.Event()
+        self.paused.set()
+
+    def send(self, path, body):
+        self.paused.wait()
+        self.posts.append((path, json.loads(body)))
+
+
+def test_order():
+    monitor = Monitor()
+    publisher = MonitorPublisher(monitor.send)
+    publisher.start()
+
+    publisher.publish('/simulator/match/0/info/map', {'map': 0})
+    publisher.publish('/simulator/match/0/step', {'step': 0}, batchable=True)
+    assert publisher.stop(5)
+
+    assert monitor.posts == [('/simulator/match/0/info/map', {'map': 0}), ('/simulator/match/0/step', {'step': 0})]
+    assert not publisher.thread.is_alive()
+
+
+def test_batch():
+    monitor = Monitor()
+    publisher = MonitorPublisher(monitor.send, batch=3)
+    publisher.start()
+
+    monitor.paused.clear()
+    publisher.publish('/simulator/match/0/step', {'step': 0}, batchable=True)
+    assert not publisher.flush(0.1)
+
+    for step in range(1, 5):
+        publisher.publish('/simulator/match/0/step', {'step': step}, batchable=True)
+    publisher.publish('/simulator/match/0/info/report', {'report': 0})
+    publisher.publish('/simulator/match/1/step', {'step': 0}, batchable=True)
+
+    monitor.paused.set()
+    assert publisher.stop(5)
+
+    assert monitor.posts == [('/simulator/match/0/step', {'step': 0}),
+                             ('/simulator/match/0/step', [{'step': 1}, {'step': 2}, {'step': 3}]),
+                             ('/simulator/match/0/step', {'step': 4}),
+                             ('/simulator/match/0/info/report', {'report': 0}),
+                             ('/simulator/match/1/step', {'step': 0})]
+
+
+def test_drop():
+    monitor = Monitor()
+    publisher = MonitorPublisher(monitor.send, capacity=2, policy=MonitorPublisher.drop)
+
+    publisher.publish('/simulator/match/0/info/map', {'map': 0})
+    for step in range(3):
+        publisher.publish('/simulator/match/0/step', {'step': step}, batchable=True)
+
+    assert publisher.dropped == 2
+    assert list(publisher.queue)[0][0] == '/simulator/match/0/info/map'
+
+    publisher.start()
+    assert publisher.stop(5)
+    assert monitor.posts == [('/simulator/match/0/info/map', {'map': 0}), ('/simulator/match/0/step', {'step': 2})]
+
+
+def test_block():
+    monitor = Monitor()
+    publisher = MonitorPublisher(monitor.send, capacity=1)
+    publisher.start()
+
+    monitor.paused.clear()
+    publisher.publish('/simulator/match/0/step', {'step': 0}, batchable=True)
+    assert not publisher.flush(0.1)
+    publisher.publish('/simulator/match/0/step', {'step': 1}, batchable=True)
+
+    blocked = threading.Thread(target=publisher.publish, args=('/simulator/match/0/step', {'step': 2}, True))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+
+    monitor.paused.set()
+    blocked.join(5)
+    assert publisher.stop(5)
+    assert publisher.dropped == 0
+    assert [post[1] for post in monitor.posts] == [{'step': 0}, {'step': 1}, {'step': 2}]
+
+
+def test_stop():
+    monitor = Monitor()
+    publisher = MonitorPublisher(monitor.send)
+    publisher.start()
+
+    monitor.paused.clear()
+    publisher.publish('/simulator/match/0/step', {'step': 0}, batchable=True)
+    publisher.publish('/simulator/match/0/step', {'step': 1}, batchable=True)
+    assert not publisher.stop(0.1)
+
+    publisher.publish('/simulator/match/0/info/report', {'report': 0})
+    assert len(publisher.queue) <= 1
+
+    monitor.paused.set()
+    publisher.thread.join(5)
+    assert [post[0] for post in monitor.posts] == ['/simulator/match/0/step'] * len(monitor.posts)
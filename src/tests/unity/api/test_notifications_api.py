@@ -0,0 +1,50 @@
+import sys
+import json
+import pathlib
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.controllers.manager import Manager
+from communication.helpers import notifications
+
+
+def agent(token):
+    return {'token': token, 'type': 'drone', 'active': True, 'last_action': 'pass', 'last_action_result': True,
+            'location': {'lat': 1, 'lon': 2}, 'route': [], 'carried': False, 'destination_distance': 0,
+            'battery': 10, 'physical_storage': 0, 'physical_storage_vector': [], 'virtual_storage': 0,
+            'virtual_storage_vector': [], 'social_assets': []}
+
+
+response = {'status': 1, 'environment': {'events': [], 'step': 1}, 'partial_report': {'floods': 0},
+            'actors': [{'agent': agent(token), 'message': 'Action completed.', 'events': []} for token in ['a', 'b']]}
+
+
+def test_monitor_update():
+    url, info, batchable = notifications.monitor_update(notifications.percepts_event, response, 2)
+
+    assert url == '/simulator/match/2/step' and batchable
+    assert info['environment'] == response['environment']
+    assert all('events' not in actor for actor in info['actors'])
+
+    assert notifications.monitor_update(notifications.bye_event, {'report': {}}, 2)[:2] == ('/simulator/info/report', {})
+    assert notifications.monitor_update(notifications.error_event, {'message': 'Error.'}, 2) is None
+
+
+def test_actors_messages():
+    manager = Manager()
+    manager.add('a', {'name': 'full'}, 'agent')
+    manager.add('b', {'name': 'delta', 'percepts': 'delta'}, 'agent')
+    manager.add('a', 'room_a', 'socket')
+    manager.add('b', 'room_b', 'socket')
+
+    messages = dict(notifications.actors_messages(notifications.percepts_event, response, manager))
+    assert sorted(messages) == ['room_a', 'room_b']
+
+    full, delta = json.loads(messages['room_a']), json.loads(messages['room_b'])
+    assert full['agent']['token'] == 'a' and full['environment'] == response['environment']
+    assert delta['full'] and delta['sequence'] == 1
+
+    error = json.loads(dict(notifications.actors_messages('unknown', response, manager))['room_a'])
+    assert error['type'] == 'error'
@@ -0,0 +1,41 @@
+import sys
+import pathlib
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.helpers.json_formatter import index_actors, percepts_format
+
+
+def agent(token):
+    return {'token': token, 'type': 'drone', 'active': True, 'last_action': 'pass', 'last_action_result': 'success',
+            'location': {'lat': 10, 'lon': 20}, 'route': [], 'carried': False, 'destination_distance': 0,
+            'battery': 10, 'physical_storage': 0, 'physical_storage_vector': [], 'virtual_storage': 0,
+            'virtual_storage_vector': [], 'social_assets': []}
+
+
+def response():
+    environment = {'events': [{'identifier': 0, 'type': 'flood'}, {'identifier': 1, 'type': 'victim'}], 'step': 1}
+    actors = [{'agent': agent('near'), 'message': '', 'events': environment['events'][1:]},
+              {'agent': agent('all'), 'message': ''}]
+
+    return {'status': 1, 'actors': actors, 'environment': environment}
+
+
+def test_percepts_format():
+    near = percepts_format(response(), 'near')
+    assert near['environment'] == {'events': [{'identifier': 1, 'type': 'victim'}], 'step': 1}
+
+    full = percepts_format(response(), 'all')
+    assert full['environment'] == response()['environment']
+
+
+def test_actors_index():
+    content = response()
+    actors = index_actors(content['actors'])
+
+    assert percepts_format(content, 'near', actors)['agent']['token'] == 'near'
+    assert percepts_format(content, 'all', actors)['agent']['token'] == 'all'
+    assert percepts_format(content, 'unknown', actors)['type'] == 'error'
+    assert len(content['actors']) == 2
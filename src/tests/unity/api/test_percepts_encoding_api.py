@@ -0,0 +1,34 @@
+import sys
+import json
+import pathlib
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.helpers.json_formatter import delta_percepts_format, dumps_percepts
+
+environment = {'events': [{'identifier': 0, 'type': 'flood', 'location': {'lat': 10, 'lon': 20}}], 'step': 1}
+
+
+def percepts(environment):
+    return {'type': 'percepts', 'environment': environment, 'message': 'Step completed.', 'status': 1,
+            'result': True, 'agent': {'token': 'token1', 'route': [], 'battery': 10}}
+
+
+def test_shared_environment():
+    encoded = json.dumps(environment)
+    info = percepts(environment)
+
+    assert json.loads(dumps_percepts(info, environment, encoded)) == info
+
+    delta = delta_percepts_format(info, None, 1)
+    assert json.loads(dumps_percepts(delta, environment, encoded)) == delta
+
+
+def test_own_environment():
+    own = {**environment, 'events': []}
+    info = percepts(own)
+
+    assert dumps_percepts(info, environment, 'not used') == json.dumps(info)
+    assert dumps_percepts({'type': 'error', 'message': 'Error.'}, None, None) == '{"type": "error", "message": "Error."}'
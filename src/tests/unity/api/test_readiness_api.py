@@ -0,0 +1,53 @@
+import sys
+import pathlib
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.controllers.manager import Manager
+
+
+def test_counters():
+    manager = Manager()
+    for n in range(3):
+        manager.add(f'agent{n}', {'name': f'agent{n}'}, 'agent')
+        manager.add(f'agent{n}', n, 'socket')
+    manager.add('asset', {'name': 'asset'}, 'social_asset')
+    manager.add('asset', 3, 'socket')
+
+    assert manager.count_sockets() == 4
+    assert manager.count_workers() == 0
+
+    manager.edit('agent0', 'worker', True, 'agent')
+    manager.edit('agent0', 'worker', True, 'agent')
+    manager.edit('asset', 'worker', True, 'social_asset')
+    assert manager.count_workers() == 2 == len(manager.get_workers('agent')) + len(manager.get_workers('social_asset'))
+
+    manager.remove('agent0', 'agent')
+    assert manager.count_sockets() == 3
+    assert manager.count_workers() == 1
+
+    manager.clear_workers()
+    assert manager.count_workers() == 0
+
+
+def test_mailbox():
+    manager = Manager()
+    manager.add('agent', {'name': 'agent'}, 'agent')
+    manager.add('agent', 0, 'socket')
+    manager.add('other', {'name': 'other'}, 'agent')
+
+    assert manager.post_action('other', 'pass', [], 'agent')
+    assert manager.post_action('agent', 'move', ['cdm'], 'agent')
+    assert not manager.post_action('agent', 'pass', [], 'agent')
+    assert manager.get('agent', 'agent').action_name == 'move'
+    assert manager.get('agent', 'agent').action_params == ['cdm']
+
+    closed = manager.get_actions('agent')
+    assert manager.post_action('agent', 'pass', [], 'agent')
+    assert closed == [{'token': 'other', 'action': 'pass', 'parameters': []},
+                      {'token': 'agent', 'action': 'move', 'parameters': ['cdm']}]
+
+    manager.remove('agent', 'agent')
+    assert manager.get_actions('agent') == []
@@ -0,0 +1,38 @@
+import sys
+import pathlib
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.controllers.manager import Manager
+from communication.helpers import polyline
+from communication.helpers.json_formatter import route_format
+
+route = [{'lat': -30.11, 'lon': -51.21}, {'lat': -30.111, 'lon': -51.212}, {'lat': -30.1123, 'lon': -51.2134}]
+
+
+def percepts(agent_route):
+    return {'type': 'percepts', 'status': 1, 'result': True, 'message': 'Step completed.',
+            'environment': {'events': [], 'step': 1},
+            'agent': {'token': 'token1', 'route': agent_route, 'destination_distance': 12}}
+
+
+def test_route_format():
+    assert route_format(percepts(route), 'full', 10) == percepts(route)
+    assert route_format(percepts(route), 'next_k', 1)['agent'] == {'token': 'token1', 'route': route[:1],
+                                                                   'destination_distance': 12}
+    assert route_format(percepts(route), 'none', 10)['agent']['route'] == []
+
+    encoded = route_format(percepts(route), 'polyline', 10)['agent']['route']
+    assert polyline.decode(encoded) == [(location['lat'], location['lon']) for location in route]
+    assert route_format(percepts(encoded), 'next_k', 1)['agent']['route'] == encoded
+
+
+def test_manager():
+    manager = Manager()
+    manager.add('token1', {'name': 'next', 'route': 'next_k', 'route_waypoints': 2, 'percepts': 'delta'}, 'agent')
+
+    info = manager.format_percepts('token1', percepts(route))
+    assert info['full'] and info['agent']['route'] == route[:2]
+    assert percepts(route)['agent']['route'] == route
@@ -0,0 +1,90 @@
+import sys
+import time
+import asyncio
+import pathlib
+import threading
+
+api_path = pathlib.Path(__file__).parents[4] / 'masire' / 'src'
+if str(api_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(api_path.absolute()))
+
+from communication.helpers.step_scheduler import StepScheduler, AsyncStepScheduler
+
+
+def scheduler():
+    finished = []
+    callbacks = {StepScheduler.actions: lambda: finished.append(StepScheduler.actions),
+                 StepScheduler.assets: lambda: finished.append(StepScheduler.assets)}
+
+    return StepScheduler(callbacks), finished
+
+
+def test_ready():
+    step_scheduler, finished = scheduler()
+
+    step_scheduler.wait(StepScheduler.actions, 60)
+    step_scheduler.ready(StepScheduler.actions)
+    step_scheduler.ready(StepScheduler.actions)
+
+    assert finished == [StepScheduler.actions]
+    assert step_scheduler.state == StepScheduler.idle
+
+
+def test_deadline():
+    step_scheduler, finished = scheduler()
+    task = threading.Thread(target=step_scheduler.run, daemon=True)
+    task.start()
+
+    step_scheduler.wait(StepScheduler.assets, 0.05)
+    time.sleep(0.2)
+    assert finished == [StepScheduler.assets]
+
+    step_scheduler.ready(StepScheduler.actions)
+    step_scheduler.wait(StepScheduler.actions, 60)
+    time.sleep(0.1)
+    assert finished == [StepScheduler.assets, StepScheduler.actions]
+
+    step_scheduler.stop()
+    task.join(1)
+    assert not task.is_alive()
+
+
+def test_failed_step():
+    def fail():
+        raise ValueError('engine offline')
+
+    step_scheduler = StepScheduler({StepScheduler.actions: fail})
+    step_scheduler.wait(StepScheduler.actions, 60)
+
+    assert step_scheduler.finish(StepScheduler.actions)
+    assert not step_scheduler.finish(StepScheduler.actions)
+
+
+def test_async():
+    finished = []
+
+    async def finish_step():
+        await asyncio.sleep(0)
+        finished.append(StepScheduler.actions)
+
+    async def steps():
+        step_scheduler = AsyncStepScheduler({StepScheduler.actions: finish_step})
+        task = asyncio.ensure_future(step_scheduler.run())
+
+        step_scheduler.wait(StepScheduler.actions, 60)
+        await step_scheduler.ready(StepScheduler.actions)
+        await step_scheduler.ready(StepScheduler.actions)
+        assert finished == [StepScheduler.actions]
+
+        step_scheduler.wait(StepScheduler.actions, 60)
+        await asyncio.sleep(0.1)
+        assert finished == [StepScheduler.actions] * 2
+
+        step_scheduler.wait(StepScheduler.actions, 0.05)
+        await asyncio.sleep(0.2)
+        assert finished == [StepScheduler.actions] * 3
+
+        step_scheduler.stop()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.get_event_loop().run_until_complete(steps())
@@ -0,0 +1,62 @@
+import sys
+import pathlib
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.actions.action import Action, NoAction
+from simulation_engine.actions.move import Move, Pass
+from simulation_engine.actions.carry import CarryAgent
+from simulation_engine.simulation_helpers.capabilities import compile_actions
+
+
+class Agent:
+    def __init__(self, token):
+        self.token = token
+        self.last_action = ''
+        self.last_action_result = ''
+
+
+class GameState:
+    actions = {'move': {'abilities': [[]], 'resources': [[]]},
+               'pass': {'abilities': [[]], 'resources': [[]]},
+               'carry': {'abilities': [[]], 'resources': [[]]},
+               'plugin': {'abilities': [[]], 'resources': [[]]}}
+    actions_masks = compile_actions(actions)
+
+
+def test_table_keys():
+    assert Action.actions_table[('move', 1)] is Move
+    assert Action.actions_table[('move', 2)] is Move
+    assert Action.actions_table[('pass', 0)] is Pass
+    assert Action.actions_table[('carry', 1)] is CarryAgent
+    assert ('move', 0) not in Action.actions_table
+
+
+def test_create_action():
+    action = Action.create_action(Agent('token'), 'MOVE', GameState(), ['cdm'])
+    assert isinstance(action, Move)
+    assert action.agent.last_action == 'move'
+
+
+def test_create_action_not_found():
+    assert isinstance(Action.create_action(Agent('token'), 'move', GameState(), []), NoAction)
+    assert isinstance(Action.create_action(Agent('token'), 'mov', GameState(), ['cdm']), NoAction)
+    assert isinstance(Action.create_action(Agent('token'), None, GameState(), []), NoAction)
+
+
+def test_plugin_registration():
+    class PluginAction(Action):
+        action = ('plugin', [0])
+
+        def __init__(self, agent, game_state, parameters):
+            super(PluginAction, self).__init__(agent, game_state, parameters, type='plugin', qtd_args=[0])
+
+        def check_parameters(self):
+            pass
+
+    try:
+        assert isinstance(Action.create_action(Agent('token'), 'plugin', GameState(), []), PluginAction)
+    finally:
+        del Action.actions_table[('plugin', 0)]
@@ -0,0 +1,39 @@
+import sys
+import pathlib
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.simulation_helpers.capabilities import compile_mask, compile_demands, compile_actions, check_demands
+
+
+def test_compile_mask():
+    assert compile_mask([]) == 0
+    assert compile_mask(['carry', 'memory']) == compile_mask(['memory', 'carry'])
+    assert compile_mask(['carry']) & compile_mask(['memory']) == 0
+    assert compile_mask(['carry', 'carry']) == compile_mask(['carry'])
+
+
+def test_check_demands():
+    drone = compile_mask(['airMovement', 'carry', 'virtualCapacity'])
+    car = compile_mask(['groundMovement', 'carry'])
+
+    move = compile_demands([['airMovement'], ['groundMovement']])
+    assert check_demands(move, drone)
+    assert check_demands(move, car)
+
+    take_photo = compile_demands([['carry', 'virtualCapacity']])
+    assert check_demands(take_photo, drone)
+    assert not check_demands(take_photo, car)
+
+    assert check_demands(compile_demands([[]]), 0)
+    assert not check_demands(compile_demands([]), drone)
+
+
+def test_compile_actions():
+    actions = compile_actions({'charge': {'abilities': [['charge']], 'resources': [['battery']]}})
+    abilities, resources = actions['charge']
+
+    assert check_demands(abilities, compile_mask(['charge', 'carry']))
+    assert not check_demands(resources, compile_mask(['strength']))
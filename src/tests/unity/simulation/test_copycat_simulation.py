@@ -0,0 +1,61 @@
+import sys
+import copy
+import json
+import pathlib
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.copycat import CopyCat
+from simulation_engine.json_formatter import JsonFormatter
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+config = json.load(open(config_path, 'r'))
+config['map']['steps'] = 30
+config['generate']['flood']['probability'] = 10
+config['map']['scenarioCache'] = False
+tokens = [f'token{n}' for n in range(7)]
+actions = ['move', 'pass', 'rescueVictim', 'takePhoto', 'collectWater', 'charge']
+
+
+class DeepCopyCat(CopyCat):
+    def start(self):
+        return copy.deepcopy(super(DeepCopyCat, self).start())
+
+    def do_step(self, token_action_list):
+        return copy.deepcopy(super(DeepCopyCat, self).do_step(token_action_list))
+
+
+def run(copy_cat_class, tmp_path):
+    json.dump(config, open(tmp_path / 'config.json', 'w'))
+    formatter = JsonFormatter(tmp_path / 'config.json', False, False)
+    formatter.copycat.__class__ = copy_cat_class
+
+    for token in tokens:
+        formatter.connect_agent(token)
+
+    responses = [formatter.start()]
+    for step in range(20):
+        action = actions[step % len(actions)]
+        parameters = ['cdm'] if action == 'move' else []
+        responses.append(formatter.do_step([{'token': token, 'action': action, 'parameters': parameters}
+                                            for token in tokens]))
+
+    return formatter, json.dumps(responses, sort_keys=True)
+
+
+def test_same_responses(tmp_path):
+    assert run(CopyCat, tmp_path)[1] == run(DeepCopyCat, tmp_path)[1]
+
+
+def test_log_snapshot(tmp_path):
+    formatter = run(CopyCat, tmp_path)[0]
+    formatter.copycat.log()
+
+    agent = formatter.copycat.simulation.cycler.agents_manager.get(tokens[0])
+    logged = next(iter(formatter.copycat.logs.values()))['agents']['agents']
+    assert [a.token for a in logged] == tokens
+
+    agent.last_action = 'changed'
+    assert logged[0].last_action != 'changed'
@@ -0,0 +1,125 @@
+import sys
+import copy
+import pathlib
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.simulation_helpers.entity_store import EntityStore, VICTIM, PHOTO, WATER_SAMPLE
+from simulation_engine.simulation_helpers.steps import Steps
+from simulation_engine.simulation_objects.agent import Agent
+from simulation_engine.simulation_objects.event import Event
+from simulation_engine.simulation_objects.photo import Photo
+from simulation_engine.simulation_objects.victim import Victim
+from simulation_engine.simulation_objects.water_sample import WaterSample
+
+cdm_location = (-22.0, -43.0)
+proximity = 0.0005
+
+
+def create_agent(store, token):
+    return store.new_agent(token, cdm_location, ['move'], [], 5, 'drone', 20, 3, 30, 5, 5)
+
+
+def create_steps():
+    steps = Steps(2)
+    steps[0] = {'step': 0,
+                'flood': Event(1, 0, 10, {'shape': 'circle', 'radius': 1, 'location': (-22.1, -43.1)}, None),
+                'victims': [Victim(1, 1, 1, 5, (-22.1, -43.1), False), Victim(1, 2, 1, 1, (-22.2, -43.2), False)],
+                'water_samples': [WaterSample(1, 1, 1, (-22.3, -43.3))],
+                'photos': [Photo(1, 1, 1, (-22.4, -43.4), [Victim(1, 3, 1, 5, (-22.4, -43.4), True)])],
+                'propagation': []}
+
+    return steps
+
+
+def test_agent_view():
+    store = EntityStore()
+    agent = create_agent(store, 'agent1')
+
+    assert agent.location == cdm_location
+    assert agent.actual_battery == 20
+    assert agent.is_active
+
+    agent.location = [-22.5, -43.5]
+    agent.discharge()
+
+    assert agent.location == (-22.5, -43.5)
+    assert agent.actual_battery == 17
+    assert store.agents.columns['battery'][agent.store_row] == 17
+
+
+def test_deepcopy_is_detached():
+    store = EntityStore()
+    agent = create_agent(store, 'agent1')
+    snapshot = copy.deepcopy(agent)
+    agent.discharge()
+
+    assert type(snapshot) is Agent
+    assert snapshot.actual_battery == 20
+    assert snapshot.token == 'agent1'
+
+
+def test_attach_steps():
+    store = EntityStore()
+    steps = store.attach_steps(create_steps())
+
+    assert [victim.identifier for victim in steps[0]['victims']] == [1, 2]
+    assert steps[0]['photos'][0].victims[0].in_photo
+    assert steps[0]['water_samples'][0].location == (-22.3, -43.3)
+    assert store.tasks.size == 5
+    assert not store.active_tasks(VICTIM)
+
+
+def test_growth():
+    store = EntityStore()
+    agents = [create_agent(store, f'agent{i}') for i in range(200)]
+
+    assert store.agents.size == 200
+    assert all(agent.actual_battery == 20 for agent in agents)
+
+
+def test_bulk_operations():
+    store = EntityStore()
+    steps = store.attach_steps(create_steps())
+    for task in [*steps[0]['victims'], *steps[0]['water_samples'], *steps[0]['photos']]:
+        task.active = True
+
+    agent = create_agent(store, 'agent1')
+    other = create_agent(store, 'agent2')
+    agent.location = (-22.1, -43.1)
+
+    close = store.proximity(proximity)
+    assert close.shape == (2, 5)
+    assert close[agent.store_row].tolist() == [True, False, False, False, False]
+    assert not close[other.store_row].any()
+
+    assert store.at_location(cdm_location, proximity) == [other]
+    assert len(store.active_tasks(VICTIM)) == 2
+    assert len(store.active_tasks(PHOTO)) == 1
+    assert len(store.active_tasks(WATER_SAMPLE)) == 1
+
+    store.discharge()
+    assert agent.actual_battery == other.actual_battery == 17
+
+
+def test_floods_update():
+    store = EntityStore()
+    steps = store.attach_steps(create_steps())
+    victim, dead = steps[0]['victims']
+    photo_victim = steps[0]['photos'][0].victims[0]
+    for task in [victim, dead, photo_victim]:
+        task.active = True
+
+    store.age_victims([1])
+    assert (victim.lifetime, dead.lifetime, photo_victim.lifetime) == (4, 0, 3)
+    assert store.victims_dead_ignored() == 1
+
+    store.deactivate_floods([1])
+    assert not store.active_tasks(VICTIM)
+    assert store.victims_dead_ignored() == 0
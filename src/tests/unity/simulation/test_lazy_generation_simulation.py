@@ -0,0 +1,60 @@
+import sys
+import copy
+import json
+import pathlib
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.generator.generator import Generator
+from simulation_engine.generator.loader import Loader
+from simulation_engine.simulation_helpers.map import Map
+from simulation_engine.simulation_helpers.steps import LazySteps
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+config = json.load(open(config_path, 'r'))
+config['map']['steps'] = 30
+config['generate']['flood']['probability'] = 10
+map = Map(config['map']['maps'][0], config['map']['proximity'], config['map']['movementRestrictions'])
+
+
+def generate(**generate_variables):
+    config_copy = copy.deepcopy(config)
+    config_copy['generate'].update(generate_variables)
+    generator = Generator(config_copy, map)
+
+    return generator, generator.generate_events(map)
+
+
+def to_json(steps):
+    return json.dumps(Loader.get_json_events(steps), default=lambda o: o.dict())
+
+
+def test_lazy_generation():
+    generator, steps = generate(lookahead=2)
+
+    assert isinstance(steps, LazySteps)
+    assert steps.generated == 0
+
+    steps[0]
+    assert steps.generated == 3
+
+    list(steps.until(10))
+    assert steps.generated == 12
+
+
+def test_lazy_matches_eager():
+    eager_generator, eager = generate(seedByStep=True)
+    eager_assets = eager_generator.generate_social_assets()
+
+    for lookahead in [0, 1, 5]:
+        lazy_generator, lazy = generate(lookahead=lookahead)
+        lazy_assets = lazy_generator.generate_social_assets()
+
+        for step in range(len(lazy)):
+            lazy[step]
+
+        assert len(list(lazy)) > 1
+        assert to_json(lazy) == to_json(eager)
+        assert [asset.location for asset in lazy_assets] == [asset.location for asset in eager_assets]
@@ -0,0 +1,67 @@
+import sys
+import copy
+import json
+import pathlib
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.generator.loader import Loader
+from simulation_engine.generator.numpy_generator import NumpyGenerator, seed_entropy
+from simulation_engine.simulation_helpers.map import Map
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+config = json.load(open(config_path, 'r'))
+config['map']['steps'] = 30
+config['generate']['flood']['probability'] = 10
+config['generate']['backend'] = 'numpy'
+map = Map(config['map']['maps'][0], config['map']['proximity'], config['map']['movementRestrictions'])
+
+
+def generate(**generate_variables):
+    config_copy = copy.deepcopy(config)
+    config_copy['generate'].update(generate_variables)
+    generator = NumpyGenerator(config_copy, map)
+    steps = generator.generate_events(map)
+    for step in range(len(steps)):
+        steps[step]
+
+    return steps
+
+
+def to_json(steps):
+    return json.dumps(Loader.get_json_events(steps), default=lambda o: o.dict())
+
+
+def test_seed_entropy():
+    assert seed_entropy(42) == 42
+    assert seed_entropy('42') == seed_entropy('42') != 42
+    assert seed_entropy(-1) >= 0
+
+
+def test_reproducible():
+    assert to_json(generate()) == to_json(generate())
+    assert to_json(generate(lookahead=2)) == to_json(generate())
+
+
+def test_entities():
+    steps = generate()
+    victims = [victim for step in steps for victim in step['victims']]
+    victims += [victim for step in steps for photo in step['photos'] for victim in photo.victims]
+    victims += [victim for step in steps for ring in step['propagation'] for victim in ring]
+
+    assert victims
+    assert sorted(victim.identifier for victim in victims) == list(range(len(victims)))
+
+    for step in steps:
+        for photo in step['photos']:
+            assert all(victim.location == photo.location and victim.in_photo for victim in photo.victims)
+
+        for victim in step['victims']:
+            assert victim.flood_id == step['flood'].id
+            assert isinstance(victim.lifetime, int)
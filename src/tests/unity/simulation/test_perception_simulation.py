@@ -0,0 +1,81 @@
+import sys
+import json
+import pathlib
+import tempfile
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.json_formatter import JsonFormatter
+from simulation_engine.simulation_helpers.perception import Perception, measure_unit
+from simulation_engine.simulation_objects.event import Event
+from simulation_engine.simulation_objects.victim import Victim
+from simulation_engine.simulation_objects.water_sample import WaterSample
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+config = json.load(open(config_path, 'r'))
+config['map']['steps'] = 30
+config['generate']['flood']['probability'] = 10
+config['map']['scenarioCache'] = False
+
+
+class Agent:
+    def __init__(self, token, role, location):
+        self.token = token
+        self.role = role
+        self.location = location
+
+
+def test_perceive():
+    perception = Perception({'drone': {'perceptionRadius': 1000}, 'car': {}})
+    flood = Event(0, 0, 10, {'shape': 'circle', 'radius': 0.05, 'location': (10, 20)}, {'max': 20, 'perStep': 10})
+    near = Victim(0, 0, 10, 5, (10.005, 20), False)
+    far = WaterSample(0, 1, 10, (10.03, 20))
+    events = [flood, near, far]
+
+    drone = Agent('drone', 'drone', (10, 20))
+    car = Agent('car', 'car', (10, 20))
+    assert perception.perceive([drone, car], events) == {'drone': [flood, near]}
+
+    drone.location = (10.1, 20)
+    assert perception.perceive([drone], events) == {'drone': [flood, near]}
+
+    assert perception.perceive([drone], [flood, far]) == {'drone': [flood]}
+    assert perception.perceive([drone], [near]) == {'drone': []}
+
+
+def test_disabled():
+    perception = Perception(config['agents'])
+
+    assert not perception.enabled()
+    assert perception.perceive([Agent('drone', 'drone', (10, 20))], []) == {}
+
+
+def test_formatter():
+    content = json.loads(json.dumps(config))
+    content['agents']['car']['perceptionRadius'] = 500
+    temp_config = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+    temp_config.write(json.dumps(content))
+    temp_config.close()
+
+    formatter = JsonFormatter(temp_config.name, False, False)
+    pathlib.Path(temp_config.name).unlink()
+    roles = {formatter.connect_agent(f'agent_{n}')['agents'][0]['agent']['role']: f'agent_{n}' for n in range(7)}
+    formatter.start()
+
+    radius = 500 / measure_unit
+    for _ in range(20):
+        response = formatter.do_step([{'token': token, 'action': 'pass', 'parameters': []} for token in roles.values()])
+        actors = {actor['agent']['token']: actor for actor in response['actors']}
+
+        assert 'events' not in actors[roles['drone']]
+        events = actors[roles['car']]['events']
+        assert all(event in response['environment']['events'] for event in events)
+
+        location = actors[roles['car']]['agent']['location']
+        for event in response['environment']['events']:
+            if event['type'] != 'flood':
+                distance = ((event['location']['lat'] - location['lat']) ** 2 +
+                            (event['location']['lon'] - location['lon']) ** 2) ** 0.5
+                assert (event in events) == (distance <= radius)
@@ -0,0 +1,64 @@
+import sys
+import pathlib
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.json_formatter import JsonFormatter
+from simulation_engine.simulation_objects.event import Event
+from simulation_engine.simulation_objects.photo import Photo
+from simulation_engine.simulation_objects.victim import Victim
+from simulation_engine.simulation_objects.water_sample import WaterSample
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+formatter = JsonFormatter(config_path, False, False)
+
+
+def test_victim():
+    victim = Victim(0, 1, 10, 5, (10, 20), False)
+    percept = formatter.jsonify_victim(victim)
+
+    assert percept == {'flood_id': 0, 'identifier': 1, 'type': 'victim', 'location': {'lat': 10, 'lon': 20},
+                       'size': 10, 'lifetime': 5}
+    assert formatter.jsonify_victim(victim) is percept
+
+    victim.lifetime -= 1
+    assert formatter.jsonify_victim(victim)['lifetime'] == 4
+    assert percept['lifetime'] == 5
+
+
+def test_flood():
+    flood = Event(0, 0, 10, {'shape': 'circle', 'radius': 0.5, 'location': (10, 20)}, {'max': 20, 'perStep': 10})
+    percept = formatter.jsonify_flood(flood)
+
+    assert formatter.jsonify_flood(flood) is percept
+
+    flood.dimension['radius'] = 0.55
+    assert formatter.jsonify_flood(flood)['radius'] == 0.55
+
+
+def test_photo():
+    victims = [Victim(0, identifier, 10, 5, (10, 20), True) for identifier in range(2)]
+    photo = Photo(0, 0, 100, (10, 20), victims)
+    percept = formatter.jsonify_photo(photo)
+
+    assert percept['victims'] == []
+    assert formatter.jsonify_photo(photo) is percept
+
+    victims[0].active = True
+    assert [victim['identifier'] for victim in formatter.jsonify_photo(photo)['victims']] == [0]
+
+    percept = formatter.jsonify_photo(photo)
+    victims[0].lifetime -= 1
+    assert formatter.jsonify_photo(photo) is not percept
+    assert formatter.jsonify_photo(photo)['victims'][0]['lifetime'] == 4
+
+
+def test_events():
+    water_sample = WaterSample(0, 0, 10, (10, 20))
+    victim = Victim(0, 1, 10, 5, (10, 20), False)
+    events = formatter.jsonify_events([water_sample, victim])
+
+    assert events[0] is formatter.jsonify_water_sample(water_sample)
+    assert formatter.jsonify_delivered_items([victim])[0] is events[1]
@@ -0,0 +1,44 @@
+import sys
+import copy
+import json
+import pathlib
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.generator.loader import Loader
+from simulation_engine.generator.pregenerator import Pregenerator, generate_match, match_config
+from simulation_engine.simulation_helpers.cycle import Cycle
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+config = json.load(open(config_path, 'r'))
+config['map']['steps'] = 30
+config['generate']['flood']['probability'] = 10
+config['map']['scenarioCache'] = False
+config['map']['maps'] = [config['map']['maps'][0], {**config['map']['maps'][0], 'name': 'second'},
+                         {**config['map']['maps'][0], 'name': 'third'}]
+
+
+def to_json(scenario):
+    return json.dumps([Loader.get_json_events(scenario.steps), scenario.get_json_social_assets(scenario.social_assets)],
+                      default=lambda o: o.dict())
+
+
+def test_match_config():
+    first = match_config(config, 0)
+    second = match_config(config, 1)
+
+    assert first['map']['maps'] == [config['map']['maps'][0]]
+    assert first['map']['randomSeed'] != second['map']['randomSeed']
+    assert config['map']['randomSeed'] not in [first['map']['randomSeed'], second['map']['randomSeed']]
+
+
+def test_independent_of_workers():
+    serial = [to_json(generate_match(Cycle.create_generator, config, match)) for match in range(3)]
+
+    for workers in [1, 3]:
+        pregenerator = Pregenerator(config, workers, Cycle.create_generator)
+        assert [to_json(pregenerator.get(match)) for match in range(3)] == serial
+
+    assert serial[0] != serial[1]
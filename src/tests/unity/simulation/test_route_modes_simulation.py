@@ -0,0 +1,40 @@
+import sys
+import json
+import pathlib
+import tempfile
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.json_formatter import JsonFormatter
+from communication.helpers import polyline
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+config = json.load(open(config_path, 'r'))
+config['map']['scenarioCache'] = False
+config['agents']['drone'].update(routeMode='next_k', routeWaypoints=2)
+config['agents']['car']['routeMode'] = 'polyline'
+config['agents']['boat']['routeMode'] = 'none'
+
+temp_config = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+temp_config.write(json.dumps(config))
+temp_config.close()
+formatter = JsonFormatter(temp_config.name, False, False)
+pathlib.Path(temp_config.name).unlink()
+
+route = [(-30.11, -51.21, False), (-30.111, -51.212, False), (-30.1123, -51.2134, True)]
+
+
+def test_polyline():
+    assert polyline.encode([(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]) == '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+    assert polyline.decode(polyline.encode(route)) == [location[:2] for location in route]
+    assert polyline.encode([]) == ''
+
+
+def test_route_modes():
+    assert formatter.jsonify_route('drone', route) == [{'lat': -30.11, 'lon': -51.21},
+                                                       {'lat': -30.111, 'lon': -51.212}]
+    assert polyline.decode(formatter.jsonify_route('car', route)) == [location[:2] for location in route]
+    assert formatter.jsonify_route('boat', route) == []
+    assert len(formatter.jsonify_route('unknown', route)) == 3
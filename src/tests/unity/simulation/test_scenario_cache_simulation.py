@@ -0,0 +1,93 @@
+import os
+import sys
+import copy
+import json
+import pathlib
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.generator.loader import Loader
+from simulation_engine.generator.pregenerator import generate_scenario
+from simulation_engine.generator import scenario_cache
+from simulation_engine.generator.scenario_cache import ScenarioCache, scenario_key
+from simulation_engine.simulation_helpers.cycle import Cycle
+from simulation_engine.simulation_helpers.map import Map
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+config = json.load(open(config_path, 'r'))
+config['map']['steps'] = 30
+config['generate']['flood']['probability'] = 10
+map = Map(config['map']['maps'][0], config['map']['proximity'], config['map']['movementRestrictions'])
+
+
+def to_json(scenario):
+    return json.dumps([Loader.get_json_events(scenario.steps), scenario.get_json_social_assets(scenario.social_assets)],
+                      default=lambda o: o.dict())
+
+
+def test_key():
+    changed = copy.deepcopy(config)
+    changed['generate']['victim']['maxAmount'] += 1
+    reseeded = copy.deepcopy(config)
+    reseeded['map']['randomSeed'] = f'{config["map"]["randomSeed"]}-other'
+    unrelated = copy.deepcopy(config)
+    unrelated['map']['id'] = 'other'
+    unrelated['agents'] = {}
+
+    assert scenario_key(config) == scenario_key(copy.deepcopy(config))
+    assert scenario_key(config) != scenario_key(changed)
+    assert scenario_key(config) != scenario_key(reseeded)
+    assert scenario_key(config) == scenario_key(unrelated)
+
+
+def test_sources_key(monkeypatch):
+    key = scenario_key(config)
+    assert len(scenario_cache.sources_digest()) == 64
+
+    monkeypatch.setattr(scenario_cache, 'sources_digest', lambda: 'changed')
+    assert scenario_key(config) != key
+
+
+def test_enabled():
+    disabled = copy.deepcopy(config)
+    disabled['map']['scenarioCache'] = False
+    lazy = copy.deepcopy(config)
+    lazy['generate']['lookahead'] = 2
+
+    assert ScenarioCache.enabled(config)
+    assert not ScenarioCache.enabled(disabled)
+    assert not ScenarioCache.enabled(lazy)
+
+
+def test_round_trip(tmp_path):
+    generated = generate_scenario(Cycle.create_generator, copy.deepcopy(config), map, tmp_path)
+    assert list(tmp_path.glob('*.bin')) == [tmp_path / f'{scenario_key(config)}.bin']
+
+    cached = generate_scenario(Cycle.create_generator, copy.deepcopy(config), map, tmp_path)
+    assert cached is not generated
+    assert to_json(cached) == to_json(generated)
+    assert (cached.flood_id, cached.victim_id) == (generated.flood_id, generated.victim_id)
+
+
+def test_corrupted_entry(tmp_path):
+    key = scenario_key(config)
+    (tmp_path / f'{key}.bin').write_bytes(b'not a scenario')
+
+    assert ScenarioCache(tmp_path).load(key) is None
+    scenario = generate_scenario(Cycle.create_generator, copy.deepcopy(config), map, tmp_path)
+    assert to_json(ScenarioCache(tmp_path).load(key)) == to_json(scenario)
+
+
+def test_eviction(tmp_path):
+    cache = ScenarioCache(tmp_path, max_entries=2)
+
+    for index, key in enumerate(['first', 'second']):
+        cache.store(key, {'scenario': key})
+        os.utime(cache.path(key), (index, index))
+
+    assert cache.load('first') == {'scenario': 'first'}
+    cache.store('third', {'scenario': 'third'})
+
+    assert sorted(path.stem for path in tmp_path.glob('*.bin')) == ['first', 'third']
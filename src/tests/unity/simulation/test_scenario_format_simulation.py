@@ -0,0 +1,178 @@
+import sys
+import copy
+import json
+import pathlib
+
+import pytest
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.generator import scenario_format
+from simulation_engine.generator.generator import Generator
+from simulation_engine.generator.loader import Loader
+from simulation_engine.simulation_helpers.map import Map
+
+config_path = pathlib.Path(__file__).parent / 'simulation_tests_config.json'
+config = json.load(open(config_path, 'r'))
+config['map']['steps'] = 30
+config['generate']['flood']['probability'] = 10
+map = Map(config['map']['maps'][0], config['map']['proximity'], config['map']['movementRestrictions'])
+
+
+def generate_match(seed):
+    config_copy = copy.deepcopy(config)
+    config_copy['map']['randomSeed'] = seed
+    generator = Generator(config_copy, map)
+    steps = generator.generate_events(map)
+
+    return dict(steps=Loader.get_json_events(steps),
+                social_assets=generator.get_json_social_assets(generator.generate_social_assets()))
+
+
+def events_file():
+    matchs = [generate_match(seed) for seed in ['first', 'second']]
+    return json.loads(json.dumps(dict(map=config['map'], matchs=matchs), default=lambda o: o.dict()))
+
+
+def to_json(steps):
+    return json.dumps(Loader.get_json_events(steps), default=lambda o: o.dict())
+
+
+def test_convert(tmp_path):
+    events = events_file()
+    scenario_format.from_json(events, tmp_path / 'scenario.bin')
+
+    assert scenario_format.is_scenario_file(tmp_path / 'scenario.bin')
+    assert scenario_format.to_json(tmp_path / 'scenario.bin') == events
+
+
+def test_loader(tmp_path):
+    events = events_file()
+    json.dump(events, open(tmp_path / 'events.txt', 'w'))
+    scenario_format.from_json(events, tmp_path / 'scenario.bin')
+
+    for match in range(2):
+        from_json = Loader(config, map, tmp_path / 'events.txt', match)
+        from_binary = Loader(config, map, tmp_path / 'scenario.bin', match)
+
+        assert not scenario_format.is_scenario_file(tmp_path / 'events.txt')
+        assert from_binary.social_assets == from_json.social_assets
+        assert to_json(from_binary.generate_events(map)) == to_json(from_json.generate_events(map))
+
+
+def test_lazy_loading(tmp_path):
+    events = events_file()
+    scenario_format.from_json(events, tmp_path / 'scenario.bin')
+    first, second = [step['step'] for step in events['matchs'][0]['steps']][:2]
+
+    steps = Loader(config, map, tmp_path / 'scenario.bin').generate_events(map)
+    assert list(steps.events) == []
+
+    assert steps[first]['flood'].step == first
+    assert list(steps.events) == [first]
+    assert list(steps.until(second + 1))[-1]['step'] == second
+
+
+def test_append(tmp_path):
+    path = tmp_path / 'scenario.bin'
+    matchs = []
+
+    for seed in ['first', 'second', 'third']:
+        config_copy = copy.deepcopy(config)
+        config_copy['map']['randomSeed'] = seed
+        generator = Generator(config_copy, map)
+        steps = generator.generate_events(map)
+        social_assets = generator.generate_social_assets()
+
+        if not matchs:
+            Loader.write_first_match(config_copy, steps, social_assets, generator, path, binary=True)
+        else:
+            recorded = path.read_bytes()
+            Loader.write_match(steps, social_assets, generator, path)
+            assert path.read_bytes().startswith(recorded)
+
+        matchs.append(json.loads(json.dumps(dict(steps=Loader.get_json_events(steps),
+                                                 social_assets=generator.get_json_social_assets(social_assets)),
+                                            default=lambda o: o.dict())))
+
+    with scenario_format.ScenarioReader(path) as reader:
+        assert len(reader.matches) == 3
+        assert reader.read_match(2) == matchs[2]
+        assert list(reader) == matchs
+
+
+def test_append_json(tmp_path):
+    path = tmp_path / 'events.txt'
+
+    for seed in ['first', 'second']:
+        config_copy = copy.deepcopy(config)
+        config_copy['map']['randomSeed'] = seed
+        generator = Generator(config_copy, map)
+        steps = generator.generate_events(map)
+        social_assets = generator.generate_social_assets()
+
+        if seed == 'first':
+            Loader.write_first_match(config_copy, steps, social_assets, generator, path)
+        else:
+            Loader.write_match(steps, social_assets, generator, path)
+
+    assert not scenario_format.is_scenario_file(path)
+    assert len(json.load(open(path, 'r'))['matchs']) == 2
+    assert path.read_text().startswith('{\n    ')
+
+
+def test_missing_match(tmp_path):
+    events = events_file()
+    events['matchs'] = events['matchs'][:1]
+    json.dump(events, open(tmp_path / 'events.txt', 'w'))
+    scenario_format.from_json(events, tmp_path / 'scenario.bin')
+
+    for path in [tmp_path / 'events.txt', tmp_path / 'scenario.bin']:
+        loader = Loader(config, map, path, 1)
+        assert loader.match == 0
+        assert loader.social_assets == events['matchs'][0]['social_assets']
+        loader.close()
+
+    events['matchs'] = []
+    json.dump(events, open(tmp_path / 'empty.txt', 'w'))
+    with pytest.raises(scenario_format.ScenarioFormatError):
+        Loader(config, map, tmp_path / 'empty.txt')
+
+
+def test_failed_write(tmp_path):
+    events = events_file()
+    path = tmp_path / 'scenario.bin'
+    scenario_format.from_json(events, path)
+    recorded = path.read_bytes()
+
+    try:
+        with scenario_format.ScenarioWriter(path) as writer:
+            writer.add_match(events['matchs'][0]['steps'], events['matchs'][0]['social_assets'])
+            raise ValueError('generation failed')
+    except ValueError:
+        pass
+
+    assert path.read_bytes() == recorded
+
+    try:
+        with scenario_format.ScenarioWriter(tmp_path / 'new.bin', {'map': config['map']}) as writer:
+            writer.add_match(events['matchs'][0]['steps'], events['matchs'][0]['social_assets'])
+            raise ValueError('generation failed')
+    except ValueError:
+        pass
+
+    with pytest.raises(scenario_format.ScenarioFormatError):
+        scenario_format.ScenarioReader(tmp_path / 'new.bin')
+
+
+def test_loader_closed(tmp_path):
+    scenario_format.from_json(events_file(), tmp_path / 'scenario.bin')
+
+    loader = Loader(config, map, tmp_path / 'scenario.bin')
+    steps = loader.generate_events(map)
+    assert not loader.reader.file.closed
+
+    list(steps)
+    assert loader.reader.file.closed
@@ -0,0 +1,56 @@
+import sys
+import pathlib
+import pytest
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.simulation_objects.victim import Victim
+from simulation_engine.simulation_objects.photo import Photo
+from simulation_engine.simulation_objects.water_sample import WaterSample
+from simulation_engine.simulation_objects.event import Event
+from simulation_engine.simulation_objects.social_asset_marker import SocialAssetMarker
+
+
+def test_victim_dict():
+    victim = Victim(1, 2, 20, 10, (1, 2), False)
+
+    assert victim.type == 'victim'
+    assert victim.dict() == {'flood_id': 1, 'identifier': 2, 'size': 20, 'location': (1, 2), 'lifetime': 10,
+                             'in_photo': False}
+    assert Victim(**victim.dict(), photo=True).in_photo
+
+
+def test_photo_dict():
+    victim = Victim(1, 2, 20, 10, (1, 2), True)
+    photo = Photo(1, 3, 256, (1, 2), [victim])
+
+    assert photo.type == 'photo'
+    assert photo.dict() == {'flood_id': 1, 'identifier': 3, 'size': 256, 'location': (1, 2), 'victims': [victim]}
+
+
+def test_water_sample_dict():
+    sample = WaterSample(1, 4, 15, (1, 2))
+
+    assert sample.type == 'water_sample'
+    assert sample.dict() == {'flood_id': 1, 'identifier': 4, 'size': 15, 'location': (1, 2)}
+
+
+def test_event_dict():
+    event = Event(1, 0, 0, {'shape': 'circle', 'radius': 0.02, 'location': (1, 2)}, {'max': 20, 'perStep': 4})
+    event_dict = event.dict()
+
+    assert list(event_dict) == ['type', 'id', 'step', 'end', 'dimension', 'propagation']
+    assert event_dict['propagation'].dict() == {'max': 20, 'perStep': 4}
+
+
+def test_no_instance_dict():
+    objects = [Victim(1, 2, 20, 10, (1, 2), False), Photo(1, 3, 256, (1, 2), []), WaterSample(1, 4, 15, (1, 2)),
+               Event(1, 0, 0, {}, None), SocialAssetMarker(0, (1, 2), 'doctor', [], [])]
+
+    for obj in objects:
+        assert not hasattr(obj, '__dict__')
+
+        with pytest.raises(AttributeError):
+            obj.unknown_attribute = True
@@ -0,0 +1,46 @@
+import sys
+import pathlib
+
+import pytest
+
+engine_path = pathlib.Path(__file__).parents[4] / 'simulator' / 'src'
+if str(engine_path.absolute()) not in sys.path:
+    sys.path.insert(1, str(engine_path.absolute()))
+
+from simulation_engine.simulation_helpers.steps import Steps
+
+
+def create_steps():
+    steps = Steps(100000)
+    for i in [99999, 0, 500]:
+        steps[i] = {'step': i, 'flood': i, 'victims': [], 'water_samples': [], 'photos': [], 'propagation': []}
+
+    return steps
+
+
+def test_populated_steps():
+    steps = create_steps()
+
+    assert len(steps) == 100000
+    assert [step['step'] for step in steps] == [0, 500, 99999]
+    assert [step['step'] for step in steps.until(500)] == [0]
+    assert [step['step'] for step in steps.until(501)] == [0, 500]
+
+
+def test_empty_steps():
+    steps = create_steps()
+
+    assert steps[1]['flood'] is None
+    assert not steps[1]['victims']
+    with pytest.raises(TypeError):
+        steps[1]['flood'] = 1
+
+
+def test_out_of_range():
+    steps = create_steps()
+
+    with pytest.raises(IndexError):
+        steps[100000]
+
+    with pytest.raises(IndexError):
+        steps[-1] = {}